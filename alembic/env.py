@@ -0,0 +1,84 @@
+"""
+Alembic environment.
+
+Migrations run against sqlalchemy.url when the caller sets it (tests,
+app.core.schema) and DATABASE_URL otherwise. Autogenerate compares against
+the metadata of every model in app.models.
+"""
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config, pool
+
+from alembic import context
+from app.core.config import settings
+from app.database import Base
+from app.models import (cache_version, level, progress,  # noqa: F401
+                        quiz, quiz_sentence, rate_limit, user, vocabulary)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+target_metadata = Base.metadata
+
+# Full-text search structures created by raw DDL (see app.models.vocabulary),
+# which autogenerate must not try to drop
+SEARCH_OBJECTS = (
+    "vocabulary_items_fts",
+    "ix_vocabulary_items_fts",
+    "ix_vocabulary_items_word_trgm",
+    "ix_vocabulary_items_word_c",
+)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name.startswith(SEARCH_OBJECTS))
+
+
+def _is_sqlite() -> bool:
+    return config.get_main_option("sqlalchemy.url").startswith("sqlite")
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting (alembic upgrade --sql)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=_is_sqlite(),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite needs batch mode for ALTER TABLE in later migrations
+            render_as_batch=_is_sqlite(),
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
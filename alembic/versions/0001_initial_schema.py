@@ -0,0 +1,235 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 02:05:19.419867
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Column types and search DDL as of this revision, copied rather than
+# imported from app.models so that later model changes cannot alter what this
+# migration does. The models pick these types by DATABASE_URL: native UUID
+# and JSONB on PostgreSQL, CHAR(36) and JSON on SQLite.
+UUIDType = postgresql.UUID(as_uuid=True).with_variant(sa.CHAR(36), "sqlite")
+JSONType = postgresql.JSONB().with_variant(sa.JSON(), "sqlite")
+
+SQLITE_SEARCH_DDL = [
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_ai",
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_ad",
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_au",
+    "DROP TABLE IF EXISTS vocabulary_items_fts",
+    "CREATE VIRTUAL TABLE vocabulary_items_fts USING fts5("
+    "word, meaning, related, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER vocabulary_items_fts_ai "
+    "AFTER INSERT ON vocabulary_items BEGIN "
+    "INSERT INTO vocabulary_items_fts(rowid, word, meaning, related) "
+    "VALUES (new.rowid, new.word, new.meaning, "
+    "coalesce(new.synonyms, '') || ' ' || coalesce(new.antonyms, '')); END",
+    "CREATE TRIGGER vocabulary_items_fts_ad "
+    "AFTER DELETE ON vocabulary_items BEGIN "
+    "DELETE FROM vocabulary_items_fts WHERE rowid = old.rowid; END",
+    "CREATE TRIGGER vocabulary_items_fts_au "
+    "AFTER UPDATE ON vocabulary_items BEGIN "
+    "DELETE FROM vocabulary_items_fts WHERE rowid = old.rowid; "
+    "INSERT INTO vocabulary_items_fts(rowid, word, meaning, related) "
+    "VALUES (new.rowid, new.word, new.meaning, "
+    "coalesce(new.synonyms, '') || ' ' || coalesce(new.antonyms, '')); END",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_fts ON vocabulary_items "
+    "USING GIN (to_tsvector('simple', word || ' ' || meaning || ' ' || "
+    "coalesce(synonyms::text, '') || ' ' || coalesce(antonyms::text, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_word_trgm ON vocabulary_items "
+    "USING GIN (lower(word) gin_trgm_ops)",
+]
+
+
+def upgrade() -> None:
+    op.create_table('levels',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_levels_level'), 'levels', ['level'], unique=True)
+    op.create_table('rate_limit_counters',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_rate_limit_counters_expires_at'), 'rate_limit_counters', ['expires_at'], unique=False)
+    op.create_table('revoked_tokens',
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_table('users',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('is_admin', sa.Boolean(), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('vocabulary_items',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('word', sa.String(length=255), nullable=False),
+    sa.Column('meaning', sa.Text(), nullable=False),
+    sa.Column('synonyms', JSONType, nullable=True),
+    sa.Column('antonyms', JSONType, nullable=True),
+    sa.Column('example_sentences', JSONType, nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vocabulary_items_word'), 'vocabulary_items', ['word'], unique=True)
+    # Full-text search structures (the table's after_create hook does not
+    # fire for op.create_table)
+    search_ddl = {"sqlite": SQLITE_SEARCH_DDL, "postgresql": POSTGRES_SEARCH_DDL}
+    for statement in search_ddl.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+    op.create_table('quiz_questions',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('vocabulary_item_id', UUIDType, nullable=False),
+    sa.Column('prompt', sa.String(length=500), nullable=False),
+    sa.Column('options', JSONType, nullable=False),
+    sa.Column('correct_index', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['vocabulary_item_id'], ['vocabulary_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('quiz_sentences',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('vocabulary_item_id', UUIDType, nullable=False),
+    sa.Column('sentence', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['vocabulary_item_id'], ['vocabulary_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quiz_sentences_vocabulary_item_id'), 'quiz_sentences', ['vocabulary_item_id'], unique=False)
+    op.create_table('quiz_sessions',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('user_id', UUIDType, nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('year', sa.String(length=10), nullable=False),
+    sa.Column('questions', JSONType, nullable=False),
+    sa.Column('total_questions', sa.Integer(), nullable=False),
+    sa.Column('correct_answers', sa.Integer(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quiz_sessions_expires_at'), 'quiz_sessions', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_quiz_sessions_user_id'), 'quiz_sessions', ['user_id'], unique=False)
+    op.create_table('sentence_questions',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('vocabulary_item_id', UUIDType, nullable=False),
+    sa.Column('sentence_template', sa.String(length=500), nullable=False),
+    sa.Column('correct_word', sa.String(length=255), nullable=False),
+    sa.Column('options', JSONType, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['vocabulary_item_id'], ['vocabulary_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_level_stats',
+    sa.Column('user_id', UUIDType, nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('mastered_words', sa.Integer(), nullable=False),
+    sa.Column('practiced_words', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'level')
+    )
+    op.create_table('user_progress',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('user_id', UUIDType, nullable=False),
+    sa.Column('vocabulary_item_id', UUIDType, nullable=False),
+    sa.Column('year_group', sa.String(length=10), nullable=False),
+    sa.Column('is_mastered', sa.Boolean(), nullable=False),
+    sa.Column('mastered_at', sa.DateTime(), nullable=True),
+    sa.Column('times_practiced', sa.Integer(), nullable=False),
+    sa.Column('last_practiced_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vocabulary_item_id'], ['vocabulary_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'vocabulary_item_id', name='uq_user_progress')
+    )
+    op.create_index(op.f('ix_user_progress_is_mastered'), 'user_progress', ['is_mastered'], unique=False)
+    op.create_index(op.f('ix_user_progress_user_id'), 'user_progress', ['user_id'], unique=False)
+    op.create_index(op.f('ix_user_progress_vocabulary_item_id'), 'user_progress', ['vocabulary_item_id'], unique=False)
+    op.create_index(op.f('ix_user_progress_year_group'), 'user_progress', ['year_group'], unique=False)
+    op.create_table('vocabulary_levels',
+    sa.Column('id', UUIDType, nullable=False),
+    sa.Column('vocabulary_item_id', UUIDType, nullable=False),
+    sa.Column('level_id', UUIDType, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['level_id'], ['levels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vocabulary_item_id'], ['vocabulary_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('vocabulary_item_id', 'level_id', name='uq_vocabulary_level')
+    )
+    op.create_index(op.f('ix_vocabulary_levels_level_id'), 'vocabulary_levels', ['level_id'], unique=False)
+    op.create_index(op.f('ix_vocabulary_levels_vocabulary_item_id'), 'vocabulary_levels', ['vocabulary_item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_vocabulary_levels_vocabulary_item_id'), table_name='vocabulary_levels')
+    op.drop_index(op.f('ix_vocabulary_levels_level_id'), table_name='vocabulary_levels')
+    op.drop_table('vocabulary_levels')
+    op.drop_index(op.f('ix_user_progress_year_group'), table_name='user_progress')
+    op.drop_index(op.f('ix_user_progress_vocabulary_item_id'), table_name='user_progress')
+    op.drop_index(op.f('ix_user_progress_user_id'), table_name='user_progress')
+    op.drop_index(op.f('ix_user_progress_is_mastered'), table_name='user_progress')
+    op.drop_table('user_progress')
+    op.drop_table('user_level_stats')
+    op.drop_table('sentence_questions')
+    op.drop_index(op.f('ix_quiz_sessions_user_id'), table_name='quiz_sessions')
+    op.drop_index(op.f('ix_quiz_sessions_expires_at'), table_name='quiz_sessions')
+    op.drop_table('quiz_sessions')
+    op.drop_index(op.f('ix_quiz_sentences_vocabulary_item_id'), table_name='quiz_sentences')
+    op.drop_table('quiz_sentences')
+    op.drop_table('quiz_questions')
+    op.drop_index(op.f('ix_vocabulary_items_word'), table_name='vocabulary_items')
+    op.drop_table('vocabulary_items')
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS vocabulary_items_fts")
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_index(op.f('ix_rate_limit_counters_expires_at'), table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
+    op.drop_index(op.f('ix_levels_level'), table_name='levels')
+    op.drop_table('levels')
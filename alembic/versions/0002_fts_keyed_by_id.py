@@ -0,0 +1,70 @@
+"""key the SQLite FTS table by vocabulary item id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 14:12:40.207113
+
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# vocabulary_items_fts rows were keyed by the implicit rowid of
+# vocabulary_items, which has a CHAR(36) primary key, so its rowids can change
+# on VACUUM and detach the index from the items. The FTS table now stores the
+# item id instead. PostgreSQL indexes the table's own columns and is unchanged.
+
+
+def _search_ddl(key: str) -> List[str]:
+    """SQLite FTS table and sync triggers keyed by `key` (rowid or id)."""
+    fts_key = "id UNINDEXED, " if key == "id" else ""
+    values = (
+        f"VALUES (new.{key}, new.word, new.meaning, "
+        "coalesce(new.synonyms, '') || ' ' || coalesce(new.antonyms, '')); END"
+    )
+    return [
+        "DROP TRIGGER IF EXISTS vocabulary_items_fts_ai",
+        "DROP TRIGGER IF EXISTS vocabulary_items_fts_ad",
+        "DROP TRIGGER IF EXISTS vocabulary_items_fts_au",
+        "DROP TABLE IF EXISTS vocabulary_items_fts",
+        "CREATE VIRTUAL TABLE vocabulary_items_fts USING fts5("
+        f"{fts_key}word, meaning, related, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER vocabulary_items_fts_ai "
+        "AFTER INSERT ON vocabulary_items BEGIN "
+        f"INSERT INTO vocabulary_items_fts({key}, word, meaning, related) "
+        + values,
+        "CREATE TRIGGER vocabulary_items_fts_ad "
+        "AFTER DELETE ON vocabulary_items BEGIN "
+        f"DELETE FROM vocabulary_items_fts WHERE {key} = old.{key}; END",
+        "CREATE TRIGGER vocabulary_items_fts_au "
+        "AFTER UPDATE ON vocabulary_items BEGIN "
+        f"DELETE FROM vocabulary_items_fts WHERE {key} = old.{key}; "
+        f"INSERT INTO vocabulary_items_fts({key}, word, meaning, related) "
+        + values,
+        f"INSERT INTO vocabulary_items_fts({key}, word, meaning, related) "
+        f"SELECT {key}, word, meaning, "
+        "coalesce(synonyms, '') || ' ' || coalesce(antonyms, '') "
+        "FROM vocabulary_items",
+    ]
+
+
+def _rebuild_fts(key: str) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in _search_ddl(key):
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _rebuild_fts("id")
+
+
+def downgrade() -> None:
+    _rebuild_fts("rowid")
@@ -0,0 +1,42 @@
+"""shared cache versions and code point word order
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 16:03:11.482519
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# cache_versions holds the vocabulary catalog version that every worker
+# checks, so admin writes reach all workers' in-memory catalogs. Keyset
+# pagination now orders words by code point to match the catalog; SQLite
+# already does, PostgreSQL gets an index for that order.
+
+
+def upgrade() -> None:
+    op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_word_c "
+            'ON vocabulary_items (word COLLATE "C", id)'
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_vocabulary_items_word_c")
+    op.drop_table('cache_versions')
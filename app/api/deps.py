@@ -1,11 +1,14 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
+from app.core.db_routing import RECENT_WRITE_COOKIE, bind_session_user
 from app.core.exceptions import UnauthorizedError
-from app.core.security import decode_token
-from app.database import get_db
-from app.models.user import User
+from app.core.security import decode_token, decode_token_async
+from app.core.user_cache import AuthenticatedUser, user_auth_cache
+from app.database import get_async_db, get_db, recent_writers
 from app.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
@@ -13,21 +16,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
-    payload = decode_token(token)
+def _access_token_payload(payload: Optional[dict]) -> dict:
+    """Check a decoded token is an access token with a subject user ID."""
     if not payload or payload.get("type") != "access":
         raise UnauthorizedError("Invalid authentication token")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise UnauthorizedError("Invalid token payload")
+    return payload
 
-    user_repo = UserRepository(db)
-    user = user_repo.get(user_id)
 
+def _check_user(user: Optional[AuthenticatedUser], payload: dict) -> AuthenticatedUser:
+    """Reject missing/inactive users and tokens issued before a revocation."""
     if not user or not user.is_active:
         raise UnauthorizedError("User not found or inactive")
 
@@ -39,14 +39,68 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def _cached_user(payload: dict) -> Optional[AuthenticatedUser]:
+    """
+    The token's user from user_auth_cache, or None to load it from the
+    database. A token version mismatch also reloads, since the token may have
+    been issued by another worker after the entry was cached.
+    """
+    user = user_auth_cache.get(payload["sub"])
+    if user is not None and user.token_version != payload.get("tv", 0):
+        return None
+    return user
+
+
+def _load_user(db: Session, user_id: str) -> Optional[AuthenticatedUser]:
+    """Load a user from the database and cache it."""
+    user = UserRepository(db).get(user_id)
+    if user is None:
+        return None
+    user = AuthenticatedUser.from_model(user)
+    user_auth_cache.put(user)
+    return user
+
+
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> AuthenticatedUser:
+    """Get current authenticated user from JWT token."""
+    payload = _access_token_payload(decode_token(token))
+    user = _cached_user(payload) or _load_user(db, payload["sub"])
+    user = _check_user(user, payload)
+    bind_session_user(
+        db, user.id, recent_writers, request.cookies.get(RECENT_WRITE_COOKIE)
+    )
+    return user
+
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db=Depends(get_async_db),
+) -> AuthenticatedUser:
+    """get_current_user for async routes, loading the user via get_async_db."""
+    payload = _access_token_payload(await decode_token_async(token))
+    user = _cached_user(payload)
+    if user is None:
+        user = await db.run_sync(lambda session: _load_user(session, payload["sub"]))
+    user = _check_user(user, payload)
+    bind_session_user(
+        db, user.id, recent_writers, request.cookies.get(RECENT_WRITE_COOKIE)
+    )
+    return user
+
+
+def get_current_active_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+def get_current_admin_user(current_user: AuthenticatedUser = Depends(get_current_active_user)) -> AuthenticatedUser:
     """
     Get current admin user.
     
@@ -60,6 +114,27 @@ def get_current_admin_user(current_user: User = Depends(get_current_active_user)
     return current_user
 
 
+async def get_current_active_user_async(
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+) -> AuthenticatedUser:
+    """get_current_active_user for async routes."""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_admin_user_async(
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
+) -> AuthenticatedUser:
+    """get_current_admin_user for async routes."""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
+
 def get_raw_token(token: str = Depends(oauth2_scheme)) -> str:
     """Get the raw JWT token string for logout/blacklist operations."""
     return token
@@ -1,37 +1,55 @@
 import logging
+import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_active_user, get_raw_token, oauth2_scheme
-from app.core.exceptions import UnauthorizedError, ValidationError
-from app.database import get_db
-from app.models.user import User
-from app.schemas.user import TokenResponse, UserCreate, UserLogin, UserResponse
-from app.services.auth_service import AuthService
+from app.api.deps import (get_current_active_user, get_current_admin_user,
+                          get_raw_token, oauth2_scheme)
+from app.core.exceptions import (ServiceUnavailableError, UnauthorizedError,
+                                 ValidationError)
+from app.core.rate_limit import create_limiter
+from app.core.user_cache import AuthenticatedUser
+from app.database import get_async_db, get_db
+from app.schemas.user import (TokenResponse, UserActiveUpdate, UserCreate,
+                              UserLogin, UserResponse)
+from app.services.auth_service import AsyncAuthService, AuthService
 
 logger = logging.getLogger(__name__)
 
 # Rate limiter for auth endpoints
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
 
 router = APIRouter()
 
 
+# The limits are checked in sync dependencies, which FastAPI runs in the
+# threadpool, so reserving quota from shared counters does not block the
+# event loop the async handlers run on.
+@limiter.limit("3/minute")
+def register_rate_limit(request: Request) -> None:
+    """Limits /register to 3 requests per minute per IP address."""
+
+
+@limiter.limit("5/minute")
+def login_rate_limit(request: Request) -> None:
+    """Limits /login to 5 requests per minute per IP address."""
+
+
 class LogoutRequest(BaseModel):
     """Request body for logout endpoint."""
     refresh_token: Optional[str] = None
 
 
 @router.post(
-    "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(register_rate_limit)],
 )
-@limiter.limit("3/minute")
-def register(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_data: UserCreate, db=Depends(get_async_db)):
     """
     Register a new user.
     
@@ -41,14 +59,15 @@ def register(request: Request, user_data: UserCreate, db: Session = Depends(get_
     - At least one lowercase letter
     - At least one digit
     
-    Rate limited to 3 requests per minute per IP address.
+    Rate limited to 3 requests per minute per IP address. Returns 503 when
+    the password hashing pool is saturated.
     """
-    auth_service = AuthService(db)
+    auth_service = AsyncAuthService(db)
     try:
-        user = auth_service.register(user_data)
+        user = await auth_service.register(user_data)
         return user
-    except ValidationError as e:
-        raise e  # ValidationError is already an HTTPException
+    except (ValidationError, ServiceUnavailableError) as e:
+        raise e  # Already HTTPExceptions
     except Exception:
         # Log the actual error for debugging, but don't expose to user
         logger.exception("Unexpected error during registration")
@@ -58,17 +77,19 @@ def register(request: Request, user_data: UserCreate, db: Session = Depends(get_
         )
 
 
-@router.post("/login", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login(request: Request, credentials: UserLogin, db: Session = Depends(get_db)):
+@router.post(
+    "/login", response_model=TokenResponse, dependencies=[Depends(login_rate_limit)]
+)
+async def login(request: Request, credentials: UserLogin, db=Depends(get_async_db)):
     """
     Authenticate user and return JWT tokens.
     
-    Rate limited to 5 requests per minute per IP address.
+    Rate limited to 5 requests per minute per IP address. Returns 503 when
+    the password hashing pool is saturated.
     """
-    auth_service = AuthService(db)
+    auth_service = AsyncAuthService(db)
     try:
-        result = auth_service.login(credentials)
+        result = await auth_service.login(credentials)
         return TokenResponse(
             access_token=result["access_token"],
             refresh_token=result["refresh_token"],
@@ -115,7 +136,7 @@ def logout(
     logout_data: Optional[LogoutRequest] = None,
     access_token: str = Depends(get_raw_token),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """
     Logout user by invalidating their tokens.
@@ -131,7 +152,7 @@ def logout(
 @router.post("/logout-all")
 def logout_all_devices(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """
     Logout from all devices by invalidating all tokens for this user.
@@ -142,3 +163,19 @@ def logout_all_devices(
     auth_service = AuthService(db)
     auth_service.invalidate_all_tokens(str(current_user.id))
     return {"message": "Logged out from all devices successfully"}
+
+
+@router.put("/users/{user_id}/active", response_model=UserResponse)
+def set_user_active(
+    user_id: uuid.UUID,
+    update: UserActiveUpdate,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
+):
+    """
+    Activate or deactivate a user. Requires admin privileges.
+
+    A deactivated user's tokens are rejected from their next request.
+    """
+    auth_service = AuthService(db)
+    return auth_service.set_active(str(user_id), update.is_active)
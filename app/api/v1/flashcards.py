@@ -1,25 +1,40 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.api.deps import get_current_active_user
-from app.database import get_db
-from app.models.user import User
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_active_user_async
+from app.core.user_cache import AuthenticatedUser
+from app.database import get_async_db
 from app.schemas.common import PaginatedResponse
 from app.schemas.vocabulary import VocabularyItemResponse
-from app.services.vocabulary_service import VocabularyService
+from app.services.vocabulary_service import AsyncVocabularyService
+from app.utils.json_response import PrebuiltJSONResponse, paginated_json
 
 router = APIRouter()
 
 
 @router.get("", response_model=PaginatedResponse[VocabularyItemResponse])
-def get_flashcards(
+async def get_flashcards(
     level: int,
-    skip: int = 0,
-    limit: int = 5,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(5, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="next_cursor from the previous page"
+    ),
+    include_total: bool = Query(True, description="Include the total item count"),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
-    """Get flashcards for a level (paginated)."""
-    vocab_service = VocabularyService(db)
-    items, total = vocab_service.get_all(level=level, skip=skip, limit=limit)
-    return PaginatedResponse(items=items, total=total, skip=skip, limit=limit)
+    """Get flashcards for a level (paginated by offset or cursor)."""
+    vocab_service = AsyncVocabularyService(db)
+    items_json, total, next_cursor = await vocab_service.get_page_json(
+        level=level,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    # Already in the response model's shape; sent without re-validation
+    return PrebuiltJSONResponse(
+        paginated_json(items_json, total, skip, limit, next_cursor)
+    )
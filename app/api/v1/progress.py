@@ -1,44 +1,46 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, status
 
-from app.api.deps import get_current_active_user
-from app.database import get_db
-from app.models.user import User
-from app.schemas.progress import (MarkMasteredRequest, MasteredWordsResponse,
+from app.api.deps import get_current_active_user_async
+from app.core.user_cache import AuthenticatedUser
+from app.database import get_async_db
+from app.schemas.progress import (BatchProgressRequest, BatchProgressResponse,
+                                  MarkMasteredRequest, MasteredWordsResponse,
                                   PracticeRequest, ProgressSummaryResponse,
                                   UserProgressResponse)
-from app.services.progress_service import ProgressService
+from app.services.progress_service import AsyncProgressService
 
 router = APIRouter()
 
 
 @router.get("", response_model=ProgressSummaryResponse)
-def get_progress(
+async def get_progress(
     year: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    level: Optional[int] = Query(None, ge=1, le=4),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
-    """Get user's progress summary."""
-    progress_service = ProgressService(db)
-    stats = progress_service.get_progress_summary(current_user.id, year)
+    """Get user's progress summary per level (optionally for one level or year)."""
+    progress_service = AsyncProgressService(db)
+    stats = await progress_service.get_progress_summary(current_user.id, year, level)
     return ProgressSummaryResponse(
         user_id=current_user.id,
+        level_progress=stats["level_progress"],
         year_progress=stats["year_progress"],
         overall_progress=stats["overall_progress"],
     )
 
 
 @router.get("/mastered", response_model=MasteredWordsResponse)
-def get_mastered_words(
+async def get_mastered_words(
     year: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
     """Get list of mastered word IDs for a year."""
-    progress_service = ProgressService(db)
-    word_ids = progress_service.get_mastered_word_ids(current_user.id, year)
+    progress_service = AsyncProgressService(db)
+    word_ids = await progress_service.get_mastered_word_ids(current_user.id, year)
     return MasteredWordsResponse(year=year, mastered_word_ids=word_ids)
 
 
@@ -47,14 +49,14 @@ def get_mastered_words(
     response_model=UserProgressResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def mark_mastered(
+async def mark_mastered(
     request: MarkMasteredRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
     """Mark a word as mastered."""
-    progress_service = ProgressService(db)
-    progress = progress_service.mark_mastered(current_user.id, request)
+    progress_service = AsyncProgressService(db)
+    progress = await progress_service.mark_mastered(current_user.id, request)
     return UserProgressResponse(
         id=progress.id,
         user_id=progress.user_id,
@@ -66,28 +68,40 @@ def mark_mastered(
 
 
 @router.delete("/mastered/{vocabulary_item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def unmark_mastered(
+async def unmark_mastered(
     vocabulary_item_id: str,
     year: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
     """Unmark a word as mastered."""
     import uuid
 
-    progress_service = ProgressService(db)
-    progress_service.unmark_mastered(
+    progress_service = AsyncProgressService(db)
+    await progress_service.unmark_mastered(
         current_user.id, uuid.UUID(vocabulary_item_id), year
     )
 
 
 @router.post("/practice", status_code=status.HTTP_200_OK)
-def record_practice(
+async def record_practice(
     request: PracticeRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
     """Record a practice session for a word."""
-    progress_service = ProgressService(db)
-    progress_service.record_practice(current_user.id, request)
+    progress_service = AsyncProgressService(db)
+    await progress_service.record_practice(current_user.id, request)
     return {"message": "Practice recorded"}
+
+
+@router.post("/batch", response_model=BatchProgressResponse)
+async def apply_progress_batch(
+    request: BatchProgressRequest,
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
+):
+    """Apply a batch of offline practice/mastered events in one transaction."""
+    progress_service = AsyncProgressService(db)
+    result = await progress_service.apply_batch(current_user.id, request)
+    return BatchProgressResponse(**result)
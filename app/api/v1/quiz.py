@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
+from app.core.user_cache import AuthenticatedUser
 from app.database import get_db
-from app.models.user import User
 from app.schemas.quiz import (GenerateQuizRequest, GenerateQuizResponse,
                               SubmitQuizRequest, SubmitQuizResponse)
 from app.services.quiz_service import QuizService
@@ -15,7 +15,7 @@ router = APIRouter()
 def generate_quiz(
     request: GenerateQuizRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """Generate quiz questions from mastered words."""
     quiz_service = QuizService(db)
@@ -27,7 +27,7 @@ def generate_quiz(
 def submit_quiz(
     request: SubmitQuizRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """Submit quiz answers and get results."""
     quiz_service = QuizService(db)
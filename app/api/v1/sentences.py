@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
+from app.core.user_cache import AuthenticatedUser
 from app.database import get_db
-from app.models.user import User
 from app.schemas.quiz import (GenerateSentenceRequest,
                               GenerateSentenceResponse, SubmitSentenceRequest,
                               SubmitSentenceResponse)
@@ -16,7 +16,7 @@ router = APIRouter()
 def generate_sentences(
     request: GenerateSentenceRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """Generate sentence fill-in-the-blank questions."""
     quiz_service = QuizService(db)
@@ -28,7 +28,7 @@ def generate_sentences(
 def submit_sentences(
     request: SubmitSentenceRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
 ):
     """Submit sentence fill answers."""
     quiz_service = QuizService(db)
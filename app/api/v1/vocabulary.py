@@ -1,145 +1,164 @@
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_active_user, get_current_admin_user
-from app.database import get_db
-from app.models.user import User
+from app.api.deps import (get_current_active_user_async,
+                          get_current_admin_user_async)
+from app.core.user_cache import AuthenticatedUser
+from app.database import get_async_db
 from app.schemas.common import PaginatedResponse
 from app.schemas.vocabulary import (
     VocabularyItemCreate,
     VocabularyItemResponse,
     VocabularyItemUpdate,
+    VocabularyLevelSnapshot,
+    VocabularySuggestResponse,
 )
-from app.services.vocabulary_service import VocabularyService
+from app.services.level_snapshot import choose_encoding
+from app.services.vocabulary_service import AsyncVocabularyService
+from app.utils.json_response import PrebuiltJSONResponse, paginated_json
 
 router = APIRouter()
 
 
 @router.get("", response_model=PaginatedResponse[VocabularyItemResponse])
-def get_vocabulary(
+async def get_vocabulary(
     level: Optional[int] = Query(None, ge=1, le=4, description="Filter by level (1-4)"),
     search: Optional[str] = Query(None, max_length=100),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="next_cursor from the previous page"
+    ),
+    include_total: bool = Query(True, description="Include the total item count"),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
-    """Get vocabulary items with optional filters."""
-    vocab_service = VocabularyService(db)
-    items, total = vocab_service.get_all(
-        level=level, search=search, skip=skip, limit=limit
+    """
+    Get vocabulary items with optional filters.
+    
+    Pass the returned next_cursor back as cursor to fetch the following
+    page without an offset scan.
+    """
+    vocab_service = AsyncVocabularyService(db)
+    items_json, total, next_cursor = await vocab_service.get_page_json(
+        level=level,
+        search=search,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
     )
     
-    # Convert items to response format with levels
-    response_items = []
-    for item in items:
-        level_numbers = vocab_service.vocab_repo.get_level_numbers_for_word(item.id)
-        item_dict = {
-            "id": item.id,
-            "word": item.word,
-            "meaning": item.meaning,
-            "synonyms": item.synonyms or [],
-            "antonyms": item.antonyms or [],
-            "example_sentences": item.example_sentences or [],
-            "levels": level_numbers,
-            "created_at": item.created_at,
-            "updated_at": item.updated_at,
-        }
-        response_items.append(item_dict)
+    # Already in the response model's shape; sent without re-validation
+    return PrebuiltJSONResponse(
+        paginated_json(items_json, total, skip, limit, next_cursor)
+    )
+
+
+@router.get("/suggest", response_model=VocabularySuggestResponse)
+async def suggest_vocabulary(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    level: Optional[int] = Query(None, ge=1, le=4, description="Filter by level (1-4)"),
+    limit: int = Query(10, ge=1, le=50),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
+):
+    """
+    Autocomplete words starting with a prefix (case-insensitive).
     
-    return PaginatedResponse(items=response_items, total=total, skip=skip, limit=limit)
+    Served from an in-memory sorted word index, so typeahead does not
+    query the database.
+    """
+    vocab_service = AsyncVocabularyService(db)
+    suggestions = await vocab_service.suggest(prefix, level=level, limit=limit)
+    return VocabularySuggestResponse(prefix=prefix, level=level, suggestions=suggestions)
+
+
+@router.get(
+    "/levels/{level}/snapshot",
+    response_model=VocabularyLevelSnapshot,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Level unchanged since the If-None-Match ETag"
+        }
+    },
+)
+async def get_level_snapshot(
+    request: Request,
+    level: int = Path(..., ge=1, le=4, description="Level (1-4)"),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
+):
+    """
+    Get every vocabulary item of a level in one document, for offline sync.
+
+    Send the ETag of the previous response as If-None-Match: while the
+    level is unchanged the answer is 304 with no body. The body is
+    pre-rendered and served gzip or brotli compressed per Accept-Encoding.
+    """
+    vocab_service = AsyncVocabularyService(db)
+    snapshot = await vocab_service.get_level_snapshot(level)
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": snapshot.etag(encoding),
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "private, no-cache",
+    }
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Compression runs once per snapshot and encoding, off the event loop
+    body = await run_in_threadpool(snapshot.encoded, encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return PrebuiltJSONResponse(body, headers=headers)
 
 
 @router.get("/{vocabulary_id}", response_model=VocabularyItemResponse)
-def get_vocabulary_item(
+async def get_vocabulary_item(
     vocabulary_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_async),
 ):
     """Get a specific vocabulary item by ID."""
-    vocab_service = VocabularyService(db)
-    item = vocab_service.get_by_id(uuid.UUID(vocabulary_id))
-    
-    # Get level numbers
-    level_numbers = vocab_service.vocab_repo.get_level_numbers_for_word(item.id)
-    
-    return {
-        "id": item.id,
-        "word": item.word,
-        "meaning": item.meaning,
-        "synonyms": item.synonyms or [],
-        "antonyms": item.antonyms or [],
-        "example_sentences": item.example_sentences or [],
-        "levels": level_numbers,
-        "created_at": item.created_at,
-        "updated_at": item.updated_at,
-    }
+    vocab_service = AsyncVocabularyService(db)
+    return await vocab_service.get_response_by_id(uuid.UUID(vocabulary_id))
 
 
 @router.post(
     "", response_model=VocabularyItemResponse, status_code=status.HTTP_201_CREATED
 )
-def create_vocabulary_item(
+async def create_vocabulary_item(
     item_data: VocabularyItemCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user_async),
 ):
     """Create a new vocabulary item. Requires admin privileges."""
-    vocab_service = VocabularyService(db)
-    item = vocab_service.create(item_data)
-    
-    # Get level numbers for response
-    level_numbers = vocab_service.vocab_repo.get_level_numbers_for_word(item.id)
-    
-    return {
-        "id": item.id,
-        "word": item.word,
-        "meaning": item.meaning,
-        "synonyms": item.synonyms or [],
-        "antonyms": item.antonyms or [],
-        "example_sentences": item.example_sentences or [],
-        "levels": level_numbers,
-        "created_at": item.created_at,
-        "updated_at": item.updated_at,
-    }
+    vocab_service = AsyncVocabularyService(db)
+    return await vocab_service.create(item_data)
 
 
 @router.put("/{vocabulary_id}", response_model=VocabularyItemResponse)
-def update_vocabulary_item(
+async def update_vocabulary_item(
     vocabulary_id: str,
     item_data: VocabularyItemUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user_async),
 ):
     """Update a vocabulary item. Requires admin privileges."""
-    vocab_service = VocabularyService(db)
-    item = vocab_service.update(uuid.UUID(vocabulary_id), item_data)
-    
-    # Get level numbers for response
-    level_numbers = vocab_service.vocab_repo.get_level_numbers_for_word(item.id)
-    
-    return {
-        "id": item.id,
-        "word": item.word,
-        "meaning": item.meaning,
-        "synonyms": item.synonyms or [],
-        "antonyms": item.antonyms or [],
-        "example_sentences": item.example_sentences or [],
-        "levels": level_numbers,
-        "created_at": item.created_at,
-        "updated_at": item.updated_at,
-    }
+    vocab_service = AsyncVocabularyService(db)
+    return await vocab_service.update(uuid.UUID(vocabulary_id), item_data)
 
 
 @router.delete("/{vocabulary_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_vocabulary_item(
+async def delete_vocabulary_item(
     vocabulary_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    db=Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user_async),
 ):
     """Delete a vocabulary item. Requires admin privileges."""
-    vocab_service = VocabularyService(db)
-    vocab_service.delete(uuid.UUID(vocabulary_id))
+    vocab_service = AsyncVocabularyService(db)
+    await vocab_service.delete(uuid.UUID(vocabulary_id))
@@ -1,8 +1,12 @@
-from typing import List
+from typing import List, Optional
 
-from pydantic import model_validator
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Databases with INSERT ... ON CONFLICT upserts, which the progress, counter,
+# rate limit and token blacklist writes rely on
+SUPPORTED_DATABASES = ("postgresql", "sqlite")
+
 
 class Settings(BaseSettings):
     """
@@ -13,12 +17,70 @@ class Settings(BaseSettings):
     # Database (required)
     DATABASE_URL: str
 
+    # Optional read replica for GET requests. A user's reads stay on the
+    # primary for READ_YOUR_WRITES_SECONDS after their own write, on every
+    # worker (a signed recent_write cookie carries the window).
+    DATABASE_READ_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pool (per engine and worker process). Statement timeout
+    # applies to PostgreSQL only; 0 disables it.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Opt-in async request path (asyncpg / aiosqlite). ASYNC_DATABASE_URL
+    # defaults to DATABASE_URL with the async driver substituted.
+    ASYNC_DATABASE_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Schema handling at startup: "verify" (refuse to start unless migrated
+    # to the Alembic head), "create" (create_all; tests and throwaway dev
+    # databases) or "skip"
+    SCHEMA_STARTUP_MODE: str = "verify"
+
     # Security - SECRET_KEY is required, must be set in .env
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Per-process cache of the user fields checked on each authenticated
+    # request. The TTL bounds how long other workers accept revoked tokens;
+    # 0 disables the cache.
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt cost for new hashes. Stored hashes with a different cost are
+    # rehashed on the user's next successful login.
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+
+    # Dedicated bcrypt pool for /register and /login; requests beyond
+    # workers + queue size get 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+
+    # Token blacklist: "memory" (single process), "database" or "redis".
+    # Shared backends are read through a local cache; revocations on other
+    # workers take effect within TOKEN_REVOCATION_CACHE_SECONDS.
+    TOKEN_REVOCATION_BACKEND: str = "memory"
+    TOKEN_REVOCATION_CACHE_SECONDS: float = 1.0
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # How often expired entries are swept from the token blacklist
+    TOKEN_BLACKLIST_SWEEP_SECONDS: float = 60.0
+
+    # Rate limit counters: "memory://" (per worker), "database://" or a
+    # redis:// URL (shared by all workers, with up to RATE_LIMIT_PREFETCH
+    # hits reserved locally per fetch), or another limits storage URI
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_PREFETCH: int = 10
+
+    # Verified JWT payloads kept until their exp; 0 disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
 
@@ -28,8 +90,42 @@ class Settings(BaseSettings):
     # API
     API_V1_PREFIX: str = "/api/v1"
 
+    # In-process vocabulary catalog cache. Admin writes bump a version in the
+    # database that every worker checks on each read; the refresh interval
+    # bounds staleness for changes made outside the API.
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_REFRESH_SECONDS: int = 300
+
+    # Similar-word index for difficulty-aware distractors, built by
+    # scripts/build_distractor_index.py (optional)
+    DISTRACTOR_INDEX_PATH: str = "data/distractor_index.bin"
+
+    # Generated quiz answer keys: "memory" (single node) or "database"
+    QUIZ_SESSION_BACKEND: str = "memory"
+    QUIZ_SESSION_TTL_SECONDS: int = 3600
+    QUIZ_SESSION_MAX_ENTRIES: int = 10000
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
+    @model_validator(mode="after")
+    def validate_database_urls(self):
+        """Refuse to start on a database the app cannot write to."""
+        urls = {
+            "DATABASE_URL": self.DATABASE_URL,
+            "DATABASE_READ_URL": self.DATABASE_READ_URL,
+            "ASYNC_DATABASE_URL": self.ASYNC_DATABASE_URL,
+        }
+        for name, url in urls.items():
+            if url is None:
+                continue
+            dialect = url.partition("://")[0].split("+")[0].lower()
+            if dialect not in SUPPORTED_DATABASES:
+                raise ValueError(
+                    f"{name} uses an unsupported database ({dialect!r}). "
+                    "Use a PostgreSQL or SQLite connection string."
+                )
+        return self
+
     @model_validator(mode="after")
     def validate_production_settings(self):
         """Ensure production environment has proper configuration."""
@@ -0,0 +1,163 @@
+"""
+Read-replica routing for database sessions.
+
+When DATABASE_READ_URL is set, sessions opened for GET/HEAD requests send
+their reads to the replica. Everything else goes to the primary:
+
+- sessions of other HTTP methods, scripts and background jobs
+- any session from the moment it flushes or executes INSERT/UPDATE/DELETE
+- requests of a user who wrote within READ_YOUR_WRITES_SECONDS, so clients
+  see their own progress immediately despite replication lag
+
+Write recency is tracked per worker process and also handed to the client
+as a signed "wrote until T" cookie (RECENT_WRITE_COOKIE), so a request that
+lands on another worker still reads from the primary.
+"""
+import hashlib
+import hmac
+import math
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Session.info keys
+USE_REPLICA = "use_replica"
+WROTE = "wrote"
+USER_ID = "user_id"
+REQUEST_STATE = "request_state"
+
+# Cookie carrying RecentWriters.mark()'s signed marker
+RECENT_WRITE_COOKIE = "recent_write"
+
+
+class RecentWriters:
+    """
+    Users who committed a write recently, with a per-entry TTL.
+
+    mark() also returns a marker signed with secret that any worker sharing
+    the secret accepts in is_recent() until the window ends.
+    """
+
+    def __init__(
+        self, window_seconds: float = 5.0, max_entries: int = 100000, secret: str = ""
+    ):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._secret = secret.encode()
+        self._until: Dict[object, float] = {}
+        self._lock = Lock()
+
+    def _signature(self, user_id, until: str) -> str:
+        message = f"{user_id}:{until}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def mark(self, user_id) -> str:
+        """Record a write by user_id; returns the signed marker for the client."""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_entries:
+                self._until = {k: v for k, v in self._until.items() if v > now}
+            self._until[user_id] = now + self.window_seconds
+        until = f"{time.time() + self.window_seconds:.3f}"
+        return f"{until}.{self._signature(user_id, until)}"
+
+    def is_recent(self, user_id, marker: Optional[str] = None) -> bool:
+        """Whether user_id wrote within the window, here or per a valid marker."""
+        until = self._until.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+        if not marker:
+            return False
+        until, _, signature = marker.rpartition(".")
+        try:
+            expired = float(until) <= time.time()
+        except ValueError:
+            return False
+        return not expired and hmac.compare_digest(
+            signature, self._signature(user_id, until)
+        )
+
+    def clear(self) -> None:
+        """Clear all entries (for testing)."""
+        with self._lock:
+            self._until.clear()
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica while info["use_replica"] is set and
+    it has not written anything; all other work uses the primary bind.
+    """
+
+    def __init__(self, *args, replica=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            # Stay on the primary for the rest of the session so later reads
+            # see this write
+            self.info[WROTE] = True
+            self.info[USE_REPLICA] = False
+        elif self.replica is not None and self.info.get(USE_REPLICA):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def bind_session_user(
+    db, user_id, recent_writers: RecentWriters, marker: Optional[str] = None
+) -> None:
+    """
+    Attach the authenticated user to a session (Session, AsyncSession or
+    ThreadpoolSession) and pin it to the primary if the user wrote recently
+    on this worker or the request carries a valid recent-write marker.
+    """
+    db.info[USER_ID] = user_id
+    if recent_writers.is_recent(user_id, marker):
+        db.info[USE_REPLICA] = False
+
+
+@contextmanager
+def primary_reads(db: Session):
+    """Temporarily send a session's reads to the primary."""
+    previous = db.info.get(USE_REPLICA)
+    db.info[USE_REPLICA] = False
+    try:
+        yield db
+    finally:
+        if not db.info.get(WROTE):
+            db.info[USE_REPLICA] = previous
+
+
+def track_writes(session_class, recent_writers: RecentWriters) -> None:
+    """
+    Record the session's user in recent_writers after each write commit, and
+    leave the marker on the request state (info["request_state"]) for
+    set_recent_write_cookie.
+    """
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        if session.info.pop(WROTE, False) and session.info.get(USER_ID) is not None:
+            marker = recent_writers.mark(session.info[USER_ID])
+            state = session.info.get(REQUEST_STATE)
+            if state is not None:
+                state.recent_write = marker
+
+
+def set_recent_write_cookie(request, response, recent_writers: RecentWriters) -> None:
+    """Send the marker of a write committed during the request as a cookie."""
+    marker = getattr(request.state, "recent_write", None)
+    if marker is not None:
+        response.set_cookie(
+            RECENT_WRITE_COOKIE,
+            marker,
+            max_age=math.ceil(recent_writers.window_seconds),
+            httponly=True,
+            samesite="lax",
+        )
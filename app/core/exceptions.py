@@ -9,6 +9,14 @@ class VocabularyNotFoundError(HTTPException):
         )
 
 
+class QuizSessionNotFoundError(HTTPException):
+    def __init__(self, session_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Quiz session {session_id} not found, expired or already submitted",
+        )
+
+
 class UserNotFoundError(HTTPException):
     def __init__(self, user_id: str = None):
         detail = "User not found"
@@ -31,6 +39,15 @@ class ForbiddenError(HTTPException):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
 
+class ServiceUnavailableError(HTTPException):
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 class ValidationError(HTTPException):
     def __init__(self, detail: str, field: str = None):
         error_detail = {"detail": detail}
@@ -0,0 +1,111 @@
+"""
+Bounded worker pool for bcrypt hashing and verification.
+
+A bcrypt check costs ~250ms of CPU. Running it in the request (or on the
+shared request threadpool) lets a login spike starve every other request on
+the worker, so password work goes to a small dedicated thread pool instead;
+bcrypt releases the GIL while hashing. When PASSWORD_HASH_WORKERS operations
+are running and PASSWORD_HASH_QUEUE_SIZE more are waiting, further requests
+are rejected with 503 rather than queued without bound.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Dedicated thread pool with a bounded queue and wait-time metrics."""
+
+    def __init__(self, workers: int = 4, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run func(*args) on the pool and await its result.
+
+        Raises ServiceUnavailableError if the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailableError(
+                    "Too many login requests in progress. Please try again shortly."
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - submitted
+            try:
+                return func(*args)
+            finally:
+                # Released when the work finishes, even if the caller went away
+                with self._lock:
+                    self._pending -= 1
+                    self.completed += 1
+                    self.total_wait += waited
+                    self.max_wait = max(self.max_wait, waited)
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), task
+            )
+        except RuntimeError:
+            # Executor shut down before the task was scheduled
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_progress": min(self._pending, self.workers),
+                "queued": max(self._pending - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": (
+                    self.total_wait / self.completed * 1000 if self.completed else 0.0
+                ),
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; a later run() starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Global singleton instance
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
@@ -0,0 +1,383 @@
+"""
+Rate limiter storage shared by all workers.
+
+slowapi's default in-memory storage counts per worker process, so with N
+workers every limit is effectively N times higher. RATE_LIMIT_STORAGE_URI
+selects the storage:
+
+- "memory://": per-process counters (slowapi default)
+- "database://": the rate_limit_counters table in DATABASE_URL
+- "redis://host:port/db": counters on a Redis server (or anything speaking
+  the Redis protocol)
+- any other URI is handed to slowapi/limits unchanged (e.g. memcached://)
+
+For "database://" and "redis://", each worker reserves quota from the shared
+counter in chunks and serves hits from the reserved chunk locally, so most
+requests do not touch the network. A chunk is a tenth of the quota left at
+the previous reservation, but at least 3 hits (so login's 5/minute is
+reserved in two updates rather than five) and never more than
+RATE_LIMIT_PREFETCH hits or the quota left. Limits stay globally correct:
+reserved-but-unused hits can only make a worker admit fewer requests, never
+more.
+
+Reserving a chunk is a network round trip, and slowapi checks limits
+synchronously, so RateLimitMiddleware and the auth routes' limit
+dependencies run the check in the threadpool instead of on the event loop.
+"""
+import logging
+import threading
+import time
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from limits.storage import Storage
+from slowapi import Limiter
+from slowapi.middleware import (SlowAPIMiddleware, _find_route_handler,
+                                _should_exempt, sync_check_limits)
+from slowapi.util import get_remote_address
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.models.rate_limit import RateLimitCounter
+from app.repositories.base import upsert_insert
+
+logger = logging.getLogger(__name__)
+
+# Delete expired counter rows once per this many reservations
+SQL_CLEANUP_EVERY = 1000
+
+
+def _utc_naive(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=UTC).timestamp()
+
+
+class SqlRateLimitCounters:
+    """Fixed-window counters in the rate_limit_counters table."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._reservations = 0
+
+    def incr(self, key: str, expiry: int, amount: int) -> Tuple[int, float]:
+        """Add amount to the key's window; returns (new count, window end)."""
+        now = time.time()
+        table = RateLimitCounter.__table__
+        db = self.session_factory()
+        try:
+            stmt = upsert_insert(db)(RateLimitCounter).values(
+                key=key, count=amount, expires_at=_utc_naive(now + expiry)
+            )
+            # An expired window restarts at this hit
+            expired = table.c.expires_at <= _utc_naive(now)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={
+                    "count": case(
+                        (expired, stmt.excluded.count),
+                        else_=table.c.count + stmt.excluded.count,
+                    ),
+                    "expires_at": case(
+                        (expired, stmt.excluded.expires_at), else_=table.c.expires_at
+                    ),
+                },
+            ).returning(table.c.count, table.c.expires_at)
+            count, expires_at = db.execute(stmt).one()
+
+            self._reservations += 1
+            if self._reservations % SQL_CLEANUP_EVERY == 0:
+                db.query(RateLimitCounter).filter(
+                    RateLimitCounter.expires_at <= _utc_naive(now)
+                ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        return count, _timestamp(expires_at)
+
+    def _row(self, key: str) -> Optional[RateLimitCounter]:
+        db = self.session_factory()
+        try:
+            row = db.query(RateLimitCounter).filter(RateLimitCounter.key == key).first()
+        finally:
+            db.close()
+        if row is None or _timestamp(row.expires_at) <= time.time():
+            return None
+        return row
+
+    def get(self, key: str) -> int:
+        row = self._row(key)
+        return row.count if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._row(key)
+        return _timestamp(row.expires_at) if row else time.time()
+
+    def clear(self, key: str) -> None:
+        db = self.session_factory()
+        try:
+            db.query(RateLimitCounter).filter(RateLimitCounter.key == key).delete(
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def reset(self) -> int:
+        db = self.session_factory()
+        try:
+            removed = db.query(RateLimitCounter).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        return removed
+
+    def check(self) -> bool:
+        db = self.session_factory()
+        try:
+            db.query(RateLimitCounter.key).first()
+            return True
+        finally:
+            db.close()
+
+
+class RedisRateLimitCounters:
+    """
+    Fixed-window counters as Redis keys expiring with the window. Works with
+    any client exposing set(ex=, nx=), incrby, pttl, expire, get, delete,
+    scan_iter and ping (redis-py, or a stand-in in tests).
+    """
+
+    def __init__(self, client, key_prefix: str = "ratelimit:"):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def incr(self, key: str, expiry: int, amount: int) -> Tuple[int, float]:
+        name = self.key_prefix + key
+        # Starts the window with its expiry if there is no current one
+        self.client.set(name, 0, ex=expiry, nx=True)
+        count = int(self.client.incrby(name, amount))
+        ttl_ms = self.client.pttl(name)
+        if ttl_ms < 0:
+            # The window expired between set and incrby; start a new one
+            self.client.expire(name, expiry)
+            ttl_ms = expiry * 1000
+        return count, time.time() + ttl_ms / 1000
+
+    def get(self, key: str) -> int:
+        return int(self.client.get(self.key_prefix + key) or 0)
+
+    def get_expiry(self, key: str) -> float:
+        return time.time() + max(self.client.pttl(self.key_prefix + key), 0) / 1000
+
+    def clear(self, key: str) -> None:
+        self.client.delete(self.key_prefix + key)
+
+    def reset(self) -> int:
+        keys = list(self.client.scan_iter(match=self.key_prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+    def check(self) -> bool:
+        return bool(self.client.ping())
+
+
+class _Bucket:
+    """Quota reserved from the shared counter for one key and window."""
+
+    __slots__ = ("next_hit", "last_hit", "expires_at")
+
+    def __init__(self, next_hit: int, last_hit: int, expires_at: float):
+        self.next_hit = next_hit
+        self.last_hit = last_hit
+        self.expires_at = expires_at
+
+
+def _limit_amount(key: str) -> Optional[int]:
+    """The limit's amount from a limits key: <namespace>/<ids>/<amount>/<multiples>/<granularity>."""
+    parts = key.rsplit("/", 3)
+    try:
+        return int(parts[-3])
+    except (IndexError, ValueError):
+        return None
+
+
+class PrefetchingStorage(Storage):
+    """
+    limits storage that reserves quota from shared counters in chunks and
+    counts hits against the reserved chunk locally.
+
+    incr() returns each hit's position in the global count for the window,
+    which is what the fixed-window strategy compares against the limit.
+    """
+
+    STORAGE_SCHEME = ["prefetch"]
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        wrap_exceptions: bool = False,
+        counters=None,
+        prefetch: int = 10,
+        min_chunk: int = 3,
+        max_keys: int = 100000,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.counters = counters
+        self.prefetch = prefetch
+        self.min_chunk = min_chunk
+        self.max_keys = max_keys
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.reservations = 0
+
+    @property
+    def base_exceptions(self):
+        return Exception
+
+    def _chunk_size(self, key: str, bucket: Optional[_Bucket], amount: int) -> int:
+        limit = _limit_amount(key)
+        if limit is None:
+            return amount
+        # A tenth of the quota left at the last reservation, so chunks shrink
+        # as the window fills up, but at least min_chunk so that low limits
+        # are prefetched too
+        left = limit - (bucket.last_hit if bucket is not None else 0)
+        chunk = min(self.prefetch, left, max(self.min_chunk, left // 10))
+        return max(amount, chunk)
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.expires_at <= now:
+                bucket = None
+            if bucket is not None and bucket.last_hit - bucket.next_hit + 1 >= amount:
+                bucket.next_hit += amount
+                self.local_hits += 1
+                return bucket.next_hit - 1
+            limit = _limit_amount(key)
+            if bucket is not None and limit is not None and bucket.last_hit >= limit:
+                # The window's quota is used up; counts only grow until it
+                # ends, so reject without asking the shared counter
+                self.local_hits += 1
+                return bucket.last_hit + amount
+
+        chunk = self._chunk_size(key, bucket, amount)
+        count, expires_at = self.counters.incr(key, expiry, chunk)
+        with self._lock:
+            self.reservations += 1
+            if len(self._buckets) >= self.max_keys:
+                self._buckets = {
+                    k: b for k, b in self._buckets.items() if b.expires_at > now
+                }
+            # This call takes the first hits of the chunk; the rest are
+            # served locally
+            first_hit = count - chunk + 1
+            self._buckets[key] = _Bucket(first_hit + amount, count, expires_at)
+            return first_hit + amount - 1
+
+    def get(self, key: str) -> int:
+        return self.counters.get(key)
+
+    def get_expiry(self, key: str) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.expires_at > time.time():
+            return bucket.expires_at
+        return self.counters.get_expiry(key)
+
+    def check(self) -> bool:
+        try:
+            return self.counters.check()
+        except Exception:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            self._buckets.clear()
+        return self.counters.reset()
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+        self.counters.clear(key)
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "local_hits": self.local_hits,
+            "reservations": self.reservations,
+        }
+
+
+def _redis_client(url: str):
+    import redis  # optional dependency, see requirements.txt
+
+    return redis.Redis.from_url(url)
+
+
+@lru_cache
+def get_rate_limit_counters(uri: str):
+    """Shared counters for a database:// or redis:// URI, else None."""
+    if uri.startswith("database://"):
+        from app.database import SessionLocal
+
+        return SqlRateLimitCounters(SessionLocal)
+    if uri.startswith(("redis://", "rediss://")):
+        return RedisRateLimitCounters(_redis_client(uri))
+    return None
+
+
+class RateLimitMiddleware(SlowAPIMiddleware):
+    """
+    SlowAPIMiddleware that checks the default limits in the threadpool when
+    they are counted in shared storage, so reservations do not block the
+    event loop.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        app = request.app
+        limiter: Limiter = app.state.limiter
+        if not isinstance(limiter._storage, PrefetchingStorage):
+            return await super().dispatch(request, call_next)
+        if not limiter.enabled:
+            return await call_next(request)
+
+        handler = _find_route_handler(app.routes, request.scope)
+        if _should_exempt(limiter, handler):
+            return await call_next(request)
+
+        error_response, should_inject_headers = await run_in_threadpool(
+            sync_check_limits, limiter, request, handler, app
+        )
+        if error_response is not None:
+            return error_response
+
+        response = await call_next(request)
+        if should_inject_headers:
+            response = limiter._inject_headers(response, request.state.view_rate_limit)
+        return response
+
+
+def create_limiter(**kwargs) -> Limiter:
+    """Create a slowapi Limiter on the storage configured by RATE_LIMIT_STORAGE_URI."""
+    uri = settings.RATE_LIMIT_STORAGE_URI
+    counters = get_rate_limit_counters(uri)
+    if counters is None:
+        return Limiter(key_func=get_remote_address, storage_uri=uri, **kwargs)
+    return Limiter(
+        key_func=get_remote_address,
+        storage_uri="prefetch://",
+        storage_options={"counters": counters, "prefetch": settings.RATE_LIMIT_PREFETCH},
+        **kwargs,
+    )
@@ -0,0 +1,118 @@
+"""
+Database schema management.
+
+The schema is created and upgraded by the Alembic migrations in alembic/
+(`alembic upgrade head` or `python init_db.py`), never when the app is
+imported. On startup the lifespan hook handles the schema according to
+SCHEMA_STARTUP_MODE:
+
+- "verify" (default): one SELECT on alembic_version; refuse to start if the
+  database is not at the migration head
+- "create": create missing tables with metadata.create_all, for tests and
+  throwaway development databases
+- "skip": do nothing, for the fastest startup when deploys already migrate
+"""
+import ast
+from pathlib import Path
+from typing import Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+VERSIONS_DIR = ALEMBIC_INI.parent / "alembic" / "versions"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database is not at the migration head."""
+
+
+def alembic_config(url: Optional[str] = None):
+    """Alembic Config for this project, optionally for a specific database URL."""
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    # Keep the application's logging configuration
+    config.attributes["configure_logger"] = False
+    if url:
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def _as_set(value) -> Set[str]:
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+def head_revisions() -> Set[str]:
+    """
+    Revisions no other migration revises. Read from the migration files'
+    revision/down_revision assignments, because importing alembic would add
+    about 90 ms to every startup.
+    """
+    revisions, revised = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        for node in ast.parse(path.read_text()).body:
+            if isinstance(node, ast.AnnAssign):
+                target, value = node.target, node.value
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+                target, value = node.targets[0], node.value
+            else:
+                continue
+            if isinstance(target, ast.Name) and target.id == "revision":
+                revisions |= _as_set(ast.literal_eval(value))
+            elif isinstance(target, ast.Name) and target.id == "down_revision":
+                revised |= _as_set(ast.literal_eval(value))
+    return revisions - revised
+
+
+def current_revisions(engine: Engine) -> Set[str]:
+    """Revisions recorded in alembic_version (empty if never migrated)."""
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in rows}
+    except DBAPIError:
+        return set()
+
+
+def verify_schema(engine: Engine) -> None:
+    current, heads = current_revisions(engine), head_revisions()
+    if current != heads:
+        raise SchemaVersionError(
+            f"Database schema is at {sorted(current) or 'no revision'}, "
+            f"expected {sorted(heads)}. Run `alembic upgrade head` "
+            "(or `python init_db.py`) before starting the app."
+        )
+
+
+def upgrade_schema(url: Optional[str] = None, revision: str = "head") -> None:
+    """Apply migrations up to revision (DATABASE_URL unless url is given)."""
+    from alembic import command
+
+    command.upgrade(alembic_config(url), revision)
+
+
+def stamp_schema(url: Optional[str] = None, revision: str = "head") -> None:
+    """Record revision as applied without running migrations."""
+    from alembic import command
+
+    command.stamp(alembic_config(url), revision)
+
+
+def prepare_schema(engine: Engine, mode: str) -> None:
+    """Startup schema handling for SCHEMA_STARTUP_MODE."""
+    if mode == "verify":
+        verify_schema(engine)
+    elif mode == "create":
+        # Models are registered on Base by app.main's imports
+        from app.database import Base
+
+        Base.metadata.create_all(bind=engine)
+    elif mode != "skip":
+        raise ValueError(f"Unknown SCHEMA_STARTUP_MODE {mode!r}")
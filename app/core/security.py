@@ -7,7 +7,9 @@ import bcrypt
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.password_pool import password_hash_pool
 from app.core.token_blacklist import token_blacklist
+from app.core.token_cache import verified_token_cache
 
 
 def _preprocess_password(password: str) -> bytes:
@@ -42,11 +44,30 @@ def get_password_hash(password: str) -> str:
     pattern recommended by security experts.
     """
     password_bytes = _preprocess_password(password)
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash's cost differs from BCRYPT_ROUNDS."""
+    # Modular crypt format: $2b$<cost>$<salt and hash>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt pool; raises 503 if the pool is saturated."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bcrypt pool; raises 503 if the pool is saturated."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None,
@@ -102,6 +123,21 @@ def create_refresh_token(data: dict, token_version: int = 0) -> str:
     return encoded_jwt
 
 
+def _verified_payload(token: str) -> Optional[dict]:
+    """Verify a JWT's signature and expiry, or None if it is invalid."""
+    try:
+        # Tokens are reused for their whole lifetime; skip re-verifying them
+        payload = verified_token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            verified_token_cache.put(token, payload)
+    except JWTError:
+        return None
+    return payload
+
+
 def decode_token(token: str, check_blacklist: bool = True) -> Optional[dict]:
     """
     Decode and verify a JWT token.
@@ -113,17 +149,27 @@ def decode_token(token: str, check_blacklist: bool = True) -> Optional[dict]:
     Returns:
         Token payload if valid, None otherwise
     """
-    try:
-        # Check blacklist first (before expensive decode)
-        if check_blacklist and token_blacklist.is_blacklisted(token):
-            return None
-            
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
-    except JWTError:
+    payload = _verified_payload(token)
+    if payload is None:
+        return None
+
+    # Checked on every call, cached or not, so logout takes effect at once
+    jti = payload.get("jti")
+    if check_blacklist and jti and token_blacklist.is_blacklisted(jti):
+        return None
+    return payload
+
+
+async def decode_token_async(token: str) -> Optional[dict]:
+    """decode_token for async callers: the blacklist check stays off the event loop."""
+    payload = _verified_payload(token)
+    if payload is None:
+        return None
+
+    jti = payload.get("jti")
+    if jti and await token_blacklist.is_blacklisted_async(jti):
         return None
+    return payload
 
 
 def blacklist_token(token: str) -> None:
@@ -133,7 +179,7 @@ def blacklist_token(token: str) -> None:
     Args:
         token: The JWT token to blacklist
     """
-    # Try to get expiry from token for cleanup purposes
+    # The blacklist keys on jti and drops the entry once the token expires
     try:
         payload = jwt.decode(
             token,
@@ -141,9 +187,10 @@ def blacklist_token(token: str) -> None:
             algorithms=[settings.ALGORITHM],
             options={"verify_exp": False},  # Allow expired tokens to be blacklisted
         )
-        exp = payload.get("exp")
-        expires_at = datetime.fromtimestamp(exp, tz=UTC) if exp else None
     except JWTError:
-        expires_at = None
-    
-    token_blacklist.add(token, expires_at)
+        # Tokens that fail verification are rejected anyway
+        return
+
+    jti = payload.get("jti")
+    if jti:
+        token_blacklist.add(jti, payload.get("exp"))
@@ -1,81 +1,388 @@
 """
-Token blacklist for logout functionality.
+Token blacklist (revocation store) for logout functionality.
 
-This provides an in-memory token blacklist for development.
-For production with multiple instances, use Redis instead.
+Revoked tokens are stored by their jti claim with the token's expiry. The
+backend is chosen with TOKEN_REVOCATION_BACKEND:
+
+- "memory": per-process; an expiry-ordered heap lets the background sweeper
+  drop expired entries in O(log n) each without scanning the whole blacklist
+- "database": the revoked_tokens table, shared by every worker
+- "redis": keys with a TTL on a Redis server (or anything speaking the Redis
+  protocol), shared by every worker
+
+Shared backends are wrapped in a local read-through cache, so the check done
+on every authenticated request stays a dict lookup. A revocation made on
+another worker is seen within TOKEN_REVOCATION_CACHE_SECONDS. Async callers
+use is_blacklisted_async, which runs lookups that reach the shared store in
+the threadpool rather than on the event loop.
 """
+import heapq
 import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import UTC, datetime
-from threading import Lock
-from typing import Optional, Set
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.user import RevokedToken
+from app.repositories.base import upsert_insert
 
 logger = logging.getLogger(__name__)
 
 
-class TokenBlacklist:
+class RevocationStore(ABC):
     """
-    In-memory token blacklist with automatic cleanup of expired entries.
-    
-    For production deployments with multiple server instances,
-    replace this with a Redis-based implementation.
+    Interface of the token blacklist backends, plus the background sweeper
+    that calls cleanup_expired periodically.
     """
 
-    def __init__(self):
-        self._blacklisted_tokens: Set[str] = set()
-        self._token_expiry: dict[str, datetime] = {}
-        self._lock = Lock()
+    def __init__(self, default_ttl_seconds: float = 7 * 24 * 3600):
+        # Used for tokens without an exp claim, so every entry expires
+        self.default_ttl_seconds = default_ttl_seconds
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _expires_at(self, expires_at: Optional[float]) -> float:
+        if expires_at is None:
+            return time.time() + self.default_ttl_seconds
+        return expires_at
 
-    def add(self, token: str, expires_at: Optional[datetime] = None) -> None:
+    @abstractmethod
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
         """
         Add a token to the blacklist.
-        
+
         Args:
-            token: The JWT token to blacklist
-            expires_at: When the token expires (for cleanup purposes)
+            jti: The token's unique ID (jti claim)
+            expires_at: The token's exp as a Unix timestamp
         """
-        with self._lock:
-            self._blacklisted_tokens.add(token)
-            if expires_at:
-                self._token_expiry[token] = expires_at
-            logger.info("Token added to blacklist")
 
-    def is_blacklisted(self, token: str) -> bool:
-        """Check if a token is blacklisted."""
+    @abstractmethod
+    def is_blacklisted(self, jti: str) -> bool:
+        """Check if a token ID is blacklisted."""
+
+    async def is_blacklisted_async(self, jti: str) -> bool:
+        """is_blacklisted for the event loop; the lookup runs in the threadpool."""
+        return await run_in_threadpool(self.is_blacklisted, jti)
+
+    def cleanup_expired(self) -> int:
+        """Remove expired entries; returns the number removed."""
+        return 0
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Clear all blacklisted tokens (for testing)."""
+
+    def start_sweeper(self, interval_seconds: float) -> None:
+        """Run cleanup_expired every interval_seconds on a daemon thread."""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+
+        def sweep():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.cleanup_expired()
+                except Exception:
+                    logger.exception("Token blacklist sweep failed")
+
+        self._sweeper = threading.Thread(
+            target=sweep, name="token-blacklist-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+
+class TokenBlacklist(RevocationStore):
+    """
+    In-memory jti blacklist with heap-ordered expiry.
+
+    For production deployments with multiple server instances, use the
+    "database" or "redis" backend instead.
+    """
+
+    def __init__(self, default_ttl_seconds: float = 7 * 24 * 3600):
+        super().__init__(default_ttl_seconds)
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.added = 0
+        self.expired = 0
+        self.last_sweep_at: Optional[float] = None
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        expires_at = self._expires_at(expires_at)
         with self._lock:
-            return token in self._blacklisted_tokens
+            if self._expiry.get(jti, 0) >= expires_at:
+                return
+            self._expiry[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+            self.added += 1
+        logger.info("Token added to blacklist")
+
+    def is_blacklisted(self, jti: str) -> bool:
+        return jti in self._expiry
+
+    async def is_blacklisted_async(self, jti: str) -> bool:
+        # A dict lookup; not worth a thread hop
+        return self.is_blacklisted(jti)
 
     def cleanup_expired(self) -> int:
-        """
-        Remove expired tokens from the blacklist.
-        
-        Returns:
-            Number of tokens removed
-        """
-        now = datetime.now(UTC)
+        now = time.time()
         removed = 0
-        
+
         with self._lock:
-            expired_tokens = [
-                token for token, expiry in self._token_expiry.items()
-                if expiry < now
-            ]
-            
-            for token in expired_tokens:
-                self._blacklisted_tokens.discard(token)
-                del self._token_expiry[token]
-                removed += 1
-        
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, jti = heapq.heappop(self._heap)
+                # Skip heap entries superseded by a later add() of the same jti
+                if self._expiry.get(jti) == expires_at:
+                    del self._expiry[jti]
+                    removed += 1
+            self.expired += removed
+            self.last_sweep_at = now
+
         if removed > 0:
             logger.info(f"Cleaned up {removed} expired tokens from blacklist")
-        
+
         return removed
 
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._expiry),
+                "heap_size": len(self._heap),
+                "added": self.added,
+                "expired": self.expired,
+                "last_sweep_at": self.last_sweep_at,
+            }
+
     def clear(self) -> None:
-        """Clear all blacklisted tokens (for testing)."""
         with self._lock:
-            self._blacklisted_tokens.clear()
-            self._token_expiry.clear()
+            self._expiry.clear()
+            self._heap.clear()
+
+
+def _utc_naive(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC).replace(tzinfo=None)
+
+
+class SqlRevocationStore(RevocationStore):
+    """revoked_tokens table backend, shared across workers and nodes."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        default_ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        super().__init__(default_ttl_seconds)
+        self.session_factory = session_factory
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        expires_at = _utc_naive(self._expires_at(expires_at))
+        db = self.session_factory()
+        try:
+            db.execute(
+                upsert_insert(db)(RevokedToken)
+                .values(jti=jti, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            )
+            db.commit()
+        finally:
+            db.close()
+        logger.info("Token added to blacklist")
+
+    def is_blacklisted(self, jti: str) -> bool:
+        db = self.session_factory()
+        try:
+            return (
+                db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first()
+                is not None
+            )
+        finally:
+            db.close()
+
+    def cleanup_expired(self) -> int:
+        db = self.session_factory()
+        try:
+            removed = (
+                db.query(RevokedToken)
+                .filter(RevokedToken.expires_at <= _utc_naive(time.time()))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+        if removed > 0:
+            logger.info(f"Cleaned up {removed} expired tokens from blacklist")
+        return removed
+
+    def stats(self) -> dict:
+        db = self.session_factory()
+        try:
+            return {"backend": "database", "size": db.query(RevokedToken).count()}
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        db = self.session_factory()
+        try:
+            db.query(RevokedToken).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Redis backend: one key per revoked jti, expiring with the token, so
+    Redis does the cleanup. Works with any client exposing set(ex=),
+    exists, scan_iter and delete (redis-py, or a stand-in in tests).
+    """
+
+    def __init__(
+        self, client, key_prefix: str = "revoked:", default_ttl_seconds: float = 7 * 24 * 3600
+    ):
+        super().__init__(default_ttl_seconds)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        ttl = math.ceil(self._expires_at(expires_at) - time.time())
+        if ttl <= 0:
+            return
+        self.client.set(self.key_prefix + jti, 1, ex=ttl)
+        logger.info("Token added to blacklist")
+
+    def is_blacklisted(self, jti: str) -> bool:
+        return bool(self.client.exists(self.key_prefix + jti))
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.key_prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class CachedRevocationStore(RevocationStore):
+    """
+    Local read-through cache over a shared store.
+
+    Revoked jtis are cached until evicted (revocation is permanent);
+    "not revoked" answers are reused for ttl_seconds. Revocations made
+    through this process are cached immediately.
+    """
+
+    def __init__(self, store: RevocationStore, ttl_seconds: float = 1.0, max_entries: int = 100000):
+        super().__init__(store.default_ttl_seconds)
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # jti -> (revoked, valid until on the monotonic clock)
+        self._entries: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, jti: str, revoked: bool) -> None:
+        valid_until = math.inf if revoked else time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[jti] = (revoked, valid_until)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        self.store.add(jti, expires_at)
+        self._remember(jti, True)
+
+    def _cached(self, jti: str) -> Optional[bool]:
+        entry = self._entries.get(jti)
+        if entry is not None and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def is_blacklisted(self, jti: str) -> bool:
+        revoked = self._cached(jti)
+        if revoked is None:
+            revoked = self.store.is_blacklisted(jti)
+            self._remember(jti, revoked)
+        return revoked
+
+    async def is_blacklisted_async(self, jti: str) -> bool:
+        """Answer cache hits inline; misses query the store off the event loop."""
+        revoked = self._cached(jti)
+        if revoked is None:
+            revoked = await self.store.is_blacklisted_async(jti)
+            self._remember(jti, revoked)
+        return revoked
+
+    def cleanup_expired(self) -> int:
+        return self.store.cleanup_expired()
+
+    def stats(self) -> dict:
+        return {
+            **self.store.stats(),
+            "local_entries": len(self._entries),
+            "local_hits": self.hits,
+            "local_misses": self.misses,
+        }
+
+    def clear(self) -> None:
+        self.store.clear()
+        with self._lock:
+            self._entries.clear()
+
+
+def _redis_client(url: str):
+    import redis  # optional dependency, see requirements.txt
+
+    return redis.Redis.from_url(url)
+
+
+def create_token_blacklist() -> RevocationStore:
+    """Create the store configured by TOKEN_REVOCATION_BACKEND."""
+    default_ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+    backend = settings.TOKEN_REVOCATION_BACKEND
+    if backend == "database":
+        from app.database import SessionLocal
+
+        store = SqlRevocationStore(SessionLocal, default_ttl_seconds=default_ttl)
+    elif backend == "redis":
+        store = RedisRevocationStore(
+            _redis_client(settings.REDIS_URL), default_ttl_seconds=default_ttl
+        )
+    else:
+        if backend != "memory":
+            logger.warning(
+                f"Unknown TOKEN_REVOCATION_BACKEND {backend!r}; using memory"
+            )
+        return TokenBlacklist(default_ttl_seconds=default_ttl)
+
+    if settings.TOKEN_REVOCATION_CACHE_SECONDS > 0:
+        store = CachedRevocationStore(
+            store, ttl_seconds=settings.TOKEN_REVOCATION_CACHE_SECONDS
+        )
+    return store
 
 
 # Global singleton instance
-token_blacklist = TokenBlacklist()
+token_blacklist = create_token_blacklist()
@@ -0,0 +1,65 @@
+"""
+Cache of verified JWT payloads.
+
+An access token is presented on every request for up to an hour, so
+decode_token keeps the payload of tokens it has already verified, keyed by a
+SHA-256 digest of the token. Entries are dropped at the token's exp, and
+decode_token checks the blacklist on every call, including cache hits.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token payloads, expiring at each token's exp."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._payloads: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return a copy of the token's verified payload, or None."""
+        key = _digest(token)
+        with self._lock:
+            entry = self._payloads.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._payloads[key]
+                return None
+            self._payloads.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a verified payload; tokens without exp are not cached."""
+        exp = payload.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = _digest(token)
+        with self._lock:
+            self._payloads[key] = (exp, dict(payload))
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.max_entries:
+                self._payloads.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clear all entries (for testing)."""
+        with self._lock:
+            self._payloads.clear()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+# Global singleton instance
+verified_token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
@@ -0,0 +1,86 @@
+"""
+Cache of the user fields checked on every authenticated request.
+
+get_current_user only needs is_active, is_admin and token_version, so these
+are kept per user ID in a bounded LRU with a TTL instead of loading the user
+row for each request. Changes made in this process (invalidate_all_tokens,
+deactivation) invalidate the entry immediately; the TTL bounds how long other
+workers keep accepting a revoked token.
+"""
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The authenticated user as seen by route dependencies."""
+
+    id: uuid.UUID
+    is_active: bool
+    is_admin: bool
+    token_version: int
+
+    @classmethod
+    def from_model(cls, user) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            token_version=user.token_version,
+        )
+
+
+class UserAuthCache:
+    """Bounded LRU of AuthenticatedUser by user ID with a TTL. Per-process only."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._users: "OrderedDict[str, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id) -> Optional[AuthenticatedUser]:
+        """Return the cached user, or None if missing or expired."""
+        key = str(user_id)
+        with self._lock:
+            entry = self._users.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._users[key]
+                return None
+            self._users.move_to_end(key)
+            return entry[1]
+
+    def put(self, user: AuthenticatedUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = str(user.id)
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._users[key] = (expires_at, user)
+            self._users.move_to_end(key)
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._users.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        """Clear all entries (for testing)."""
+        with self._lock:
+            self._users.clear()
+
+
+# Global singleton instance
+user_auth_cache = UserAuthCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
@@ -1,31 +1,164 @@
+from functools import lru_cache
+
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.db_pool import engine_options, pool_stats
+from app.core.db_routing import (REQUEST_STATE, USE_REPLICA, RecentWriters,
+                                 RoutingSession, track_writes)
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=(
-        {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-    ),
+# Optional read replica for GET requests (see app.core.db_routing)
+read_engine = (
+    create_engine(settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL))
+    if settings.DATABASE_READ_URL
+    else None
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    replica=read_engine,
+)
+
+# Users whose reads stay on the primary after their own writes
+recent_writers = RecentWriters(
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS, secret=settings.SECRET_KEY
+)
+track_writes(RoutingSession, recent_writers)
+
+_READ_METHODS = ("GET", "HEAD")
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    """Dependency for getting database session."""
+def get_db(request: Request):
+    """
+    Dependency for getting database session.
+
+    The Session checks out a pooled connection only on its first query, so
+    requests served from in-process caches never hold one. GET requests
+    read from the replica when DATABASE_READ_URL is set.
+    """
     db = SessionLocal()
+    db.info[USE_REPLICA] = request.method in _READ_METHODS
+    db.info[REQUEST_STATE] = request.state
     try:
         yield db
     finally:
         db.close()
 
 
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL's driver for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    drivers = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+    if dialect not in drivers:
+        raise ValueError(f"No async driver configured for {dialect}")
+    return f"{dialect}+{drivers[dialect]}{sep}{rest}"
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker():
+    """
+    Create the async engine and session factory on first use, so the async
+    drivers are only required when ASYNC_DATABASE_ENABLED is set.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(url, **engine_options(url, is_async=True))
+    replica = None
+    if settings.DATABASE_READ_URL:
+        read_url = to_async_url(settings.DATABASE_READ_URL)
+        replica = create_async_engine(
+            read_url, **engine_options(read_url, is_async=True)
+        ).sync_engine
+    return async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replica=replica,
+    )
+
+
+class ThreadpoolSession:
+    """
+    A sync Session behind AsyncSession's run_sync() interface.
+
+    Async services only use run_sync(), so the same code runs on the event
+    loop with an AsyncSession or on the threadpool with this wrapper.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def get_async_db(request: Request):
+    """
+    Dependency for async routes: an AsyncSession when ASYNC_DATABASE_ENABLED,
+    otherwise a ThreadpoolSession over a regular Session.
+    """
+    use_replica = request.method in _READ_METHODS
+    if settings.ASYNC_DATABASE_ENABLED:
+        async with get_async_sessionmaker()() as db:
+            db.info[USE_REPLICA] = use_replica
+            db.info[REQUEST_STATE] = request.state
+            yield db
+    else:
+        db = ThreadpoolSession(SessionLocal())
+        db.info[USE_REPLICA] = use_replica
+        db.info[REQUEST_STATE] = request.state
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+def get_pool_stats() -> dict:
+    """Pool statistics for every engine created so far."""
+    stats = {"sync": pool_stats(engine)}
+    if read_engine is not None:
+        stats["read"] = pool_stats(read_engine)
+    if get_async_sessionmaker.cache_info().currsize:
+        kw = get_async_sessionmaker().kw
+        stats["async"] = pool_stats(kw["bind"].sync_engine)
+        if kw["replica"] is not None:
+            stats["async_read"] = pool_stats(kw["replica"])
+    return stats
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engines' pools if they were created."""
+    if get_async_sessionmaker.cache_info().currsize:
+        from sqlalchemy.ext.asyncio import AsyncEngine
+
+        kw = get_async_sessionmaker().kw
+        await kw["bind"].dispose()
+        if kw["replica"] is not None:
+            await AsyncEngine(kw["replica"]).dispose()
+
+
 def clean_database(create_default_levels: bool = True):
     """
     Drop all tables and recreate them.
@@ -38,16 +171,19 @@ def clean_database(create_default_levels: bool = True):
     Returns:
         None
     """
+    from app.core.schema import stamp_schema
     from app.repositories.level_repository import LevelRepository
     
     # Import all models to ensure they're registered with Base.metadata
-    from app.models import level, progress, quiz, quiz_sentence, user, vocabulary  # noqa: F401
+    from app.models import (cache_version, level, progress,  # noqa: F401
+                            quiz, quiz_sentence, rate_limit, user, vocabulary)
     
     # Drop all tables
     Base.metadata.drop_all(bind=engine)
     
-    # Create all tables
+    # Create all tables and record them as the latest migration
     Base.metadata.create_all(bind=engine)
+    stamp_schema(settings.DATABASE_URL)
     
     # Create default levels if requested
     if create_default_levels:
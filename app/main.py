@@ -1,23 +1,31 @@
 import logging
 import warnings
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
 from app.api.v1 import (auth, flashcards, progress, quiz, sentences,
                         vocabulary)
 from app.core.config import settings
-from app.database import Base, engine
+from app.core.db_routing import set_recent_write_cookie
+from app.core.password_pool import password_hash_pool
+from app.core.rate_limit import RateLimitMiddleware, create_limiter
+from app.core.token_blacklist import token_blacklist
+from app.core.schema import prepare_schema
+from app.database import dispose_async_engine, engine, recent_writers
 # Import models to ensure they're registered with SQLAlchemy
+from app.models import cache_version as cache_version_model  # noqa: F401
 from app.models import progress as progress_model  # noqa: F401
 from app.models import quiz as quiz_model  # noqa: F401
+from app.models import rate_limit as rate_limit_model  # noqa: F401
 from app.models import user  # noqa: F401
 from app.models import vocabulary as vocab_model  # noqa: F401
+from app.services.vocabulary_catalog import vocabulary_catalog
+from app.utils.distractor_index import get_distractor_index
 
 # Configure logging
 logging.basicConfig(
@@ -29,23 +37,36 @@ logger = logging.getLogger(__name__)
 # Suppress deprecation warning from python-jose library (third-party issue)
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="jose")
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Rate limiter configuration
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+limiter = create_limiter(default_limits=["100/minute"])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check the schema, warm in-process caches and start background sweeps."""
+    prepare_schema(engine, settings.SCHEMA_STARTUP_MODE)
+    if settings.CATALOG_CACHE_ENABLED:
+        vocabulary_catalog.warm()
+        get_distractor_index(settings.DISTRACTOR_INDEX_PATH)
+    token_blacklist.start_sweeper(settings.TOKEN_BLACKLIST_SWEEP_SECONDS)
+    yield
+    token_blacklist.stop_sweeper()
+    await dispose_async_engine()
+    password_hash_pool.shutdown()
+
 
 app = FastAPI(
     title="Vocabulary Wizard API",
     description="FastAPI backend for Vocabulary iOS application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add rate limiter to app state
 app.state.limiter = limiter
 
 # Add rate limiting middleware
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(RateLimitMiddleware)
 
 # Custom rate limit exceeded handler
 @app.exception_handler(RateLimitExceeded)
@@ -56,6 +77,13 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         content={"detail": "Too many requests. Please try again later."},
     )
 
+# Lets the user's next requests read from the primary on any worker
+@app.middleware("http")
+async def recent_write_cookie(request: Request, call_next):
+    response = await call_next(request)
+    set_recent_write_cookie(request, response, recent_writers)
+    return response
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -111,6 +139,26 @@ def health_check_db():
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
 
+@app.get("/health/db/pool")
+def health_check_db_pool():
+    """Connection pool occupancy and checkout wait times."""
+    from app.database import get_pool_stats
+
+    return get_pool_stats()
+
+
+@app.get("/health/password-pool")
+def health_check_password_pool():
+    """bcrypt pool occupancy, queue depth and rejected requests."""
+    return password_hash_pool.stats()
+
+
+@app.get("/health/token-blacklist")
+def health_check_token_blacklist():
+    """Revoked tokens held in memory and sweeper progress."""
+    return token_blacklist.stats()
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class CacheVersion(Base):
+    """
+    Version counters for in-process caches. Writers bump a cache's version
+    and every worker reloads its copy when the version it sees changes.
+    """
+
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -53,6 +53,21 @@ class Level(Base):
         }
         return mapping.get(level, "")
 
+    @classmethod
+    def from_year_group(cls, year: str) -> int:
+        """Convert an old year group (year3-year6) to a level number."""
+        mapping = {
+            "year3": cls.LEVEL_1,
+            "year4": cls.LEVEL_2,
+            "year5": cls.LEVEL_3,
+            "year6": cls.LEVEL_4,
+        }
+        return mapping.get((year or "").lower(), cls.LEVEL_1)
+
+    @classmethod
+    def to_year_group(cls, level: int) -> str:
+        """Convert a level number to its old year group (year3-year6)."""
+        return f"year{level + 2}"
 
     @classmethod
     def all_levels(cls):
@@ -42,3 +42,22 @@ class UserProgress(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "vocabulary_item_id", name="uq_user_progress"),
     )
+
+
+class UserLevelStats(Base):
+    """
+    Per-user, per-level progress counters backing GET /progress.
+
+    Kept up to date in the same transaction as user_progress writes, so the
+    dashboard reads a handful of rows instead of aggregating the catalogue.
+    Rebuild from user_progress with scripts/rebuild_level_stats.py.
+    """
+    __tablename__ = "user_level_stats"
+
+    user_id = Column(
+        UUIDType, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    level = Column(Integer, primary_key=True)
+    mastered_words = Column(Integer, default=0, nullable=False)
+    practiced_words = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
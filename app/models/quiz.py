@@ -46,3 +46,26 @@ class SentenceQuestion(Base):
     correct_word = Column(String(255), nullable=False)
     options = Column(JSONType, nullable=False)  # List of strings
     created_at = Column(DateTime, default=utc_now, nullable=False)
+
+
+class QuizSession(Base):
+    """
+    Answer key of a generated quiz or sentence session, kept until graded.
+
+    questions holds only [question_id, vocabulary_item_id, correct] triples,
+    where correct is the option index (quiz) or the correct word (sentences).
+    """
+    __tablename__ = "quiz_sessions"
+
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind = Column(String(20), nullable=False)  # "quiz" or "sentence"
+    year = Column(String(10), nullable=False)
+    questions = Column(JSONType, nullable=False)
+    total_questions = Column(Integer, nullable=False)
+    correct_answers = Column(Integer, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=utc_now, nullable=False)
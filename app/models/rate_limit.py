@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.database import Base
+
+
+class RateLimitCounter(Base):
+    """Fixed-window rate limit counters, for RATE_LIMIT_STORAGE_URI=database://."""
+
+    __tablename__ = "rate_limit_counters"
+
+    key = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime, nullable=False, index=True)
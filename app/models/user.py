@@ -32,3 +32,12 @@ class User(Base):
     progress = relationship(
         "UserProgress", back_populates="user", cascade="all, delete-orphan"
     )
+
+
+class RevokedToken(Base):
+    """Revoked token IDs, for TOKEN_REVOCATION_BACKEND=database."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, Column, DateTime, String, Text
+from sqlalchemy import DDL, JSON, Column, DateTime, String, Text, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -60,3 +60,57 @@ class VocabularyItem(Base):
     def level_numbers(self):
         """Get list of level numbers (1, 2, 3, 4) this vocabulary item belongs to."""
         return sorted([vl.level.level for vl in self.vocabulary_levels])
+
+
+# Full-text search structures created alongside the table. Existing databases
+# can be upgraded with scripts/setup_search_index.py.
+SQLITE_SEARCH_DDL = [
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_ai",
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_ad",
+    "DROP TRIGGER IF EXISTS vocabulary_items_fts_au",
+    "DROP TABLE IF EXISTS vocabulary_items_fts",
+    # Rows are keyed by vocabulary_items.id: the implicit rowid of a table
+    # without an INTEGER PRIMARY KEY can change on VACUUM
+    "CREATE VIRTUAL TABLE vocabulary_items_fts USING fts5("
+    "id UNINDEXED, word, meaning, related, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER vocabulary_items_fts_ai "
+    "AFTER INSERT ON vocabulary_items BEGIN "
+    "INSERT INTO vocabulary_items_fts(id, word, meaning, related) "
+    "VALUES (new.id, new.word, new.meaning, "
+    "coalesce(new.synonyms, '') || ' ' || coalesce(new.antonyms, '')); END",
+    "CREATE TRIGGER vocabulary_items_fts_ad "
+    "AFTER DELETE ON vocabulary_items BEGIN "
+    "DELETE FROM vocabulary_items_fts WHERE id = old.id; END",
+    "CREATE TRIGGER vocabulary_items_fts_au "
+    "AFTER UPDATE ON vocabulary_items BEGIN "
+    "DELETE FROM vocabulary_items_fts WHERE id = old.id; "
+    "INSERT INTO vocabulary_items_fts(id, word, meaning, related) "
+    "VALUES (new.id, new.word, new.meaning, "
+    "coalesce(new.synonyms, '') || ' ' || coalesce(new.antonyms, '')); END",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_fts ON vocabulary_items "
+    "USING GIN (to_tsvector('simple', word || ' ' || meaning || ' ' || "
+    "coalesce(synonyms::text, '') || ' ' || coalesce(antonyms::text, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_word_trgm ON vocabulary_items "
+    "USING GIN (lower(word) gin_trgm_ops)",
+    # Keyset pagination orders by code point (see VocabularyRepository._word_key)
+    "CREATE INDEX IF NOT EXISTS ix_vocabulary_items_word_c ON vocabulary_items "
+    '(word COLLATE "C", id)',
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        VocabularyItem.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        VocabularyItem.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
@@ -1,11 +1,22 @@
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import Generic, Iterable, List, Optional, Set, Type, TypeVar
 
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# insert() constructs with on_conflict_do_update for SUPPORTED_DATABASES;
+# Settings rejects database URLs for any other dialect at startup
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def upsert_insert(db: Session):
+    """Get the dialect's insert() construct supporting on_conflict_do_update."""
+    return _UPSERT_INSERTS[db.get_bind().dialect.name]
+
 
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType], db: Session):
@@ -15,6 +26,21 @@ class BaseRepository(Generic[ModelType]):
     def get(self, id: str) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
+    def get_many(self, ids: Iterable) -> List[ModelType]:
+        """Get all rows whose id is in ids with a single IN query."""
+        ids = list(ids)
+        if not ids:
+            return []
+        return self.db.query(self.model).filter(self.model.id.in_(ids)).all()
+
+    def get_existing_ids(self, ids: Iterable) -> Set:
+        """Get the subset of ids that exist, with a single IN query."""
+        ids = list(ids)
+        if not ids:
+            return set()
+        rows = self.db.query(self.model.id).filter(self.model.id.in_(ids)).all()
+        return {row[0] for row in rows}
+
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
 
@@ -0,0 +1,31 @@
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+from app.repositories.base import upsert_insert
+
+
+class CacheVersionRepository:
+    """Repository for the cache_versions table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> int:
+        """The cache's current version; 0 if it was never bumped."""
+        version = (
+            self.db.query(CacheVersion.version)
+            .filter(CacheVersion.name == name)
+            .scalar()
+        )
+        return version or 0
+
+    def bump(self, name: str) -> None:
+        """Increment the cache's version and commit."""
+        table = CacheVersion.__table__
+        stmt = upsert_insert(self.db)(CacheVersion).values(name=name, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={"version": table.c.version + 1},
+        )
+        self.db.execute(stmt)
+        self.db.commit()
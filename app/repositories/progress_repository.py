@@ -1,12 +1,12 @@
 import uuid
-from typing import List, Optional
+from datetime import UTC, datetime
+from typing import Dict, Iterable, List, Optional, Set
 
-from sqlalchemy import func
+from sqlalchemy import case, update
 from sqlalchemy.orm import Session
 
 from app.models.progress import UserProgress
-from app.models.vocabulary import VocabularyItem
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, upsert_insert
 
 
 class ProgressRepository(BaseRepository[UserProgress]):
@@ -52,57 +52,136 @@ class ProgressRepository(BaseRepository[UserProgress]):
         )
         return [row[0] for row in results]
 
-    def get_progress_stats_by_year(
-        self, user_id: uuid.UUID, year: Optional[str] = None
-    ) -> dict:
-        query = self.db.query(
-            VocabularyItem.year,
-            func.count(VocabularyItem.id).label("total_words"),
-            func.count(UserProgress.id)
-            .filter(UserProgress.is_mastered.is_(True))
-            .label("mastered_words"),
-        ).outerjoin(
-            UserProgress,
-            (UserProgress.vocabulary_item_id == VocabularyItem.id)
-            & (UserProgress.user_id == user_id),
-        )
-
-        if year:
-            query = query.filter(VocabularyItem.year == year)
+    def record_practice_many(
+        self, user_id: uuid.UUID, vocabulary_item_ids: Iterable[uuid.UUID], year: str
+    ) -> Set[uuid.UUID]:
+        """
+        Increment times_practiced for several words with one upsert, creating
+        missing progress rows. Does not commit; the caller owns the transaction.
 
-        query = query.group_by(VocabularyItem.year)
-        results = query.all()
+        Returns the IDs of words practiced for the first time.
+        """
+        now = datetime.now(UTC)
+        return self.upsert_many(
+            [
+                {
+                    "user_id": user_id,
+                    "vocabulary_item_id": item_id,
+                    "year_group": year,
+                    "times_practiced": 1,
+                    "last_practiced_at": now,
+                }
+                for item_id in set(vocabulary_item_ids)
+            ]
+        )
 
-        year_stats = []
-        total_words = 0
-        total_mastered = 0
+    def set_mastered(
+        self, user_id: uuid.UUID, mastered_at: Dict[uuid.UUID, datetime]
+    ) -> Set[uuid.UUID]:
+        """
+        Mark existing progress rows as mastered at the given times, leaving
+        rows that are already mastered untouched. Does not commit.
 
-        for row in results:
-            year_total = row.total_words or 0
-            year_mastered = row.mastered_words or 0
-            total_words += year_total
-            total_mastered += year_mastered
+        Returns the IDs of the words this statement mastered. The "not yet
+        mastered" check is part of the UPDATE, so of two concurrent calls for
+        the same word only one gets it back.
+        """
+        if not mastered_at:
+            return set()
+        table = UserProgress.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.user_id == user_id,
+                table.c.vocabulary_item_id.in_(list(mastered_at)),
+                table.c.is_mastered.is_(False),
+            )
+            .values(
+                is_mastered=True,
+                mastered_at=case(
+                    *[
+                        (table.c.vocabulary_item_id == item_id, at)
+                        for item_id, at in mastered_at.items()
+                    ]
+                ),
+            )
+            .returning(table.c.vocabulary_item_id)
+        )
+        return set(self.db.execute(stmt).scalars())
 
-            year_stats.append(
-                {
-                    "year": row.year,
-                    "total_words": year_total,
-                    "mastered_words": year_mastered,
-                    "mastered_percentage": (
-                        (year_mastered / year_total * 100) if year_total > 0 else 0.0
-                    ),
-                }
+    def unset_mastered(self, user_id: uuid.UUID, vocabulary_item_id: uuid.UUID) -> bool:
+        """Unmark a mastered word. Does not commit; returns whether it was mastered."""
+        table = UserProgress.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.user_id == user_id,
+                table.c.vocabulary_item_id == vocabulary_item_id,
+                table.c.is_mastered.is_(True),
             )
+            .values(is_mastered=False, mastered_at=None)
+        )
+        return self.db.execute(stmt).rowcount > 0
 
-        overall_percentage = (
-            (total_mastered / total_words * 100) if total_words > 0 else 0.0
+    def get_user_ids_for_vocabulary_item(self, vocabulary_item_id) -> List[uuid.UUID]:
+        """Get the users that have progress on a word."""
+        rows = (
+            self.db.query(UserProgress.user_id)
+            .filter(UserProgress.vocabulary_item_id == vocabulary_item_id)
+            .all()
         )
+        return [row[0] for row in rows]
 
-        return {
-            "year_progress": year_stats,
-            "overall_progress": {
-                "total_words": total_words,
-                "mastered_words": total_mastered,
-                "mastered_percentage": overall_percentage,
+    def upsert_many(self, rows: List[dict]) -> Set[uuid.UUID]:
+        """
+        Merge aggregated practice rows into user_progress with a single
+        INSERT ... ON CONFLICT on uq_user_progress. Does not commit.
+
+        Each row holds user_id, vocabulary_item_id, year_group,
+        times_practiced (to add) and last_practiced_at; the latest practice
+        timestamp wins. Mastery is set separately with set_mastered.
+
+        Returns the IDs of words practiced for the first time: those whose
+        merged times_practiced equals what this statement added. The count is
+        read back from the write itself, so concurrent merges never both see
+        a word as new.
+        """
+        if not rows:
+            return set()
+        insert = upsert_insert(self.db)
+        now = datetime.now(UTC)
+        stmt = insert(UserProgress).values(
+            [
+                dict(
+                    row,
+                    id=uuid.uuid4(),
+                    is_mastered=False,
+                    mastered_at=None,
+                    created_at=now,
+                    updated_at=now,
+                )
+                for row in rows
+            ]
+        )
+        current = UserProgress.__table__.c
+        new = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[current.user_id, current.vocabulary_item_id],
+            set_={
+                "year_group": new.year_group,
+                "times_practiced": current.times_practiced + new.times_practiced,
+                "last_practiced_at": case(
+                    (current.last_practiced_at.is_(None), new.last_practiced_at),
+                    (new.last_practiced_at > current.last_practiced_at,
+                     new.last_practiced_at),
+                    else_=current.last_practiced_at,
+                ),
+                "updated_at": new.updated_at,
             },
+        ).returning(current.vocabulary_item_id, current.times_practiced)
+        added = {row["vocabulary_item_id"]: row["times_practiced"] for row in rows}
+        return {
+            item_id
+            for item_id, times_practiced in self.db.execute(stmt)
+            if added[item_id] and times_practiced == added[item_id]
         }
@@ -1,7 +1,7 @@
 import uuid
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from app.models.quiz_sentence import QuizSentence
@@ -23,6 +23,18 @@ class QuizSentenceRepository(BaseRepository[QuizSentence]):
             .all()
         )
 
+    def get_sentences_by_vocabulary_item(self) -> Dict[uuid.UUID, List[str]]:
+        """Get all quiz sentence texts grouped by vocabulary item ID."""
+        rows = (
+            self.db.query(QuizSentence.vocabulary_item_id, QuizSentence.sentence)
+            .order_by(QuizSentence.vocabulary_item_id, QuizSentence.id)
+            .all()
+        )
+        sentences = {}
+        for item_id, sentence in rows:
+            sentences.setdefault(item_id, []).append(sentence)
+        return sentences
+
     def get_by_year(
         self, year: str, skip: int = 0, limit: int = 100
     ) -> Tuple[List[QuizSentence], int]:
@@ -44,8 +56,17 @@ class QuizSentenceRepository(BaseRepository[QuizSentence]):
         vocabulary_item_id: Optional[uuid.UUID] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> Tuple[List[QuizSentence], int]:
-        """Get quiz sentences with optional filters."""
+        after: Optional[Tuple[str, uuid.UUID]] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[QuizSentence], Optional[int]]:
+        """
+        Get quiz sentences with optional filters, ordered by (word, id).
+
+        Args:
+            after: Keyset position (word, sentence id) of the last sentence
+                already seen; only sentences after it are returned
+            include_total: Whether to run the separate count query
+        """
         query = self.db.query(QuizSentence).join(VocabularyItem)
 
         if year:
@@ -56,8 +77,27 @@ class QuizSentenceRepository(BaseRepository[QuizSentence]):
                 QuizSentence.vocabulary_item_id == vocabulary_item_id
             )
 
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
+        total = query.count() if include_total else None
+
+        if after:
+            after_word, after_id = after
+            query = query.filter(
+                or_(
+                    VocabularyItem.word > after_word,
+                    and_(
+                        VocabularyItem.word == after_word,
+                        QuizSentence.id > after_id,
+                    ),
+                )
+            )
+
+        items = (
+            query
+            .order_by(VocabularyItem.word, QuizSentence.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
         return items, total
 
@@ -0,0 +1,134 @@
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime, case, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.level import Level, VocabularyLevel
+from app.models.progress import UserLevelStats, UserProgress
+from app.repositories.base import upsert_insert
+
+# Users rebuilt per statement, to stay well below bind parameter limits
+REBUILD_CHUNK_SIZE = 500
+
+
+class UserLevelStatsRepository:
+    """
+    Repository for the user_level_stats counter table.
+
+    Counters are keyed by (user_id, level); a word counts towards every level
+    it belongs to. Write methods do not commit, so counter changes share the
+    transaction of the user_progress write that caused them.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_for_user(
+        self, user_id: uuid.UUID, level: Optional[int] = None
+    ) -> List[UserLevelStats]:
+        """Get a user's counters, ordered by level."""
+        query = self.db.query(UserLevelStats).filter(UserLevelStats.user_id == user_id)
+        if level is not None:
+            query = query.filter(UserLevelStats.level == level)
+        return query.order_by(UserLevelStats.level).all()
+
+    def apply_deltas(
+        self,
+        user_id: uuid.UUID,
+        mastered: Optional[Dict[uuid.UUID, int]] = None,
+        practiced: Optional[Dict[uuid.UUID, int]] = None,
+    ) -> None:
+        """
+        Add per-word mastered/practiced changes (+1 or -1) to the counters
+        of every level those words belong to, with one level lookup and one
+        upsert.
+        """
+        mastered = {k: v for k, v in (mastered or {}).items() if v}
+        practiced = {k: v for k, v in (practiced or {}).items() if v}
+        item_ids = set(mastered) | set(practiced)
+        if not item_ids:
+            return
+
+        rows = (
+            self.db.query(VocabularyLevel.vocabulary_item_id, Level.level)
+            .join(Level)
+            .filter(VocabularyLevel.vocabulary_item_id.in_(item_ids))
+            .all()
+        )
+        deltas = defaultdict(lambda: [0, 0])
+        for item_id, level in rows:
+            deltas[level][0] += mastered.get(item_id, 0)
+            deltas[level][1] += practiced.get(item_id, 0)
+        if not deltas:
+            return
+
+        now = datetime.now(UTC)
+        stmt = upsert_insert(self.db)(UserLevelStats).values(
+            [
+                {
+                    "user_id": user_id,
+                    "level": level,
+                    "mastered_words": mastered_delta,
+                    "practiced_words": practiced_delta,
+                    "updated_at": now,
+                }
+                for level, (mastered_delta, practiced_delta) in deltas.items()
+            ]
+        )
+        current = UserLevelStats.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[current.user_id, current.level],
+            set_={
+                "mastered_words": current.mastered_words
+                + stmt.excluded.mastered_words,
+                "practiced_words": current.practiced_words
+                + stmt.excluded.practiced_words,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt)
+
+    def rebuild(self, user_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """
+        Recompute counters from user_progress for the given users (all users
+        if None) with INSERT ... SELECT aggregates. Does not commit.
+        """
+        if user_ids is None:
+            self.db.query(UserLevelStats).delete(synchronize_session=False)
+            self.db.execute(self._rebuild_statement())
+            return
+
+        user_ids = list(dict.fromkeys(user_ids))
+        for start in range(0, len(user_ids), REBUILD_CHUNK_SIZE):
+            chunk = user_ids[start:start + REBUILD_CHUNK_SIZE]
+            self.db.query(UserLevelStats).filter(
+                UserLevelStats.user_id.in_(chunk)
+            ).delete(synchronize_session=False)
+            self.db.execute(self._rebuild_statement(chunk))
+
+    @staticmethod
+    def _rebuild_statement(user_ids: Optional[List[uuid.UUID]] = None):
+        aggregate = (
+            select(
+                UserProgress.user_id,
+                Level.level,
+                func.sum(case((UserProgress.is_mastered.is_(True), 1), else_=0)),
+                func.sum(case((UserProgress.times_practiced > 0, 1), else_=0)),
+                literal(datetime.now(UTC), DateTime),
+            )
+            .join(
+                VocabularyLevel,
+                VocabularyLevel.vocabulary_item_id == UserProgress.vocabulary_item_id,
+            )
+            .join(Level, Level.id == VocabularyLevel.level_id)
+            .group_by(UserProgress.user_id, Level.level)
+        )
+        if user_ids is not None:
+            aggregate = aggregate.where(UserProgress.user_id.in_(user_ids))
+        return UserLevelStats.__table__.insert().from_select(
+            ["user_id", "level", "mastered_words", "practiced_words", "updated_at"],
+            aggregate,
+        )
@@ -1,16 +1,29 @@
-from typing import List, Optional, Tuple
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import func, or_
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.level import Level, VocabularyLevel
 from app.models.vocabulary import VocabularyItem
 from app.repositories.base import BaseRepository
+from app.repositories.vocabulary_search import escape_like, get_search_backend
 
 
 class VocabularyRepository(BaseRepository[VocabularyItem]):
     """Repository for VocabularyItem operations."""
 
+    def _word_key(self):
+        """
+        VocabularyItem.word compared by code point, the order of SQLite's
+        default BINARY collation and of the in-memory catalog's sort, so
+        keyset cursors page the same rows on both paths. PostgreSQL would
+        otherwise sort by the database's locale collation.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return VocabularyItem.word.collate("C")
+        return VocabularyItem.word
+
     def __init__(self, db: Session):
         super().__init__(VocabularyItem, db)
 
@@ -49,14 +62,7 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
         Get vocabulary items by old year format.
         Converts year to level: year3->1, year4->2, year5->3, year6->4
         """
-        level_mapping = {
-            "year3": 1,
-            "year4": 2,
-            "year5": 3,
-            "year6": 4,
-        }
-        level = level_mapping.get(year.lower(), 1)
-        return self.get_by_level(level, skip, limit)
+        return self.get_by_level(Level.from_year_group(year), skip, limit)
 
     def search(
         self,
@@ -66,16 +72,12 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
         limit: int = 100,
     ) -> List[VocabularyItem]:
         """
-        Search vocabulary items by word or meaning.
+        Search vocabulary items by word, meaning, synonyms or antonyms.
         
-        Optionally filter by level.
+        Results are ordered by relevance. Optionally filter by level.
         """
-        query = self.db.query(VocabularyItem).filter(
-            or_(
-                VocabularyItem.word.ilike(f"%{search_term}%"),
-                VocabularyItem.meaning.ilike(f"%{search_term}%"),
-            )
-        )
+        backend = get_search_backend(self.db.get_bind())
+        query = self.db.query(VocabularyItem).filter(backend.match(search_term))
         
         if level:
             query = (
@@ -85,19 +87,58 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
                 .filter(Level.level == level)
             )
         
-        return query.offset(skip).limit(limit).all()
+        return (
+            query
+            .order_by(
+                backend.rank(search_term), VocabularyItem.word, VocabularyItem.id
+            )
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def get_by_word_prefix(
+        self, prefix: str, level: Optional[int] = None, limit: int = 10
+    ) -> List[VocabularyItem]:
+        """Get vocabulary items whose word starts with prefix (case-insensitive)."""
+        pattern = f"{escape_like(prefix.lower())}%"
+        query = self.db.query(VocabularyItem).filter(
+            func.lower(VocabularyItem.word).like(pattern, escape="\\")
+        )
+
+        if level:
+            query = (
+                query
+                .join(VocabularyLevel)
+                .join(Level)
+                .filter(Level.level == level)
+            )
+
+        return query.order_by(func.lower(VocabularyItem.word)).limit(limit).all()
 
     def get_all_with_filters(
         self,
         level: Optional[int] = None,
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100,
-    ) -> Tuple[List[VocabularyItem], int]:
+        limit: Optional[int] = 100,
+        after: Optional[Tuple[str, uuid.UUID]] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[VocabularyItem], Optional[int]]:
         """
-        Get vocabulary items with optional filters.
+        Get vocabulary items with optional filters, ordered by (word, id),
+        or by relevance when searching.
         
-        Returns tuple of (items, total_count).
+        Args:
+            limit: Page size; None returns all matching items
+            after: Keyset position (word, id) of the last item already seen;
+                when given, only items after it are returned and the
+                offset is not needed. Not meaningful together with search,
+                whose results are ordered by relevance
+            include_total: Whether to run the separate count query
+        
+        Returns tuple of (items, total_count). total_count is None when
+        include_total is False.
         """
         query = self.db.query(VocabularyItem)
 
@@ -109,18 +150,30 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
                 .filter(Level.level == level)
             )
 
+        word = self._word_key()
+        order_by = [word, VocabularyItem.id]
         if search:
+            backend = get_search_backend(self.db.get_bind())
+            query = query.filter(backend.match(search))
+            order_by.insert(0, backend.rank(search))
+
+        total = query.count() if include_total else None
+
+        if after:
+            after_word, after_id = after
             query = query.filter(
                 or_(
-                    VocabularyItem.word.ilike(f"%{search}%"),
-                    VocabularyItem.meaning.ilike(f"%{search}%"),
+                    word > after_word,
+                    and_(
+                        word == after_word,
+                        VocabularyItem.id > after_id,
+                    ),
                 )
             )
 
-        total = query.count()
         items = (
             query
-            .order_by(VocabularyItem.word)
+            .order_by(*order_by)
             .offset(skip)
             .limit(limit)
             .all()
@@ -128,6 +181,14 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
 
         return items, total
 
+    def get_all_ordered(self) -> List[VocabularyItem]:
+        """Get every vocabulary item ordered by (word, id)."""
+        return (
+            self.db.query(VocabularyItem)
+            .order_by(self._word_key(), VocabularyItem.id)
+            .all()
+        )
+
     def get_with_levels(self, item_id) -> Optional[VocabularyItem]:
         """Get a vocabulary item with its levels eagerly loaded."""
         return (
@@ -203,3 +264,49 @@ class VocabularyRepository(BaseRepository[VocabularyItem]):
             .all()
         )
         return [level[0] for level in levels]
+
+    def get_level_numbers_for_words(self, vocab_item_ids: Iterable) -> Dict:
+        """
+        Get level numbers for many vocabulary items in a single query.
+
+        Returns a dict mapping each requested item ID to its sorted list of
+        level numbers (empty list if the item has no levels).
+        """
+        item_ids = list(vocab_item_ids)
+        level_map = {item_id: [] for item_id in item_ids}
+        if not item_ids:
+            return level_map
+
+        rows = (
+            self.db.query(VocabularyLevel.vocabulary_item_id, Level.level)
+            .join(Level)
+            .filter(VocabularyLevel.vocabulary_item_id.in_(item_ids))
+            .order_by(Level.level)
+            .all()
+        )
+        for item_id, level in rows:
+            level_map.setdefault(item_id, []).append(level)
+        return level_map
+
+    def get_level_word_counts(self) -> Dict[int, int]:
+        """Get the number of words in each level."""
+        rows = (
+            self.db.query(Level.level, func.count(VocabularyLevel.id))
+            .join(VocabularyLevel)
+            .group_by(Level.level)
+            .all()
+        )
+        return {level: count for level, count in rows}
+
+    def get_all_level_numbers(self) -> Dict:
+        """Get level numbers for every vocabulary item in a single query."""
+        rows = (
+            self.db.query(VocabularyLevel.vocabulary_item_id, Level.level)
+            .join(Level)
+            .order_by(Level.level)
+            .all()
+        )
+        level_map = {}
+        for item_id, level in rows:
+            level_map.setdefault(item_id, []).append(level)
+        return level_map
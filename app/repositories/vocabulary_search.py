@@ -0,0 +1,182 @@
+"""
+Search backends for vocabulary word/meaning search.
+
+Each backend turns a search term into a match clause and a relevance rank
+that VocabularyRepository composes into its queries:
+
+- PostgresSearchBackend: tsvector/GIN full-text match plus pg_trgm fuzzy
+  matching on the word
+- SQLiteFTSSearchBackend: FTS5 virtual table for development databases
+- LikeSearchBackend: ILIKE fallback when neither index is available
+
+Results are ranked exact word match, then word prefix, then word substring,
+then meaning, then synonyms/antonyms.
+
+The full-text backends, and the in-memory catalog's search
+(VocabularyCatalog.search), match words by prefix: every word of the term
+must start a word of the item's word, meaning or synonyms/antonyms, so "bri"
+finds "bright" but "ample" does not find "example". On top of that SQLite
+ignores diacritics and PostgreSQL also finds near-misspellings of the word.
+LikeSearchBackend, used only until the index is created, and terms without
+any letters or digits match substrings instead.
+"""
+import logging
+import re
+from typing import Dict, List
+
+from sqlalchemy import String, case, cast, func, or_, text
+from sqlalchemy.engine import Engine
+
+from app.models.vocabulary import (POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL,
+                                   VocabularyItem)
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term is matched literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_tokens(text: str) -> List[str]:
+    """Lowercased words of a search term or a searched field."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class LikeSearchBackend:
+    """ILIKE-based search. Works everywhere but needs a sequential scan."""
+
+    name = "like"
+
+    def match(self, term: str):
+        """Return a clause matching items for the search term."""
+        pattern = f"%{escape_like(term)}%"
+        return or_(
+            VocabularyItem.word.ilike(pattern, escape="\\"),
+            VocabularyItem.meaning.ilike(pattern, escape="\\"),
+            cast(VocabularyItem.synonyms, String).ilike(pattern, escape="\\"),
+            cast(VocabularyItem.antonyms, String).ilike(pattern, escape="\\"),
+        )
+
+    def rank(self, term: str):
+        """Return a sortable relevance expression (lower is better)."""
+        term_lower = term.lower()
+        escaped = escape_like(term_lower)
+        word = func.lower(VocabularyItem.word)
+        return case(
+            (word == term_lower, 0),
+            (word.like(f"{escaped}%", escape="\\"), 1),
+            (word.like(f"%{escaped}%", escape="\\"), 2),
+            (VocabularyItem.meaning.ilike(f"%{escaped}%", escape="\\"), 3),
+            else_=4,
+        )
+
+
+class SQLiteFTSSearchBackend(LikeSearchBackend):
+    """FTS5 prefix search over word, meaning and synonyms/antonyms."""
+
+    name = "sqlite_fts5"
+
+    def match(self, term: str):
+        tokens = search_tokens(term)
+        if not tokens:
+            return super().match(term)
+        fts_query = " ".join(f'"{token}"*' for token in tokens)
+        return text(
+            "vocabulary_items.id IN ("
+            "SELECT id FROM vocabulary_items_fts "
+            "WHERE vocabulary_items_fts MATCH :fts_query)"
+        ).bindparams(fts_query=fts_query)
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    """tsvector prefix search plus trigram fuzzy matching on the word."""
+
+    name = "postgres_fts"
+
+    def match(self, term: str):
+        tokens = search_tokens(term)
+        if not tokens:
+            return super().match(term)
+        ts_query = " & ".join(f"{token}:*" for token in tokens)
+        return text(
+            "(to_tsvector('simple', vocabulary_items.word || ' ' || "
+            "vocabulary_items.meaning || ' ' || "
+            "coalesce(vocabulary_items.synonyms::text, '') || ' ' || "
+            "coalesce(vocabulary_items.antonyms::text, '')) "
+            "@@ to_tsquery('simple', :ts_query) "
+            "OR lower(vocabulary_items.word) % :trgm_term)"
+        ).bindparams(ts_query=ts_query, trgm_term=term.lower())
+
+    def rank(self, term: str):
+        # Break ties inside each tier by trigram similarity
+        return (
+            super().rank(term)
+            - func.similarity(func.lower(VocabularyItem.word), term.lower())
+        )
+
+
+_backends: Dict[Engine, LikeSearchBackend] = {}
+
+
+def _detect_backend(engine: Engine) -> LikeSearchBackend:
+    dialect = engine.dialect.name
+    with engine.connect() as conn:
+        if dialect == "sqlite":
+            found = conn.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'vocabulary_items_fts'"
+                )
+            ).first()
+            if found:
+                return SQLiteFTSSearchBackend()
+        elif dialect == "postgresql":
+            found = conn.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first()
+            if found:
+                return PostgresSearchBackend()
+    logger.warning(
+        "Full-text search index not found; falling back to LIKE search. "
+        "Run scripts/setup_search_index.py to create it."
+    )
+    return LikeSearchBackend()
+
+
+def get_search_backend(engine: Engine) -> LikeSearchBackend:
+    """Get the search backend for an engine (detected once per engine)."""
+    backend = _backends.get(engine)
+    if backend is None:
+        backend = _backends[engine] = _detect_backend(engine)
+    return backend
+
+
+def setup_search_index(engine: Engine) -> None:
+    """
+    Create (or rebuild) the full-text search structures for an existing
+    vocabulary_items table.
+
+    New tables get these automatically through the table's after_create hook.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            conn.execute(
+                text(
+                    "INSERT INTO vocabulary_items_fts(id, word, meaning, related) "
+                    "SELECT id, word, meaning, "
+                    "coalesce(synonyms, '') || ' ' || coalesce(antonyms, '') "
+                    "FROM vocabulary_items"
+                )
+            )
+        elif dialect == "postgresql":
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+        else:
+            raise ValueError(f"Search index is not supported for {dialect}")
+    _backends.pop(engine, None)
@@ -15,6 +15,8 @@ from app.schemas.vocabulary import (
     VocabularyItemWithLevelDetails,
     VocabularyListResponse,
     VocabularySearchResponse,
+    VocabularySuggestion,
+    VocabularySuggestResponse,
 )
 
 __all__ = [
@@ -31,4 +33,6 @@ __all__ = [
     "VocabularyItemWithLevelDetails",
     "VocabularyListResponse",
     "VocabularySearchResponse",
+    "VocabularySuggestion",
+    "VocabularySuggestResponse",
 ]
@@ -1,8 +1,11 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+# Upper bound on events accepted by POST /progress/batch
+MAX_BATCH_EVENTS = 500
 
 
 class YearProgress(BaseModel):
@@ -12,6 +15,15 @@ class YearProgress(BaseModel):
     mastered_percentage: float
 
 
+class LevelProgress(BaseModel):
+    level: int
+    name: str
+    total_words: int
+    mastered_words: int
+    practiced_words: int
+    mastered_percentage: float
+
+
 class OverallProgress(BaseModel):
     total_words: int
     mastered_words: int
@@ -20,7 +32,8 @@ class OverallProgress(BaseModel):
 
 class ProgressSummaryResponse(BaseModel):
     user_id: uuid.UUID
-    year_progress: List[YearProgress]
+    level_progress: List[LevelProgress]
+    year_progress: List[YearProgress]  # Same figures keyed by old year group
     overall_progress: OverallProgress
 
 
@@ -49,3 +62,21 @@ class PracticeRequest(BaseModel):
     vocabulary_item_id: uuid.UUID
     year: str
     correct: bool
+
+
+class ProgressEvent(BaseModel):
+    type: Literal["practice", "mastered"]
+    vocabulary_item_id: uuid.UUID
+    year: str
+    occurred_at: datetime  # Client timestamp of the event
+    correct: Optional[bool] = None
+
+
+class BatchProgressRequest(BaseModel):
+    events: List[ProgressEvent] = Field(..., max_length=MAX_BATCH_EVENTS)
+
+
+class BatchProgressResponse(BaseModel):
+    applied_events: int
+    updated_words: int
+    unknown_vocabulary_item_ids: List[uuid.UUID]
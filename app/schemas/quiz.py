@@ -1,8 +1,11 @@
 import uuid
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+# "easy"/"hard" pick distractors unlike/like the answer; "medium" is random
+Difficulty = Literal["easy", "medium", "hard"]
+
 
 class QuizQuestionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -17,6 +20,7 @@ class QuizQuestionResponse(BaseModel):
 class GenerateQuizRequest(BaseModel):
     year: str
     question_count: Optional[int] = None
+    difficulty: Difficulty = "medium"
 
 
 class GenerateQuizResponse(BaseModel):
@@ -65,6 +69,7 @@ class SentenceQuestionResponse(BaseModel):
 class GenerateSentenceRequest(BaseModel):
     year: str
     question_count: Optional[int] = None
+    difficulty: Difficulty = "medium"
 
 
 class GenerateSentenceResponse(BaseModel):
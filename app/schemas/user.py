@@ -48,6 +48,10 @@ class UserResponse(UserBase):
     is_admin: bool = False
 
 
+class UserActiveUpdate(BaseModel):
+    is_active: bool
+
+
 class UserLogin(BaseModel):
     username: str = Field(..., max_length=255)
     password: str = Field(..., max_length=128)
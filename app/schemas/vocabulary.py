@@ -82,3 +82,25 @@ class VocabularySearchResponse(BaseModel):
     total: int
     query: str
     level: Optional[int] = None
+
+
+class VocabularyLevelSnapshot(BaseModel):
+    """Response schema for a whole level's vocabulary (offline sync)."""
+    level: int
+    version: str = Field(..., description="Content version; the ETag is derived from it")
+    total: int
+    items: List[VocabularyItemResponse]
+
+
+class VocabularySuggestion(BaseModel):
+    """A single autocomplete suggestion."""
+    id: uuid.UUID
+    word: str
+    levels: List[int] = Field(default=[])
+
+
+class VocabularySuggestResponse(BaseModel):
+    """Response schema for word autocomplete."""
+    prefix: str
+    level: Optional[int] = None
+    suggestions: List[VocabularySuggestion]
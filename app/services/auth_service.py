@@ -1,13 +1,18 @@
 import logging
 import uuid
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.exceptions import UnauthorizedError, ValidationError
+from app.core.exceptions import (ServiceUnavailableError, UnauthorizedError,
+                                 UserNotFoundError, ValidationError)
 from app.core.security import (blacklist_token, create_access_token,
                                create_refresh_token, decode_token,
-                               get_password_hash, verify_password)
+                               get_password_hash, get_password_hash_async,
+                               password_needs_rehash, verify_password,
+                               verify_password_async)
+from app.core.user_cache import user_auth_cache
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserLogin
@@ -15,12 +20,31 @@ from app.schemas.user import UserCreate, UserLogin
 logger = logging.getLogger(__name__)
 
 
+def issue_login_tokens(user: User) -> dict:
+    """Check a user who passed the password check is active and issue tokens."""
+    if not user.is_active:
+        raise UnauthorizedError("User account is inactive")
+
+    # Create tokens with token version for invalidation support
+    token_data = {"sub": str(user.id), "username": user.username}
+    access_token = create_access_token(token_data, token_version=user.token_version)
+    refresh_token = create_refresh_token(token_data, token_version=user.token_version)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "user": user,
+    }
+
+
 class AuthService:
     def __init__(self, db: Session):
         self.user_repo = UserRepository(db)
 
-    def register(self, user_data: UserCreate) -> User:
-        """Register a new user."""
+    def check_available(self, user_data: UserCreate) -> None:
+        """Raise ValidationError if the username or email is taken."""
         # Check if username already exists
         if self.user_repo.get_by_username(user_data.username):
             raise ValidationError("Username already exists", field="username")
@@ -29,12 +53,19 @@ class AuthService:
         if self.user_repo.get_by_email(user_data.email):
             raise ValidationError("Email already exists", field="email")
 
+    def register(self, user_data: UserCreate, password_hash: Optional[str] = None) -> User:
+        """
+        Register a new user. Pass password_hash if the password was already
+        hashed (e.g. on the bcrypt pool).
+        """
+        self.check_available(user_data)
+
         # Create new user
         user = User(
             id=uuid.uuid4(),
             username=user_data.username,
             email=user_data.email,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=password_hash or get_password_hash(user_data.password),
             full_name=user_data.full_name,
             is_admin=False,
             token_version=0,
@@ -42,28 +73,32 @@ class AuthService:
 
         return self.user_repo.create(user)
 
+    def get_login_user(self, credentials: UserLogin) -> Optional[User]:
+        """Look up the user a login attempt names, by username or email."""
+        return self.user_repo.get_by_username_or_email(credentials.username)
+
     def login(self, credentials: UserLogin) -> dict:
         """Authenticate user and return tokens."""
-        user = self.user_repo.get_by_username_or_email(credentials.username)
+        user = self.get_login_user(credentials)
 
         if not user or not verify_password(credentials.password, user.password_hash):
             raise UnauthorizedError("Incorrect username or password")
 
-        if not user.is_active:
-            raise UnauthorizedError("User account is inactive")
+        if user.is_active and password_needs_rehash(user.password_hash):
+            self.update_password_hash(user.id, get_password_hash(credentials.password))
 
-        # Create tokens with token version for invalidation support
-        token_data = {"sub": str(user.id), "username": user.username}
-        access_token = create_access_token(token_data, token_version=user.token_version)
-        refresh_token = create_refresh_token(token_data, token_version=user.token_version)
+        return issue_login_tokens(user)
 
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            "user": user,
-        }
+    def update_password_hash(self, user_id: uuid.UUID, password_hash: str) -> None:
+        """
+        Store a rehashed password, e.g. after BCRYPT_ROUNDS changed. The
+        password itself is unchanged, so existing tokens stay valid.
+        """
+        user = self.user_repo.get(user_id)
+        if user:
+            user.password_hash = password_hash
+            self.user_repo.update(user)
+            logger.info(f"Password rehashed for user {user.username}")
 
     def refresh_token(self, old_refresh_token: str) -> dict:
         """
@@ -135,4 +170,65 @@ class AuthService:
         if user:
             user.token_version += 1
             self.user_repo.update(user)
+            user_auth_cache.invalidate(user.id)
             logger.info(f"All tokens invalidated for user {user.username}")
+
+    def set_active(self, user_id: str, is_active: bool) -> User:
+        """
+        Activate or deactivate a user (admin action). Deactivation takes
+        effect on this worker's next request for the user.
+        """
+        user = self.user_repo.get(user_id)
+        if not user:
+            raise UserNotFoundError(user_id)
+        user.is_active = is_active
+        user = self.user_repo.update(user)
+        user_auth_cache.invalidate(user.id)
+        logger.info(
+            f"User {user.username} {'activated' if is_active else 'deactivated'}"
+        )
+        return user
+
+
+class AsyncAuthService:
+    """
+    Async registration and login for the async auth routes.
+
+    Database work runs through db.run_sync (see AsyncVocabularyService);
+    bcrypt runs on the dedicated password pool, so neither blocks the event
+    loop and a login spike cannot take over the request threadpool.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda session: getattr(AuthService(session), method)(*args, **kwargs)
+        )
+
+    async def register(self, user_data: UserCreate) -> User:
+        # Reject taken names before spending CPU on the hash; register()
+        # checks again in case of a concurrent registration
+        await self._run("check_available", user_data)
+        password_hash = await get_password_hash_async(user_data.password)
+        return await self._run("register", user_data, password_hash=password_hash)
+
+    async def login(self, credentials: UserLogin) -> dict:
+        user = await self._run("get_login_user", credentials)
+
+        if not user or not await verify_password_async(
+            credentials.password, user.password_hash
+        ):
+            raise UnauthorizedError("Incorrect username or password")
+
+        if user.is_active and password_needs_rehash(user.password_hash):
+            try:
+                password_hash = await get_password_hash_async(credentials.password)
+            except ServiceUnavailableError:
+                # Pool is saturated; the rehash can wait for the next login
+                pass
+            else:
+                await self._run("update_password_hash", user.id, password_hash)
+
+        return issue_login_tokens(user)
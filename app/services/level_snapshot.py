@@ -0,0 +1,138 @@
+"""
+Pre-rendered per-level vocabulary snapshots.
+
+GET /vocabulary/levels/{level}/snapshot returns a whole level as one JSON
+document so clients can sync it with a single conditional GET. The body is
+rendered once per catalog snapshot (admin writes rebuild the catalog, and
+with it the snapshots) and each content encoding is compressed once, on
+first request.
+
+The ETag is a digest of the level's items, so every worker computes the same
+tag for the same content. Compressed representations get a suffix
+(strong ETags must differ per representation); If-None-Match compares the
+digest, so a client holding any encoding of the current content gets 304.
+"""
+import gzip
+import hashlib
+import logging
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.json_response import dumps
+
+logger = logging.getLogger(__name__)
+
+ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gzip", "identity": ""}
+
+# Preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+GZIP_LEVEL = 9
+# Quality 11 is several times slower for a few percent smaller output
+BROTLI_QUALITY = 9
+
+
+@lru_cache
+def _brotli():
+    try:
+        import brotli  # optional dependency, see requirements.txt
+    except ImportError:
+        return None
+    return brotli
+
+
+def available_encodings() -> Tuple[str, ...]:
+    if _brotli() is None:
+        return ("gzip", "identity")
+    return ENCODING_PREFERENCE
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> str:
+    """Best content encoding for an Accept-Encoding header."""
+    if not accept_encoding:
+        return "identity"
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        param = params.strip()
+        if param.startswith("q="):
+            try:
+                q = float(param[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding] = q
+
+    def quality(coding: str) -> float:
+        if coding in qualities:
+            return qualities[coding]
+        if "*" in qualities:
+            return qualities["*"]
+        # identity is acceptable unless explicitly refused
+        return 1.0 if coding == "identity" else 0.0
+
+    candidates = [c for c in available_encodings() if quality(c) > 0]
+    if not candidates:
+        return "identity"
+    return max(candidates, key=lambda c: (quality(c), -ENCODING_PREFERENCE.index(c)))
+
+
+class LevelSnapshot:
+    """One level's vocabulary as a JSON body, its digest and compressed forms."""
+
+    def __init__(self, level: int, items_json: List[bytes]):
+        self.level = level
+        self.total = len(items_json)
+        digest = hashlib.sha256(str(level).encode())
+        for item in items_json:
+            digest.update(b"\n" + item)
+        self.digest = digest.hexdigest()[:32]
+        header = dumps({"level": level, "version": self.digest, "total": self.total})
+        self.body = header[:-1] + b',"items":[' + b",".join(items_json) + b"]}"
+        self._encoded: Dict[str, bytes] = {"identity": self.body}
+        self._lock = Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        return f'"{self.digest}{ENCODING_SUFFIXES[encoding]}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header names any representation of this content."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            # If-None-Match uses the weak comparison
+            tag = tag.removeprefix("W/").strip('"')
+            for suffix in ENCODING_SUFFIXES.values():
+                if suffix and tag.endswith(suffix):
+                    tag = tag[: -len(suffix)]
+                    break
+            if tag == self.digest:
+                return True
+        return False
+
+    def encoded(self, encoding: str) -> bytes:
+        """The body in a content encoding, compressed on first use."""
+        body = self._encoded.get(encoding)
+        if body is not None:
+            return body
+        with self._lock:
+            body = self._encoded.get(encoding)
+            if body is None:
+                if encoding == "gzip":
+                    body = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+                elif encoding == "br":
+                    body = _brotli().compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    raise ValueError(f"Unsupported content encoding {encoding!r}")
+                self._encoded[encoding] = body
+                logger.info(
+                    f"Level {self.level} snapshot {encoding}: "
+                    f"{len(self.body)} -> {len(body)} bytes"
+                )
+        return body
@@ -4,23 +4,90 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.exceptions import VocabularyNotFoundError
+from app.models.level import Level
 from app.models.progress import UserProgress
 from app.repositories.progress_repository import ProgressRepository
+from app.repositories.user_level_stats_repository import (
+    UserLevelStatsRepository,
+)
 from app.repositories.vocabulary_repository import VocabularyRepository
-from app.schemas.progress import MarkMasteredRequest, PracticeRequest
+from app.schemas.progress import (BatchProgressRequest, MarkMasteredRequest,
+                                  PracticeRequest)
+from app.services.vocabulary_catalog import (VocabularyCatalog,
+                                             get_catalog_async,
+                                             vocabulary_catalog)
 
 
 class ProgressService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, catalog: Optional[VocabularyCatalog] = None):
+        self.db = db
+        # Snapshot fetched by an async caller; see AsyncVocabularyService
+        self.catalog = catalog
         self.progress_repo = ProgressRepository(db)
         self.vocab_repo = VocabularyRepository(db)
+        self.stats_repo = UserLevelStatsRepository(db)
 
     def get_progress_summary(
-        self, user_id: uuid.UUID, year: Optional[str] = None
+        self, user_id: uuid.UUID, year: Optional[str] = None, level: Optional[int] = None
     ) -> dict:
-        """Get user's progress summary."""
-        return self.progress_repo.get_progress_stats_by_year(user_id, year)
+        """
+        Get user's progress summary per level from the user_level_stats
+        counters, optionally for a single level (or the level of a year).
+        """
+        if year and level is None:
+            level = Level.from_year_group(year)
+
+        if settings.CATALOG_CACHE_ENABLED:
+            catalog = self.catalog or vocabulary_catalog.get(self.db)
+            level_totals = catalog.level_counts()
+        else:
+            level_totals = self.vocab_repo.get_level_word_counts()
+        counters = {
+            stats.level: stats for stats in self.stats_repo.get_for_user(user_id, level)
+        }
+
+        levels = [level] if level is not None else sorted(level_totals)
+        level_stats = []
+        for number in levels:
+            total = level_totals.get(number, 0)
+            stats = counters.get(number)
+            # Counters can only drift negative if the table was never backfilled
+            mastered = max(stats.mastered_words, 0) if stats else 0
+            practiced = max(stats.practiced_words, 0) if stats else 0
+            level_stats.append(
+                {
+                    "level": number,
+                    "name": Level.get_display_name(number),
+                    "total_words": total,
+                    "mastered_words": mastered,
+                    "practiced_words": practiced,
+                    "mastered_percentage": (mastered / total * 100) if total > 0 else 0.0,
+                }
+            )
+
+        total_words = sum(s["total_words"] for s in level_stats)
+        total_mastered = sum(s["mastered_words"] for s in level_stats)
+        return {
+            "level_progress": level_stats,
+            "year_progress": [
+                {
+                    "year": Level.to_year_group(s["level"]),
+                    "total_words": s["total_words"],
+                    "mastered_words": s["mastered_words"],
+                    "mastered_percentage": s["mastered_percentage"],
+                }
+                for s in level_stats
+            ],
+            "overall_progress": {
+                "total_words": total_words,
+                "mastered_words": total_mastered,
+                "mastered_percentage": (
+                    (total_mastered / total_words * 100) if total_words > 0 else 0.0
+                ),
+            },
+        }
 
     def get_mastered_word_ids(self, user_id: uuid.UUID, year: str) -> List[uuid.UUID]:
         """Get list of mastered word IDs for a year."""
@@ -29,73 +96,187 @@ class ProgressService:
     def mark_mastered(
         self, user_id: uuid.UUID, request: MarkMasteredRequest
     ) -> UserProgress:
-        """Mark a word as mastered."""
+        """
+        Mark a word as mastered. A word that is already mastered keeps its
+        mastered_at; the level counter moves only when this call masters it.
+        """
+        item_id = request.vocabulary_item_id
         # Verify vocabulary item exists
-        vocab_item = self.vocab_repo.get(str(request.vocabulary_item_id))
+        vocab_item = self.vocab_repo.get(str(item_id))
         if not vocab_item:
-            raise VocabularyNotFoundError(str(request.vocabulary_item_id))
+            raise VocabularyNotFoundError(str(item_id))
 
-        # Check if progress already exists
-        progress = self.progress_repo.get_by_user_and_vocabulary(
-            user_id, request.vocabulary_item_id
-        )
-
-        if progress:
-            # Update existing progress
-            progress.is_mastered = True
-            progress.mastered_at = datetime.now(UTC)
-            progress.year_group = request.year
-            return self.progress_repo.update(progress)
-        else:
-            # Create new progress
-            progress = UserProgress(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                vocabulary_item_id=request.vocabulary_item_id,
-                year_group=request.year,
-                is_mastered=True,
-                mastered_at=datetime.now(UTC),
+        try:
+            # Create the progress row if needed (practising nothing)
+            self.progress_repo.upsert_many(
+                [
+                    {
+                        "user_id": user_id,
+                        "vocabulary_item_id": item_id,
+                        "year_group": request.year,
+                        "times_practiced": 0,
+                        "last_practiced_at": None,
+                    }
+                ]
             )
-            return self.progress_repo.create(progress)
+            if self.progress_repo.set_mastered(user_id, {item_id: datetime.now(UTC)}):
+                self.stats_repo.apply_deltas(user_id, mastered={item_id: 1})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return self.progress_repo.get_by_user_and_vocabulary(user_id, item_id)
 
     def unmark_mastered(
         self, user_id: uuid.UUID, vocabulary_item_id: uuid.UUID, year: str
     ) -> None:
         """Unmark a word as mastered."""
-        progress = self.progress_repo.get_by_user_and_vocabulary(
-            user_id, vocabulary_item_id
-        )
-        if progress:
-            progress.is_mastered = False
-            progress.mastered_at = None
-            self.progress_repo.update(progress)
+        try:
+            if self.progress_repo.unset_mastered(user_id, vocabulary_item_id):
+                self.stats_repo.apply_deltas(user_id, mastered={vocabulary_item_id: -1})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
     def record_practice(
         self, user_id: uuid.UUID, request: PracticeRequest
     ) -> UserProgress:
         """Record a practice session for a word."""
+        item_id = request.vocabulary_item_id
         # Verify vocabulary item exists
-        vocab_item = self.vocab_repo.get(str(request.vocabulary_item_id))
+        vocab_item = self.vocab_repo.get(str(item_id))
         if not vocab_item:
-            raise VocabularyNotFoundError(str(request.vocabulary_item_id))
+            raise VocabularyNotFoundError(str(item_id))
+
+        try:
+            if self.progress_repo.record_practice_many(user_id, [item_id], request.year):
+                self.stats_repo.apply_deltas(user_id, practiced={item_id: 1})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return self.progress_repo.get_by_user_and_vocabulary(user_id, item_id)
 
-        # Get or create progress
-        progress = self.progress_repo.get_by_user_and_vocabulary(
-            user_id, request.vocabulary_item_id
+    def apply_batch(self, user_id: uuid.UUID, request: BatchProgressRequest) -> dict:
+        """
+        Apply offline practice/mastered events with one existence check, one
+        upsert, one mastery update (plus the level counter update) and one
+        commit.
+
+        Events for unknown (e.g. since deleted) words are skipped and reported
+        rather than failing the whole batch. Client timestamps in the future
+        are clamped to now.
+        """
+        events = request.events
+        known_ids = self.vocab_repo.get_existing_ids(
+            {e.vocabulary_item_id for e in events}
         )
+        now = datetime.now(UTC).replace(tzinfo=None)
 
-        if progress:
-            progress.times_practiced += 1
-            progress.last_practiced_at = datetime.now(UTC)
-            progress.year_group = request.year
-            return self.progress_repo.update(progress)
-        else:
-            progress = UserProgress(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                vocabulary_item_id=request.vocabulary_item_id,
-                year_group=request.year,
-                times_practiced=1,
-                last_practiced_at=datetime.now(UTC),
+        rows = {}
+        mastered_at = {}
+        for event in sorted(events, key=lambda e: _to_utc_naive(e.occurred_at)):
+            if event.vocabulary_item_id not in known_ids:
+                continue
+            occurred_at = min(_to_utc_naive(event.occurred_at), now)
+            row = rows.setdefault(
+                event.vocabulary_item_id,
+                {
+                    "user_id": user_id,
+                    "vocabulary_item_id": event.vocabulary_item_id,
+                    "times_practiced": 0,
+                    "last_practiced_at": None,
+                },
+            )
+            # Events are in time order, so the latest year wins
+            row["year_group"] = event.year
+            if event.type == "practice":
+                row["times_practiced"] += 1
+                row["last_practiced_at"] = occurred_at
+            else:
+                # ... and the earliest mastery
+                mastered_at.setdefault(event.vocabulary_item_id, occurred_at)
+
+        # Words crossing into mastered/practiced move the level counters;
+        # both are reported by the writes, not read beforehand
+        try:
+            first_practiced = self.progress_repo.upsert_many(list(rows.values()))
+            newly_mastered = self.progress_repo.set_mastered(user_id, mastered_at)
+            self.stats_repo.apply_deltas(
+                user_id,
+                mastered={item_id: 1 for item_id in newly_mastered},
+                practiced={item_id: 1 for item_id in first_practiced},
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        unknown_ids = {e.vocabulary_item_id for e in events} - known_ids
+        return {
+            "applied_events": sum(
+                1 for e in events if e.vocabulary_item_id in known_ids
+            ),
+            "updated_words": len(rows),
+            "unknown_vocabulary_item_ids": sorted(unknown_ids, key=str),
+        }
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    """Client timestamps may carry an offset; progress columns are naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+class AsyncProgressService:
+    """
+    Async counterpart of ProgressService for async routes; see
+    AsyncVocabularyService for how the sync service is run.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda session: getattr(ProgressService(session), method)(*args, **kwargs)
+        )
+
+    async def get_progress_summary(
+        self, user_id: uuid.UUID, year: Optional[str] = None, level: Optional[int] = None
+    ) -> dict:
+        # Fetched before run_sync; see AsyncVocabularyService
+        catalog = await get_catalog_async(self.db)
+        return await self.db.run_sync(
+            lambda session: ProgressService(session, catalog).get_progress_summary(
+                user_id, year, level
             )
-            return self.progress_repo.create(progress)
+        )
+
+    async def get_mastered_word_ids(
+        self, user_id: uuid.UUID, year: str
+    ) -> List[uuid.UUID]:
+        return await self._run("get_mastered_word_ids", user_id, year)
+
+    async def mark_mastered(
+        self, user_id: uuid.UUID, request: MarkMasteredRequest
+    ) -> UserProgress:
+        """Returned row is refreshed after commit, so its columns are loaded."""
+        return await self._run("mark_mastered", user_id, request)
+
+    async def unmark_mastered(
+        self, user_id: uuid.UUID, vocabulary_item_id: uuid.UUID, year: str
+    ) -> None:
+        await self._run("unmark_mastered", user_id, vocabulary_item_id, year)
+
+    async def record_practice(
+        self, user_id: uuid.UUID, request: PracticeRequest
+    ) -> UserProgress:
+        return await self._run("record_practice", user_id, request)
+
+    async def apply_batch(
+        self, user_id: uuid.UUID, request: BatchProgressRequest
+    ) -> dict:
+        return await self._run("apply_batch", user_id, request)
@@ -1,19 +1,35 @@
+import random
 import uuid
+from typing import Callable, List, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.exceptions import QuizSessionNotFoundError
+from app.models.level import Level
 from app.repositories.progress_repository import ProgressRepository
+from app.repositories.user_level_stats_repository import (
+    UserLevelStatsRepository,
+)
 from app.repositories.vocabulary_repository import VocabularyRepository
 from app.schemas.quiz import (GenerateQuizRequest, GenerateSentenceRequest,
                               SubmitQuizRequest, SubmitSentenceRequest)
+from app.services.quiz_session_store import (QuizSessionRecord,
+                                             quiz_session_store)
+from app.services.vocabulary_catalog import vocabulary_catalog
 from app.utils.quiz_generator import (generate_quiz_questions,
                                       generate_sentence_questions)
 
+# Extra mastered words loaded alongside the quiz words to supply distractors
+QUIZ_DISTRACTOR_POOL_SIZE = 30
+
 
 class QuizService:
     def __init__(self, db: Session):
+        self.db = db
         self.vocab_repo = VocabularyRepository(db)
         self.progress_repo = ProgressRepository(db)
+        self.stats_repo = UserLevelStatsRepository(db)
 
     def generate_quiz(self, user_id: uuid.UUID, request: GenerateQuizRequest) -> dict:
         """Generate quiz questions from mastered words."""
@@ -30,18 +46,55 @@ class QuizService:
                 "total_questions": 0,
             }
 
-        # Get vocabulary items for mastered words
-        vocabulary_items = []
-        for word_id in mastered_ids:
-            item = self.vocab_repo.get(str(word_id))
-            if item:
-                vocabulary_items.append(item)
+        # Sample the quiz words first, plus a small pool of other mastered
+        # words for distractors, then load only those in one lookup
+        question_count = request.question_count or len(mastered_ids)
+        selected_ids = random.sample(
+            mastered_ids, min(question_count, len(mastered_ids))
+        )
+        selected_set = set(selected_ids)
+        remaining_ids = [i for i in mastered_ids if i not in selected_set]
+        pool_ids = random.sample(
+            remaining_ids, min(QUIZ_DISTRACTOR_POOL_SIZE, len(remaining_ids))
+        )
+
+        sampler = None
+        if settings.CATALOG_CACHE_ENABLED:
+            catalog = vocabulary_catalog.get(self.db)
+            loaded = catalog.get_many(selected_ids + pool_ids)
+            if request.difficulty != "medium":
+                # Similar meanings come from the whole level, not just the
+                # words this user has mastered
+                sampler = catalog.distractor_sampler(
+                    Level.from_year_group(request.year), "meaning", request.difficulty
+                )
+        else:
+            loaded = self.vocab_repo.get_many(selected_ids + pool_ids)
+        items_by_id = {item.id: item for item in loaded}
+        vocabulary_items = [items_by_id[i] for i in selected_ids if i in items_by_id]
+        distractor_items = [items_by_id[i] for i in pool_ids if i in items_by_id]
 
         # Generate questions
-        questions = generate_quiz_questions(vocabulary_items, request.question_count)
+        questions = generate_quiz_questions(
+            vocabulary_items, distractor_items=distractor_items, sampler=sampler
+        )
 
-        # Convert to response format
+        # Keep only the answer key for grading
         quiz_id = uuid.uuid4()
+        quiz_session_store.save(
+            self.db,
+            QuizSessionRecord(
+                id=quiz_id,
+                user_id=user_id,
+                kind="quiz",
+                year=request.year,
+                questions={
+                    q.id: (q.vocabulary_item_id, q.correct_index) for q in questions
+                },
+            ),
+        )
+
+        # Convert to response format
         question_responses = [
             {
                 "id": q.id,
@@ -60,28 +113,108 @@ class QuizService:
             "total_questions": len(question_responses),
         }
 
+    def _grade(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        kind: str,
+        answers: List[Tuple[uuid.UUID, object]],
+        is_correct: Callable[[object, object], bool],
+    ) -> Tuple[QuizSessionRecord, List[Tuple[uuid.UUID, object, object, bool]]]:
+        """
+        Grade (question_id, answer) pairs against a stored session in
+        O(answers) and record practice for the answered words, all in one
+        transaction. Unanswered questions count as incorrect; words deleted
+        since the session was generated are graded but not recorded. If the
+        transaction fails the session can be submitted again.
+
+        Returns tuple of (session record, [(question_id, answer, correct
+        answer, is correct)]).
+        """
+        record = None
+        try:
+            record = quiz_session_store.claim(self.db, session_id, user_id)
+            if record is None or record.kind != kind:
+                raise QuizSessionNotFoundError(str(session_id))
+
+            graded = []
+            seen = set()
+            practiced = set()
+            for question_id, answer in answers:
+                key = record.questions.get(question_id)
+                if key is None or question_id in seen:
+                    continue
+                seen.add(question_id)
+                vocabulary_item_id, correct = key
+                practiced.add(vocabulary_item_id)
+                graded.append(
+                    (question_id, answer, correct, is_correct(answer, correct))
+                )
+
+            quiz_session_store.finish(
+                self.db, record, sum(1 for *_, ok in graded if ok)
+            )
+            first_practiced = self.progress_repo.record_practice_many(
+                user_id, self.vocab_repo.get_existing_ids(practiced), record.year
+            )
+            self.stats_repo.apply_deltas(
+                user_id, practiced={item_id: 1 for item_id in first_practiced}
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            if record is not None:
+                quiz_session_store.release(self.db, record, graded=False)
+            raise
+        quiz_session_store.release(self.db, record, graded=True)
+        return record, graded
+
+    @staticmethod
+    def _summary(total: int, graded: list) -> dict:
+        correct = sum(1 for *_, ok in graded if ok)
+        return {
+            "total_questions": total,
+            "correct_answers": correct,
+            "incorrect_answers": total - correct,
+            "score_percentage": (correct / total * 100) if total else 0.0,
+        }
+
     def submit_quiz(self, user_id: uuid.UUID, request: SubmitQuizRequest) -> dict:
-        """Submit quiz answers and get results."""
-        # In a real implementation, we'd store the quiz questions and retrieve them
-        # For now, we'll return a placeholder response
-        # This would require storing quiz sessions in the database
+        """Grade quiz answers against the stored quiz and record practice."""
+        record, graded = self._grade(
+            user_id,
+            request.quiz_id,
+            "quiz",
+            [(a.question_id, a.selected_index) for a in request.answers],
+            lambda selected, correct: selected == correct,
+        )
         return {
             "quiz_id": request.quiz_id,
-            "total_questions": len(request.answers),
-            "correct_answers": 0,
-            "incorrect_answers": 0,
-            "score_percentage": 0.0,
-            "results": [],
+            **self._summary(len(record.questions), graded),
+            "results": [
+                {
+                    "question_id": question_id,
+                    "correct": ok,
+                    "selected_index": selected,
+                    "correct_index": correct,
+                }
+                for question_id, selected, correct, ok in graded
+            ],
         }
 
     def generate_sentences(
         self, user_id: uuid.UUID, request: GenerateSentenceRequest
     ) -> dict:
         """Generate sentence fill-in-the-blank questions."""
-        # Get all vocabulary items for the year (not just mastered)
-        vocabulary_items, _ = self.vocab_repo.get_all_with_filters(
-            year=request.year, limit=1000
-        )
+        # Get all vocabulary items for the year's level (not just mastered)
+        level = Level.from_year_group(request.year)
+        sampler = None
+        if settings.CATALOG_CACHE_ENABLED:
+            catalog = vocabulary_catalog.get(self.db)
+            vocabulary_items = catalog.items_for_level(level)
+            sampler = catalog.distractor_sampler(level, "word", request.difficulty)
+        else:
+            vocabulary_items = self.vocab_repo.get_by_level(level, limit=1000)
 
         if not vocabulary_items:
             return {
@@ -93,10 +226,24 @@ class QuizService:
 
         # Generate sentence questions
         questions = generate_sentence_questions(
-            vocabulary_items, request.question_count
+            vocabulary_items, request.question_count, sampler=sampler
         )
 
         session_id = uuid.uuid4()
+        quiz_session_store.save(
+            self.db,
+            QuizSessionRecord(
+                id=session_id,
+                user_id=user_id,
+                kind="sentence",
+                year=request.year,
+                questions={
+                    q["id"]: (q["vocabulary_item_id"], q["correct_word"])
+                    for q in questions
+                },
+            ),
+        )
+
         question_responses = [
             {
                 "id": q["id"],
@@ -118,14 +265,24 @@ class QuizService:
     def submit_sentences(
         self, user_id: uuid.UUID, request: SubmitSentenceRequest
     ) -> dict:
-        """Submit sentence fill answers."""
-        # In a real implementation, we'd store the sentence questions and retrieve them
-        # For now, we'll return a placeholder response
+        """Grade sentence answers against the stored session and record practice."""
+        record, graded = self._grade(
+            user_id,
+            request.session_id,
+            "sentence",
+            [(a.question_id, a.selected_word) for a in request.answers],
+            lambda selected, correct: selected.strip().lower() == correct.lower(),
+        )
         return {
             "session_id": request.session_id,
-            "total_questions": len(request.answers),
-            "correct_answers": 0,
-            "incorrect_answers": 0,
-            "score_percentage": 0.0,
-            "results": [],
+            **self._summary(len(record.questions), graded),
+            "results": [
+                {
+                    "question_id": question_id,
+                    "correct": ok,
+                    "selected_word": selected,
+                    "correct_word": correct,
+                }
+                for question_id, selected, correct, ok in graded
+            ],
         }
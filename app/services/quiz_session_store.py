@@ -0,0 +1,206 @@
+"""
+Storage for the answer keys of generated quizzes and sentence sessions.
+
+Generation saves a compact record (question ID -> vocabulary item ID and the
+correct answer); submission claims it once and grades in O(answers) without
+regenerating anything. Once the grading transaction ends the claim is
+released: dropped if grading committed, undone if it rolled back so the
+session can be submitted again. Two backends are available via QUIZ_SESSION_BACKEND:
+
+- "memory": bounded LRU with TTL, for single-node deployments
+- "database": the quiz_sessions table, shared by every worker, which also
+  keeps the graded score as quiz history
+"""
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.quiz import QuizSession
+
+logger = logging.getLogger(__name__)
+
+# Correct option index for quizzes, correct word for sentence sessions
+Answer = Union[int, str]
+
+
+@dataclass
+class QuizSessionRecord:
+    """Answer key for one generated quiz or sentence session."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    kind: str
+    year: str
+    questions: Dict[uuid.UUID, Tuple[uuid.UUID, Answer]] = field(default_factory=dict)
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Normalise to naive UTC so stored and current times compare safely."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+class InMemoryQuizSessionStore:
+    """Bounded LRU of session records with a TTL. Per-process only."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._records: "OrderedDict[uuid.UUID, Tuple[float, QuizSessionRecord]]" = (
+            OrderedDict()
+        )
+        # Records being graded, kept until release() so a failed grading
+        # can put them back
+        self._claimed: Dict[uuid.UUID, Tuple[float, QuizSessionRecord]] = {}
+        self._lock = Lock()
+
+    def save(self, db: Session, record: QuizSessionRecord) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._records[record.id] = (expires_at, record)
+            self._records.move_to_end(record.id)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def claim(
+        self, db: Session, session_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Optional[QuizSessionRecord]:
+        """Set aside and return the user's unexpired record, or None."""
+        with self._lock:
+            entry = self._records.get(session_id)
+            if entry is None or entry[1].user_id != user_id:
+                return None
+            del self._records[session_id]
+            if entry[0] <= time.monotonic():
+                return None
+            self._claimed[session_id] = entry
+        return entry[1]
+
+    def finish(
+        self, db: Session, record: QuizSessionRecord, correct_answers: int
+    ) -> None:
+        """Nothing to keep once graded."""
+
+    def release(self, db: Session, record: QuizSessionRecord, graded: bool) -> None:
+        """Drop a graded record, or put back one whose grading failed."""
+        with self._lock:
+            entry = self._claimed.pop(record.id, None)
+            if entry is not None and not graded:
+                self._records[record.id] = entry
+
+    def clear(self) -> None:
+        """Clear all records (for testing)."""
+        with self._lock:
+            self._records.clear()
+            self._claimed.clear()
+
+
+class DatabaseQuizSessionStore:
+    """quiz_sessions table backend, shared across workers and nodes."""
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.ttl_seconds = ttl_seconds
+
+    def save(self, db: Session, record: QuizSessionRecord) -> None:
+        now = _utc_naive(datetime.now(UTC))
+        # Drop this user's abandoned sessions while we are here
+        db.query(QuizSession).filter(
+            QuizSession.user_id == record.user_id,
+            QuizSession.completed_at.is_(None),
+            QuizSession.expires_at < now,
+        ).delete(synchronize_session=False)
+        db.add(
+            QuizSession(
+                id=record.id,
+                user_id=record.user_id,
+                kind=record.kind,
+                year=record.year,
+                questions=[
+                    [str(question_id), str(vocab_id), correct]
+                    for question_id, (vocab_id, correct) in record.questions.items()
+                ],
+                total_questions=len(record.questions),
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            )
+        )
+        db.commit()
+
+    def claim(
+        self, db: Session, session_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Optional[QuizSessionRecord]:
+        """
+        Mark the user's unexpired, ungraded session as completed and return
+        it. The caller commits, together with the grading writes.
+        """
+        now = _utc_naive(datetime.now(UTC))
+        row = (
+            db.query(QuizSession)
+            .filter(
+                QuizSession.id == session_id,
+                QuizSession.user_id == user_id,
+                QuizSession.completed_at.is_(None),
+            )
+            .first()
+        )
+        if row is None or _utc_naive(row.expires_at) < now:
+            return None
+
+        # Conditional update so concurrent submissions grade only once
+        claimed = (
+            db.query(QuizSession)
+            .filter(QuizSession.id == session_id, QuizSession.completed_at.is_(None))
+            .update({QuizSession.completed_at: now}, synchronize_session=False)
+        )
+        if claimed != 1:
+            return None
+
+        return QuizSessionRecord(
+            id=row.id,
+            user_id=row.user_id,
+            kind=row.kind,
+            year=row.year,
+            questions={
+                uuid.UUID(question_id): (uuid.UUID(vocab_id), correct)
+                for question_id, vocab_id, correct in row.questions
+            },
+        )
+
+    def finish(
+        self, db: Session, record: QuizSessionRecord, correct_answers: int
+    ) -> None:
+        """Keep the score as quiz history; the caller commits."""
+        db.query(QuizSession).filter(QuizSession.id == record.id).update(
+            {QuizSession.correct_answers: correct_answers},
+            synchronize_session=False,
+        )
+
+    def release(self, db: Session, record: QuizSessionRecord, graded: bool) -> None:
+        """Nothing to do: a rollback also undoes the claim's update."""
+
+
+def create_quiz_session_store():
+    """Create the store configured by QUIZ_SESSION_BACKEND."""
+    if settings.QUIZ_SESSION_BACKEND == "database":
+        return DatabaseQuizSessionStore(ttl_seconds=settings.QUIZ_SESSION_TTL_SECONDS)
+    if settings.QUIZ_SESSION_BACKEND != "memory":
+        logger.warning(
+            f"Unknown QUIZ_SESSION_BACKEND {settings.QUIZ_SESSION_BACKEND!r}; "
+            "using memory"
+        )
+    return InMemoryQuizSessionStore(
+        max_entries=settings.QUIZ_SESSION_MAX_ENTRIES,
+        ttl_seconds=settings.QUIZ_SESSION_TTL_SECONDS,
+    )
+
+
+# Global singleton instance
+quiz_session_store = create_quiz_session_store()
@@ -0,0 +1,454 @@
+"""
+In-process vocabulary catalog cache.
+
+The vocabulary content (words, levels and quiz sentences) is read on almost
+every request but only changes through admin writes. The catalog loads all of
+it into an immutable snapshot with per-level index arrays, so listing,
+flashcards and quiz generation can be served without touching the database.
+
+Admin writes call ``vocabulary_catalog.invalidate(db)``, which bumps the
+catalog version stored in the database. Every read compares that version
+with its snapshot's, so the next read in any worker process rebuilds the
+snapshot. ``CATALOG_REFRESH_SECONDS`` bounds staleness for changes made
+outside the API, such as scripts writing to the database directly.
+"""
+import logging
+import time
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db_routing import primary_reads
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.repositories.quiz_sentence_repository import QuizSentenceRepository
+from app.repositories.vocabulary_repository import VocabularyRepository
+from app.repositories.vocabulary_search import search_tokens
+from app.services.level_snapshot import LevelSnapshot
+from app.utils.distractor_index import DistractorIndex, get_distractor_index
+from app.utils.json_response import dumps
+from app.utils.quiz_generator import DistractorSampler, NeighbourDistractorSampler
+
+logger = logging.getLogger(__name__)
+
+# cache_versions row of the catalog
+CATALOG_VERSION = "vocabulary_catalog"
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """Immutable snapshot of a vocabulary item with its levels and sentences."""
+
+    id: uuid.UUID
+    word: str
+    meaning: str
+    synonyms: Tuple[str, ...]
+    antonyms: Tuple[str, ...]
+    example_sentences: Tuple[str, ...]
+    levels: Tuple[int, ...]
+    quiz_sentences: Tuple[str, ...]
+    created_at: datetime
+    updated_at: datetime
+
+    def to_response(self) -> dict:
+        """Build the API response dict (in VocabularyItemResponse field order)."""
+        return {
+            "word": self.word,
+            "meaning": self.meaning,
+            "synonyms": list(self.synonyms),
+            "antonyms": list(self.antonyms),
+            "example_sentences": list(self.example_sentences),
+            "id": self.id,
+            "levels": list(self.levels),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class VocabularyCatalog:
+    """
+    Immutable snapshot of the vocabulary catalog.
+
+    Entries are stored once, sorted by (word, id). Per-level indexes are
+    compact arrays of positions into that list, so a level filter never
+    copies entries.
+    """
+
+    def __init__(self, entries: Iterable[CatalogEntry], version: int = 0):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.entries: Tuple[CatalogEntry, ...] = tuple(
+            sorted(entries, key=lambda e: (e.word, str(e.id)))
+        )
+        self._keys = [(e.word, str(e.id)) for e in self.entries]
+        self._by_id: Dict[uuid.UUID, int] = {
+            e.id: pos for pos, e in enumerate(self.entries)
+        }
+        # Lowercased fields used for ranked substring search
+        self._search_fields = [
+            (
+                e.word.lower(),
+                e.meaning.lower(),
+                "\0".join(e.synonyms + e.antonyms).lower(),
+            )
+            for e in self.entries
+        ]
+        # The words of all three, each preceded by a space, so that
+        # " " + token in text tests for a word starting with token
+        self._search_words = [
+            " " + " ".join(search_tokens(" ".join(fields)))
+            for fields in self._search_fields
+        ]
+
+        level_index: Dict[int, array] = {}
+        for pos, entry in enumerate(self.entries):
+            for level in entry.levels:
+                level_index.setdefault(level, array("I")).append(pos)
+        self._level_index = level_index
+
+        # Each entry's response JSON and each level's snapshot, built on
+        # first use
+        self._response_json: Dict[uuid.UUID, bytes] = {}
+        self._level_snapshots: Dict[int, LevelSnapshot] = {}
+
+        # Distractor samplers are built lazily per (level, field, difficulty)
+        # together with the distractor index they were built from
+        self._samplers: Dict[
+            Tuple[Optional[int], str, str],
+            Tuple[Optional[DistractorIndex], DistractorSampler],
+        ] = {}
+
+        # Case-insensitive sorted word arrays for prefix lookups, overall
+        # (key None) and per level, as parallel (lowercased words, positions)
+        self._prefix_index: Dict[Optional[int], Tuple[List[str], array]] = {}
+        for level in [None, *level_index]:
+            ordered = sorted(
+                (self._search_fields[pos][0], pos)
+                for pos in self.level_positions(level)
+            )
+            self._prefix_index[level] = (
+                [word for word, _ in ordered],
+                array("I", (pos for _, pos in ordered)),
+            )
+
+    @classmethod
+    def load(cls, db: Session, version: int = 0) -> "VocabularyCatalog":
+        """Load the whole catalog with three set-based queries."""
+        vocab_repo = VocabularyRepository(db)
+        items = vocab_repo.get_all_ordered()
+        level_map = vocab_repo.get_all_level_numbers()
+        sentence_map = QuizSentenceRepository(db).get_sentences_by_vocabulary_item()
+
+        entries = [
+            CatalogEntry(
+                id=item.id,
+                word=item.word,
+                meaning=item.meaning,
+                synonyms=tuple(item.synonyms or ()),
+                antonyms=tuple(item.antonyms or ()),
+                example_sentences=tuple(item.example_sentences or ()),
+                levels=tuple(level_map.get(item.id, ())),
+                quiz_sentences=tuple(sentence_map.get(item.id, ())),
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+            )
+            for item in items
+        ]
+        return cls(entries, version=version)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, item_id) -> Optional[CatalogEntry]:
+        """Get an entry by vocabulary item ID."""
+        if not isinstance(item_id, uuid.UUID):
+            try:
+                item_id = uuid.UUID(str(item_id))
+            except ValueError:
+                return None
+        pos = self._by_id.get(item_id)
+        return self.entries[pos] if pos is not None else None
+
+    def get_many(self, item_ids: Iterable) -> List[CatalogEntry]:
+        """Get entries for the given IDs, skipping unknown ones."""
+        entries = (self.get(item_id) for item_id in item_ids)
+        return [entry for entry in entries if entry is not None]
+
+    def response_json(self, entry: CatalogEntry) -> bytes:
+        """The entry's API response as JSON, encoded once per snapshot."""
+        encoded = self._response_json.get(entry.id)
+        if encoded is None:
+            encoded = self._response_json[entry.id] = dumps(entry.to_response())
+        return encoded
+
+    def level_snapshot(self, level: int) -> LevelSnapshot:
+        """The level's pre-rendered snapshot, built once per catalog snapshot."""
+        snapshot = self._level_snapshots.get(level)
+        if snapshot is None:
+            snapshot = LevelSnapshot(
+                level,
+                [self.response_json(self.entries[p]) for p in self.level_positions(level)],
+            )
+            self._level_snapshots[level] = snapshot
+        return snapshot
+
+    def level_positions(self, level: Optional[int] = None) -> Sequence[int]:
+        """Get the sorted entry positions for a level (all entries if None)."""
+        if level:
+            return self._level_index.get(level, array("I"))
+        return range(len(self.entries))
+
+    def level_counts(self) -> Dict[int, int]:
+        """Get the number of words in each level."""
+        return {level: len(positions) for level, positions in self._level_index.items()}
+
+    def items_for_level(self, level: int) -> List[CatalogEntry]:
+        """Get all entries for a level, ordered by word."""
+        return [self.entries[pos] for pos in self.level_positions(level)]
+
+    def distractor_sampler(
+        self,
+        level: Optional[int] = None,
+        field: str = "word",
+        difficulty: str = "medium",
+    ) -> DistractorSampler:
+        """
+        Get the shared distractor sampler over a field ("word" or "meaning").
+
+        "easy" and "hard" use the precomputed similar-word index when it is
+        available; otherwise every difficulty samples uniformly.
+        """
+        key = (level or None, field, difficulty)
+        index = None
+        if difficulty != "medium":
+            index = get_distractor_index(settings.DISTRACTOR_INDEX_PATH)
+        cached = self._samplers.get(key)
+        # A rebuilt index file replaces samplers built from the previous one
+        if cached is not None and cached[0] is index:
+            return cached[1]
+
+        entries = [self.entries[pos] for pos in self.level_positions(level)]
+        values = [getattr(entry, field) for entry in entries]
+
+        if index is None:
+            sampler = DistractorSampler(values)
+        else:
+            neighbours = {
+                getattr(entry, field): [
+                    getattr(near, field)
+                    for near in self.get_many(index.neighbours(entry.id))
+                ]
+                for entry in entries
+            }
+            sampler = NeighbourDistractorSampler(values, neighbours, difficulty)
+        self._samplers[key] = (index, sampler)
+        return sampler
+
+    def suggest(
+        self, prefix: str, level: Optional[int] = None, limit: int = 10
+    ) -> List[CatalogEntry]:
+        """
+        Get entries whose word starts with prefix (case-insensitive),
+        ordered alphabetically. Two binary searches plus the result slice.
+        """
+        words, positions = self._prefix_index.get(level or None, ([], array("I")))
+        prefix = prefix.lower()
+        start = bisect_left(words, prefix)
+        end = min(bisect_left(words, prefix + "\U0010ffff", start), start + limit)
+        return [self.entries[pos] for pos in positions[start:end]]
+
+    def _search_rank(self, pos: int, term: str, tokens: List[str]) -> Optional[int]:
+        """Relevance tier for an entry (lower is better), None if no match."""
+        word, meaning, related = self._search_fields[pos]
+        if tokens:
+            words = self._search_words[pos]
+            if not all(" " + token in words for token in tokens):
+                return None
+        elif not (term in word or term in meaning or term in related):
+            return None
+        if word == term:
+            return 0
+        if word.startswith(term):
+            return 1
+        if term in word:
+            return 2
+        if term in meaning:
+            return 3
+        return 4
+
+    def search(self, term: str, level: Optional[int] = None) -> List[int]:
+        """
+        Get matching entry positions, matched and ranked like the full-text
+        database backends (see app.repositories.vocabulary_search): every
+        word of the term must start a word of the entry, then results are
+        ranked exact word, word prefix, word substring, meaning, then
+        synonyms/antonyms. Ties are ordered by word.
+        """
+        term = term.lower()
+        tokens = search_tokens(term)
+        ranked = []
+        for pos in self.level_positions(level):
+            rank = self._search_rank(pos, term, tokens)
+            if rank is not None:
+                ranked.append((rank, pos))
+        ranked.sort()
+        return [pos for _, pos in ranked]
+
+    def page(
+        self,
+        level: Optional[int] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[str, uuid.UUID]] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[CatalogEntry], Optional[int]]:
+        """
+        In-memory equivalent of VocabularyRepository.get_all_with_filters.
+
+        Search results are ordered by relevance, so after (a keyset
+        position in word order) only applies when search is not given.
+
+        Returns tuple of (entries, total_count).
+        """
+        if search:
+            positions = self.search(search, level)
+            after = None
+        else:
+            positions = self.level_positions(level)
+
+        total = len(positions) if include_total else None
+
+        start = skip
+        if after:
+            after_key = (after[0], str(after[1]))
+            start += bisect_right(positions, after_key, key=self._keys.__getitem__)
+
+        return [self.entries[p] for p in positions[start:start + limit]], total
+
+
+class VocabularyCatalogCache:
+    """
+    Holder for the current catalog snapshot.
+
+    The catalog version is a row in cache_versions shared by all workers.
+    Each read checks it with one primary-key lookup and gets the current
+    immutable snapshot without locking; a rebuild happens only when the
+    version moved past the snapshot's or the snapshot is older than the
+    refresh interval.
+    """
+
+    def __init__(self, refresh_seconds: int = 300):
+        self.refresh_seconds = refresh_seconds
+        self._catalog: Optional[VocabularyCatalog] = None
+        # Held for whole rebuilds; see get_async
+        self._lock = Lock()
+
+    @staticmethod
+    def version(db: Session) -> int:
+        """The shared catalog version; bumped by every invalidate()."""
+        # Writers bump it on the primary, so skip a possibly lagging replica
+        with primary_reads(db):
+            return CacheVersionRepository(db).get(CATALOG_VERSION)
+
+    def _is_fresh(self, catalog: Optional[VocabularyCatalog], version: int) -> bool:
+        if catalog is None or catalog.version < version:
+            return False
+        if self.refresh_seconds <= 0:
+            return True
+        return time.monotonic() - catalog.loaded_at < self.refresh_seconds
+
+    def get(self, db: Session) -> VocabularyCatalog:
+        """Get the current catalog, rebuilding it from db if stale."""
+        version = self.version(db)
+        catalog = self._catalog
+        if self._is_fresh(catalog, version):
+            return catalog
+
+        with self._lock:
+            return self._rebuild(db, version)
+
+    async def get_async(self, db) -> VocabularyCatalog:
+        """
+        get() for async routes, where db is an AsyncSession or a
+        ThreadpoolSession.
+
+        With an AsyncSession, run_sync executes on the event loop and its
+        queries yield to the loop, so it must never wait on the thread lock:
+        another request's run_sync holding it would deadlock the loop. The
+        lock is acquired on the threadpool instead, and only then does the
+        rebuild run through db. Async services pass the returned catalog to
+        the sync service, so nothing inside run_sync calls get().
+        """
+        version = await db.run_sync(self.version)
+        catalog = self._catalog
+        if self._is_fresh(catalog, version):
+            return catalog
+
+        await run_in_threadpool(self._lock.acquire)
+        try:
+            return await db.run_sync(lambda session: self._rebuild(session, version))
+        finally:
+            self._lock.release()
+
+    def _rebuild(self, db: Session, version: int) -> VocabularyCatalog:
+        """
+        Rebuild the catalog if still stale; the caller holds the lock.
+
+        version was read before loading, so a write committed meanwhile
+        bumps the shared version past it and forces another rebuild.
+        """
+        catalog = self._catalog
+        if self._is_fresh(catalog, version):
+            return catalog
+        # Rebuilds follow admin writes, so skip a possibly lagging replica
+        with primary_reads(db):
+            catalog = VocabularyCatalog.load(db, version=version)
+        self._catalog = catalog
+        logger.info(
+            f"Vocabulary catalog v{version} loaded with {len(catalog)} items"
+        )
+        return catalog
+
+    def invalidate(self, db: Session) -> None:
+        """
+        Bump the shared catalog version after a committed write, so the next
+        read in every worker rebuilds its snapshot.
+        """
+        CacheVersionRepository(db).bump(CATALOG_VERSION)
+
+    def clear(self) -> None:
+        """Drop this worker's snapshot (for testing)."""
+        self._catalog = None
+
+    def warm(self) -> None:
+        """Load the catalog at startup using a fresh database session."""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self.get(db)
+        except Exception as e:
+            logger.warning(f"Vocabulary catalog warm-up failed: {e}")
+        finally:
+            db.close()
+
+
+# Global singleton instance
+vocabulary_catalog = VocabularyCatalogCache(
+    refresh_seconds=settings.CATALOG_REFRESH_SECONDS
+)
+
+
+async def get_catalog_async(db) -> Optional[VocabularyCatalog]:
+    """The catalog for an async route, or None if the cache is disabled."""
+    if not settings.CATALOG_CACHE_ENABLED:
+        return None
+    return await vocabulary_catalog.get_async(db)
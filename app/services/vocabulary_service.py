@@ -1,19 +1,35 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
-from app.core.exceptions import VocabularyNotFoundError
+from app.core.config import settings
+from app.core.exceptions import ValidationError, VocabularyNotFoundError
 from app.models.vocabulary import VocabularyItem
 from app.repositories.level_repository import LevelRepository
+from app.repositories.progress_repository import ProgressRepository
+from app.repositories.user_level_stats_repository import (
+    UserLevelStatsRepository,
+)
 from app.repositories.vocabulary_repository import VocabularyRepository
 from app.schemas.vocabulary import VocabularyItemCreate, VocabularyItemUpdate
+from app.services.level_snapshot import LevelSnapshot
+from app.services.vocabulary_catalog import (VocabularyCatalog,
+                                             get_catalog_async,
+                                             vocabulary_catalog)
+from app.utils.json_response import dumps
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 class VocabularyService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, catalog: Optional[VocabularyCatalog] = None):
+        self.db = db
+        # Snapshot fetched by an async caller; see AsyncVocabularyService
+        self.catalog = catalog
         self.vocab_repo = VocabularyRepository(db)
         self.level_repo = LevelRepository(db)
+        self.progress_repo = ProgressRepository(db)
+        self.stats_repo = UserLevelStatsRepository(db)
 
     def get_all(
         self,
@@ -35,6 +51,189 @@ class VocabularyService:
             level=level, search=search, skip=skip, limit=limit
         )
 
+    def get_page(
+        self,
+        level: Optional[int] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """
+        Get a page of vocabulary response dicts plus the next page cursor.
+
+        Served from the in-memory catalog when it is enabled, otherwise
+        from the database. When a cursor is given, the page starts right
+        after the item it points to and skip is ignored (keyset pagination).
+        Search results are ordered by relevance and paged by offset.
+
+        Returns tuple of (items, total_count, next_cursor). next_cursor is
+        None on the last page; total_count is None unless include_total.
+        """
+        items, total, next_cursor, catalog = self._page(
+            level, search, skip, limit, cursor, include_total
+        )
+        if catalog is not None:
+            return [entry.to_response() for entry in items], total, next_cursor
+        return self.build_responses(items), total, next_cursor
+
+    def get_page_json(
+        self,
+        level: Optional[int] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[bytes], Optional[int], Optional[str]]:
+        """
+        get_page with each item already encoded as JSON (see
+        app.utils.json_response). Catalog entries are encoded once per
+        catalog snapshot.
+        """
+        items, total, next_cursor, catalog = self._page(
+            level, search, skip, limit, cursor, include_total
+        )
+        if catalog is not None:
+            return [catalog.response_json(entry) for entry in items], total, next_cursor
+        return [dumps(item) for item in self.build_responses(items)], total, next_cursor
+
+    def _page(
+        self,
+        level: Optional[int],
+        search: Optional[str],
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+        include_total: bool,
+    ) -> Tuple[list, Optional[int], Optional[str], Optional[VocabularyCatalog]]:
+        """Page of catalog entries or ORM rows, plus the catalog if it was used."""
+        if search and cursor:
+            raise ValidationError(
+                "Cursor pagination is not supported with search", field="cursor"
+            )
+
+        after = None
+        if cursor:
+            try:
+                after_word, after_id = decode_cursor(cursor)
+                after = (after_word, uuid.UUID(after_id))
+            except ValueError:
+                raise ValidationError("Invalid pagination cursor", field="cursor")
+            skip = 0
+
+        # Fetch one extra row to find out whether another page exists
+        filters = dict(
+            level=level,
+            search=search,
+            skip=skip,
+            limit=limit + 1,
+            after=after,
+            include_total=include_total,
+        )
+        catalog = self.get_catalog()
+        if catalog is not None:
+            items, total = catalog.page(**filters)
+        else:
+            items, total = self.vocab_repo.get_all_with_filters(**filters)
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            # Search results are relevance ordered and page by offset only
+            if items and not search:
+                next_cursor = encode_cursor(items[-1].word, items[-1].id)
+
+        return items, total, next_cursor, catalog
+
+    def get_level_snapshot(self, level: int) -> LevelSnapshot:
+        """
+        Get the whole level as a pre-rendered snapshot. With the catalog
+        enabled it is cached until the next catalog rebuild; otherwise it
+        is rendered from the database on every call.
+        """
+        catalog = self.get_catalog()
+        if catalog is not None:
+            return catalog.level_snapshot(level)
+
+        items, _ = self.vocab_repo.get_all_with_filters(
+            level=level, limit=None, include_total=False
+        )
+        return LevelSnapshot(level, [dumps(item) for item in self.build_responses(items)])
+
+    def get_catalog(self) -> Optional[VocabularyCatalog]:
+        """Get the in-memory catalog, or None if the cache is disabled."""
+        if not settings.CATALOG_CACHE_ENABLED:
+            return None
+        if self.catalog is not None:
+            return self.catalog
+        return vocabulary_catalog.get(self.db)
+
+    def suggest(
+        self, prefix: str, level: Optional[int] = None, limit: int = 10
+    ) -> List[dict]:
+        """Get autocomplete suggestions for a word prefix."""
+        catalog = self.get_catalog()
+        if catalog is not None:
+            return [
+                {"id": entry.id, "word": entry.word, "levels": list(entry.levels)}
+                for entry in catalog.suggest(prefix, level=level, limit=limit)
+            ]
+
+        items = self.vocab_repo.get_by_word_prefix(prefix, level=level, limit=limit)
+        return [
+            {"id": item["id"], "word": item["word"], "levels": item["levels"]}
+            for item in self.build_responses(items)
+        ]
+
+    def get_response_by_id(self, vocabulary_id: uuid.UUID) -> dict:
+        """Get the API response dict for a vocabulary item by ID."""
+        catalog = self.get_catalog()
+        if catalog is None:
+            return self.build_response(self.get_by_id(vocabulary_id))
+
+        entry = catalog.get(vocabulary_id)
+        if not entry:
+            raise VocabularyNotFoundError(str(vocabulary_id))
+        return entry.to_response()
+
+    def build_response(self, item: VocabularyItem) -> dict:
+        """Build the API response dict for a single vocabulary item."""
+        return self.build_responses([item])[0]
+
+    def build_responses(self, items: List[VocabularyItem]) -> List[dict]:
+        """
+        Build API response dicts for a page of vocabulary items.
+
+        Level numbers for the whole page are loaded with one query rather
+        than one query per item. Keys follow VocabularyItemResponse's field
+        order, so the dicts can be encoded directly (see get_page_json).
+        """
+        level_map = self.vocab_repo.get_level_numbers_for_words(
+            item.id for item in items
+        )
+        return [
+            {
+                "word": item.word,
+                "meaning": item.meaning,
+                "synonyms": item.synonyms or [],
+                "antonyms": item.antonyms or [],
+                "example_sentences": item.example_sentences or [],
+                "id": item.id,
+                "levels": level_map.get(item.id, []),
+                "created_at": item.created_at,
+                "updated_at": item.updated_at,
+            }
+            for item in items
+        ]
+
+    def _rebuild_level_stats(self, user_ids: List[uuid.UUID]) -> None:
+        """Recount level stats for users whose words changed level or were deleted."""
+        if user_ids:
+            self.stats_repo.rebuild(user_ids)
+            self.db.commit()
+
     def get_by_id(self, vocabulary_id: uuid.UUID) -> VocabularyItem:
         """Get a vocabulary item by ID with levels."""
         item = self.vocab_repo.get_with_levels(str(vocabulary_id))
@@ -66,10 +265,16 @@ class VocabularyService:
             all_level_ids = list(set(existing_level_ids + level_ids))
             self.vocab_repo.update_levels(existing, all_level_ids)
             
-            return self.vocab_repo.update(existing)
+            item = self.vocab_repo.update(existing)
+            if set(all_level_ids) != set(existing_level_ids):
+                self._rebuild_level_stats(
+                    self.progress_repo.get_user_ids_for_vocabulary_item(item.id)
+                )
+            vocabulary_catalog.invalidate(self.db)
+            return item
         
         # Create new vocabulary item with levels
-        return self.vocab_repo.create_with_levels(
+        item = self.vocab_repo.create_with_levels(
             word=item_data.word,
             meaning=item_data.meaning,
             level_ids=level_ids,
@@ -77,6 +282,8 @@ class VocabularyService:
             antonyms=item_data.antonyms or [],
             example_sentences=item_data.example_sentences or [],
         )
+        vocabulary_catalog.invalidate(self.db)
+        return item
 
     def update(
         self, vocabulary_id: uuid.UUID, item_data: VocabularyItemUpdate
@@ -106,9 +313,96 @@ class VocabularyService:
                 level_ids.append(level.id)
             self.vocab_repo.update_levels(item, level_ids)
 
-        return self.vocab_repo.update(item)
+        item = self.vocab_repo.update(item)
+        if item_data.levels is not None:
+            self._rebuild_level_stats(
+                self.progress_repo.get_user_ids_for_vocabulary_item(item.id)
+            )
+        vocabulary_catalog.invalidate(self.db)
+        return item
 
     def delete(self, vocabulary_id: uuid.UUID) -> None:
         """Delete a vocabulary item."""
         item = self.get_by_id(vocabulary_id)
+        user_ids = self.progress_repo.get_user_ids_for_vocabulary_item(item.id)
         self.vocab_repo.delete(item)
+        self._rebuild_level_stats(user_ids)
+        vocabulary_catalog.invalidate(self.db)
+
+
+class AsyncVocabularyService:
+    """
+    Async counterpart of VocabularyService for async routes.
+
+    Each call runs the sync service inside db.run_sync(): with an
+    AsyncSession that executes on the event loop through the async driver
+    (no worker thread); with a ThreadpoolSession it runs on the threadpool.
+    Results are plain response dicts, so nothing lazy-loads afterwards.
+    The catalog is fetched with vocabulary_catalog.get_async before
+    run_sync, so a rebuild never waits on a lock from the event loop.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        catalog = await get_catalog_async(self.db)
+        return await self.db.run_sync(
+            lambda session: getattr(VocabularyService(session, catalog), method)(
+                *args, **kwargs
+            )
+        )
+
+    async def get_page(self, **filters) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """See VocabularyService.get_page."""
+        return await self._run("get_page", **filters)
+
+    async def get_page_json(
+        self, **filters
+    ) -> Tuple[List[bytes], Optional[int], Optional[str]]:
+        """See VocabularyService.get_page_json."""
+        return await self._run("get_page_json", **filters)
+
+    async def suggest(
+        self, prefix: str, level: Optional[int] = None, limit: int = 10
+    ) -> List[dict]:
+        return await self._run("suggest", prefix, level=level, limit=limit)
+
+    async def get_response_by_id(self, vocabulary_id: uuid.UUID) -> dict:
+        return await self._run("get_response_by_id", vocabulary_id)
+
+    async def get_level_snapshot(self, level: int) -> LevelSnapshot:
+        return await self._run("get_level_snapshot", level)
+
+    async def create(self, item_data: VocabularyItemCreate) -> dict:
+        """Create an item and return its response dict."""
+        return await self.db.run_sync(
+            lambda session: _create_response(VocabularyService(session), item_data)
+        )
+
+    async def update(
+        self, vocabulary_id: uuid.UUID, item_data: VocabularyItemUpdate
+    ) -> dict:
+        """Update an item and return its response dict."""
+        return await self.db.run_sync(
+            lambda session: _update_response(
+                VocabularyService(session), vocabulary_id, item_data
+            )
+        )
+
+    async def delete(self, vocabulary_id: uuid.UUID) -> None:
+        await self.db.run_sync(
+            lambda session: VocabularyService(session).delete(vocabulary_id)
+        )
+
+
+def _create_response(service: VocabularyService, item_data: VocabularyItemCreate) -> dict:
+    return service.build_response(service.create(item_data))
+
+
+def _update_response(
+    service: VocabularyService,
+    vocabulary_id: uuid.UUID,
+    item_data: VocabularyItemUpdate,
+) -> dict:
+    return service.build_response(service.update(vocabulary_id, item_data))
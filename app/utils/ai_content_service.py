@@ -12,6 +12,7 @@ NOTE: This service requires AI generation capabilities. The generation methods
 will use AI models to create high-quality vocabulary content.
 """
 import logging
+from functools import lru_cache
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
@@ -187,5 +188,14 @@ class AIContentService:
             return None
 
 
-# Global instance
-ai_content_service = AIContentService()
+@lru_cache
+def get_ai_content_service() -> AIContentService:
+    """The shared service, created on first use rather than at import."""
+    return AIContentService()
+
+
+def __getattr__(name: str):
+    # Keeps `from app.utils.ai_content_service import ai_content_service` working
+    if name == "ai_content_service":
+        return get_ai_content_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,282 @@
+"""
+Precomputed nearest-neighbour index of similar words for distractor selection.
+
+Similarity combines normalised edit distance, shared prefix and suffix length,
+and overlap of the synonyms/antonyms sets. The index is built offline by
+scripts/build_distractor_index.py and stored as a compact binary file that is
+memory-mapped at startup, so looking up the k nearest neighbours of a word is
+O(k) with no database work.
+
+File layout (little-endian):
+
+    header:  magic "VWDX" | format version u16 | k u16 | row count u32
+    rows:    item id (16 bytes) | fingerprint (8 bytes) | k neighbour rows u32
+
+Neighbour rows are ordered most similar first and padded with EMPTY_SLOT.
+The fingerprint hashes the fields similarity depends on, so a rebuild only
+recomputes rows whose word changed or whose neighbours changed.
+
+A rebuild writes a new file and renames it over the old one;
+get_distractor_index notices the replaced file and maps the new one, so
+running workers pick up a rebuilt index without a restart.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import uuid
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VWDX"
+FORMAT_VERSION = 1
+DEFAULT_NEIGHBOURS = 16
+EMPTY_SLOT = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHHI")
+_ROW_PREFIX = struct.Struct("<16s8s")
+
+
+@dataclass(frozen=True)
+class WordFeatures:
+    """The fields of a vocabulary item that word similarity depends on."""
+
+    id: uuid.UUID
+    word: str
+    related: FrozenSet[str]
+    fingerprint: bytes
+
+    @classmethod
+    def from_item(cls, item) -> "WordFeatures":
+        """Build features from a VocabularyItem or catalog entry."""
+        word = item.word.lower()
+        synonyms = sorted(s.lower() for s in item.synonyms or ())
+        antonyms = sorted(a.lower() for a in item.antonyms or ())
+        digest = hashlib.blake2b(
+            "\0".join([word, "|".join(synonyms), "|".join(antonyms)]).encode("utf-8"),
+            digest_size=8,
+        ).digest()
+        return cls(
+            id=item.id,
+            word=word,
+            related=frozenset([word, *synonyms, *antonyms]),
+            fingerprint=digest,
+        )
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance with a single rolling row."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        previous = current
+    return previous[-1]
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = 0
+    for ca, cb in zip(a, b):
+        if ca != cb:
+            break
+        n += 1
+    return n
+
+
+def word_similarity(a: WordFeatures, b: WordFeatures) -> float:
+    """Similarity in [0, 1]; higher means a harder distractor for the other."""
+    longest = max(len(a.word), len(b.word)) or 1
+    shortest = min(len(a.word), len(b.word)) or 1
+    spelling = 1 - _edit_distance(a.word, b.word) / longest
+    prefix = min(_common_prefix(a.word, b.word) / shortest, 1.0)
+    suffix = min(_common_prefix(a.word[::-1], b.word[::-1]) / shortest, 1.0)
+    union = a.related | b.related
+    overlap = len(a.related & b.related) / len(union) if union else 0.0
+    # Listed as each other's synonym/antonym counts as full overlap
+    if a.word in b.related or b.word in a.related:
+        overlap = 1.0
+    return 0.4 * spelling + 0.2 * prefix + 0.2 * suffix + 0.2 * overlap
+
+
+def _file_identity(stat: os.stat_result) -> tuple:
+    """What changes when an index file is replaced or rewritten."""
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _nearest(
+    target: WordFeatures, candidates: Iterable[WordFeatures], k: int
+) -> List[uuid.UUID]:
+    scored = [
+        (-word_similarity(target, other), other.word, other.id)
+        for other in candidates
+        if other.id != target.id
+    ]
+    scored.sort()
+    return [item_id for _, _, item_id in scored[:k]]
+
+
+class DistractorIndex:
+    """Read-only, memory-mapped view of a distractor index file."""
+
+    def __init__(self, buffer, k: int, count: int, file_identity: Optional[tuple] = None):
+        self._buffer = buffer
+        self.k = k
+        # Identity of the file the buffer maps; see get_distractor_index
+        self.file_identity = file_identity
+        self._neighbour_struct = struct.Struct(f"<{k}I")
+        self._row_size = _ROW_PREFIX.size + self._neighbour_struct.size
+        self._ids: List[uuid.UUID] = []
+        self._fingerprints: List[bytes] = []
+        for row in range(count):
+            raw_id, fingerprint = _ROW_PREFIX.unpack_from(buffer, self._offset(row))
+            self._ids.append(uuid.UUID(bytes=raw_id))
+            self._fingerprints.append(fingerprint)
+        self._rows: Dict[uuid.UUID, int] = {
+            item_id: row for row, item_id in enumerate(self._ids)
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "DistractorIndex":
+        """Memory-map an index file written by write()."""
+        with open(path, "rb") as f:
+            file_identity = _file_identity(os.fstat(f.fileno()))
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, k, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            buffer.close()
+            raise ValueError(f"{path} is not a distractor index (v{FORMAT_VERSION})")
+        return cls(buffer, k, count, file_identity)
+
+    def _offset(self, row: int) -> int:
+        return _HEADER.size + row * self._row_size
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._rows
+
+    def fingerprint(self, item_id: uuid.UUID) -> Optional[bytes]:
+        row = self._rows.get(item_id)
+        return self._fingerprints[row] if row is not None else None
+
+    def neighbours(self, item_id: uuid.UUID, limit: Optional[int] = None) -> List[uuid.UUID]:
+        """Get the most similar item IDs, most similar first."""
+        row = self._rows.get(item_id)
+        if row is None:
+            return []
+        slots = self._neighbour_struct.unpack_from(
+            self._buffer, self._offset(row) + _ROW_PREFIX.size
+        )
+        result = [self._ids[slot] for slot in slots if slot != EMPTY_SLOT]
+        return result[:limit] if limit is not None else result
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def build_neighbours(
+    features: List[WordFeatures],
+    previous: Optional[DistractorIndex] = None,
+    k: int = DEFAULT_NEIGHBOURS,
+) -> Tuple[Dict[uuid.UUID, List[uuid.UUID]], int]:
+    """
+    Compute the k nearest neighbours of every word.
+
+    With a previous index of the same k, a word is fully recomputed only if
+    it is new, its fingerprint changed, or one of its previous neighbours
+    changed or was removed. Otherwise its previous neighbours are merged
+    with the changed words, which is exact because the similarity of two
+    unchanged words cannot have changed.
+
+    Returns tuple of (neighbours by item ID, number of rows fully recomputed).
+    """
+    if previous is not None and previous.k != k:
+        previous = None
+
+    changed = {
+        f.id for f in features
+        if previous is None or previous.fingerprint(f.id) != f.fingerprint
+    }
+    current_ids = {f.id for f in features}
+    by_id = {f.id: f for f in features}
+    changed_features = [by_id[item_id] for item_id in changed]
+
+    neighbours = {}
+    recomputed = 0
+    for target in features:
+        old = previous.neighbours(target.id) if target.id not in changed else None
+        if old is None or any(n in changed or n not in current_ids for n in old):
+            neighbours[target.id] = _nearest(target, features, k)
+            recomputed += 1
+        else:
+            candidates = [by_id[n] for n in old] + changed_features
+            neighbours[target.id] = _nearest(target, candidates, k)
+    return neighbours, recomputed
+
+
+def write(
+    path: str,
+    features: List[WordFeatures],
+    neighbours: Dict[uuid.UUID, List[uuid.UUID]],
+    k: int = DEFAULT_NEIGHBOURS,
+) -> None:
+    """Write an index file atomically (write to a temp file, then rename)."""
+    rows = {f.id: row for row, f in enumerate(features)}
+    neighbour_struct = struct.Struct(f"<{k}I")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, k, len(features)))
+        for feature in features:
+            slots = [rows[n] for n in neighbours.get(feature.id, [])[:k]]
+            slots += [EMPTY_SLOT] * (k - len(slots))
+            f.write(_ROW_PREFIX.pack(feature.id.bytes, feature.fingerprint))
+            f.write(neighbour_struct.pack(*slots))
+    os.replace(tmp_path, path)
+
+
+# path -> (identity of the file last seen there, its index)
+_loaded: Dict[str, Tuple[Optional[tuple], Optional[DistractorIndex]]] = {}
+
+
+def get_distractor_index(path: str) -> Optional[DistractorIndex]:
+    """
+    Get the memory-mapped index for path, or None if it does not exist.
+
+    The file is stat'ed on every call and loaded again once it has been
+    replaced (or created, or removed). A previous index stays usable by
+    whoever still holds it; its mapping is released when it is no longer
+    referenced.
+    """
+    try:
+        file_identity = _file_identity(os.stat(path))
+    except FileNotFoundError:
+        file_identity = None
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == file_identity:
+        return cached[1]
+
+    index = None
+    if file_identity is None:
+        logger.info(
+            f"No distractor index at {path}; difficulty falls back to random "
+            "distractors. Build it with scripts/build_distractor_index.py."
+        )
+    else:
+        try:
+            index = DistractorIndex.load(path)
+            # The file may have been replaced again since the stat
+            file_identity = index.file_identity
+            logger.info(f"Distractor index loaded: {len(index)} words")
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Could not load distractor index {path}: {e}")
+    _loaded[path] = (file_identity, index)
+    return index
@@ -0,0 +1,33 @@
+"""
+Opaque cursor tokens for keyset pagination.
+
+A cursor encodes the sort key of the last row on a page, e.g. ``(word, id)``
+for vocabulary. The next page is fetched with ``WHERE (word, id) > cursor``,
+so every page costs the same regardless of how deep the client has paged.
+"""
+import base64
+import json
+from typing import Tuple
+
+
+def encode_cursor(sort_value: str, row_id) -> str:
+    """Encode a (sort_value, id) pair into a URL-safe opaque token."""
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, str]:
+    """
+    Decode a token produced by encode_cursor.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(sort_value, str) or not isinstance(row_id, str):
+        raise ValueError("Invalid pagination cursor")
+    return sort_value, row_id
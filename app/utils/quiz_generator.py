@@ -1,7 +1,7 @@
 import logging
 import random
 import uuid
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from app.models.quiz import QuizQuestion
 from app.models.vocabulary import VocabularyItem
@@ -9,31 +9,115 @@ from app.models.vocabulary import VocabularyItem
 logger = logging.getLogger(__name__)
 
 
+class DistractorSampler:
+    """
+    Samples wrong answers from a precomputed pool of distinct values.
+
+    The pool and its value-to-index map are built once (e.g. per level), and
+    each sample draws k indices from the pool minus the correct answer, so a
+    question costs O(k) instead of rebuilding a filtered list of the pool.
+    """
+
+    def __init__(self, values: Iterable[str], rng: Optional[random.Random] = None):
+        # Deduplicate while keeping order so options are always distinct
+        self._values = list(dict.fromkeys(values))
+        self._index = {value: i for i, value in enumerate(self._values)}
+        self._rng = rng or random
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def sample(self, correct: str, k: int = 3) -> List[str]:
+        """Get up to k distinct values from the pool, never the correct one."""
+        excluded = self._index.get(correct)
+        available = len(self._values) - (excluded is not None)
+        picks = self._rng.sample(range(available), min(k, available))
+        # Skip over the correct answer by shifting indices at or past it
+        if excluded is not None:
+            picks = [i + 1 if i >= excluded else i for i in picks]
+        return [self._values[i] for i in picks]
+
+    def _fill(self, correct: str, picks: List[str], k: int, avoid=()) -> List[str]:
+        """Top picks up to k with random pool values not in avoid."""
+        blocked = set(picks) | set(avoid) | {correct}
+        attempts = 20 * k
+        while len(picks) < k and attempts > 0:
+            attempts -= 1
+            value = self._values[self._rng.randrange(len(self._values))]
+            if value not in blocked:
+                blocked.add(value)
+                picks.append(value)
+        if len(picks) < k:
+            # Pool is nearly exhausted; take whatever is left in order,
+            # using avoided values only as a last resort
+            rest = [v for v in self._values if v not in blocked]
+            rest += [v for v in avoid if v != correct and v not in picks]
+            picks.extend(rest[: k - len(picks)])
+        return picks
+
+
+class NeighbourDistractorSampler(DistractorSampler):
+    """
+    DistractorSampler that prefers ("hard") or avoids ("easy") values similar
+    to the correct answer, using precomputed neighbour lists from
+    app.utils.distractor_index. Sampling stays O(k) per question.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[str],
+        neighbours: Dict[str, Sequence[str]],
+        difficulty: str = "hard",
+        rng: Optional[random.Random] = None,
+    ):
+        super().__init__(values, rng)
+        self.difficulty = difficulty
+        # Only neighbours that are themselves in the pool can be offered
+        self._neighbours = {
+            value: [n for n in near if n in self._index and n != value]
+            for value, near in neighbours.items()
+        }
+
+    def sample(self, correct: str, k: int = 3) -> List[str]:
+        near = self._neighbours.get(correct, [])
+        if self.difficulty == "hard":
+            # Randomise among the closest 2k so repeated quizzes vary
+            closest = near[: 2 * k]
+            picks = self._rng.sample(closest, min(k, len(closest)))
+            return self._fill(correct, picks, k)
+        if self.difficulty == "easy":
+            return self._fill(correct, [], k, avoid=near)
+        return super().sample(correct, k)
+
+
 def generate_quiz_questions(
-    vocabulary_items: List[VocabularyItem], question_count: Optional[int] = None
+    vocabulary_items: List[VocabularyItem],
+    question_count: Optional[int] = None,
+    distractor_items: Optional[List[VocabularyItem]] = None,
+    sampler: Optional[DistractorSampler] = None,
 ) -> List[QuizQuestion]:
     """
     Generate quiz questions from vocabulary items.
     Each question asks for the meaning of a word with 3 distractors.
+
+    Distractors are drawn from the other question items plus the optional
+    distractor_items, which are not asked about themselves. Pass a prebuilt
+    sampler of meanings to reuse a pool across calls instead.
     """
     if question_count:
         vocabulary_items = random.sample(
             vocabulary_items, min(question_count, len(vocabulary_items))
         )
 
-    questions = []
-    all_meanings = [item.meaning for item in vocabulary_items]
+    if sampler is None:
+        all_items = list(vocabulary_items) + list(distractor_items or [])
+        sampler = DistractorSampler(item.meaning for item in all_items)
 
+    questions = []
     for item in vocabulary_items:
-        # Create options: correct answer + 3 distractors
+        # Create options: correct answer + 3 distractors from other words
         options = [item.meaning]
-
-        # Get distractors from other words
-        distractors = [m for m in all_meanings if m != item.meaning]
-        if len(distractors) >= 3:
-            options.extend(random.sample(distractors, 3))
-        else:
-            options.extend(distractors)
+        options.extend(sampler.sample(item.meaning, 3))
 
         # Shuffle options
         random.shuffle(options)
@@ -55,6 +139,7 @@ def generate_quiz_questions(
 def generate_sentence_questions(
     vocabulary_items: List[VocabularyItem],
     question_count: Optional[int] = None,
+    sampler: Optional[DistractorSampler] = None,
 ) -> List[dict]:
     """
     Generate sentence fill-in-the-blank questions.
@@ -64,6 +149,8 @@ def generate_sentence_questions(
     Args:
         vocabulary_items: List of vocabulary items to generate questions from
         question_count: Optional limit on number of questions to generate
+        sampler: Optional prebuilt sampler of distractor words; built from
+            vocabulary_items when not given
 
     Returns:
         List of dicts with question data (not SQLAlchemy models).
@@ -75,8 +162,10 @@ def generate_sentence_questions(
             vocabulary_items, min(question_count, len(vocabulary_items))
         )
 
+    if sampler is None:
+        sampler = DistractorSampler(item.word for item in vocabulary_items)
+
     questions = []
-    all_words = [item.word for item in vocabulary_items]
 
     def _generate_local_sentence(word: str, meaning: str) -> str:
         """
@@ -138,15 +227,9 @@ def generate_sentence_questions(
             sentence_template = base_sentence.replace(item.word, "{word}")
             display_sentence = base_sentence.replace(item.word, "_____")
 
-        # Create options: correct word + 3 distractors
+        # Create options: correct word + 3 distractors from other words
         options = [item.word]
-
-        # Get distractors from other words
-        distractors = [w for w in all_words if w != item.word]
-        if len(distractors) >= 3:
-            options.extend(random.sample(distractors, 3))
-        else:
-            options.extend(distractors)
+        options.extend(sampler.sample(item.word, 3))
 
         # Shuffle options
         random.shuffle(options)
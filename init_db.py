@@ -1,12 +1,40 @@
 """
 Database initialization script.
-Run this to create all database tables.
+Run this to create or upgrade the database schema to the latest migration.
+
+Usage:
+    python init_db.py            # alembic upgrade head
+    python init_db.py --adopt    # database created by create_all before migrations
 """
+import argparse
+import sys
+
+from sqlalchemy import inspect
+
+from app.core.schema import current_revisions, stamp_schema, upgrade_schema
 from app.database import Base, engine
-from app.models import user, vocabulary, progress, quiz, quiz_sentence, level
+from app.models import (cache_version, level, progress,  # noqa: F401
+                        quiz, quiz_sentence, rate_limit, user, vocabulary)
 
 if __name__ == "__main__":
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    parser = argparse.ArgumentParser(description="Create or upgrade the database schema")
+    parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help="Create missing tables and mark an existing un-migrated database as up to date",
+    )
+    args = parser.parse_args()
 
+    if args.adopt:
+        print("Creating missing tables and stamping the latest migration...")
+        Base.metadata.create_all(bind=engine)
+        stamp_schema()
+    else:
+        if not current_revisions(engine) and inspect(engine).has_table("users"):
+            sys.exit(
+                "The database has tables but no migration history (it was created "
+                "before migrations). Run `python init_db.py --adopt` once to adopt it."
+            )
+        print("Applying database migrations...")
+        upgrade_schema()
+    print("Database schema is up to date!")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Report bcrypt hashes per second per core at each cost, to choose
+BCRYPT_ROUNDS.
+
+Each cost is timed on a single thread, so the figures are per core; a login
+costs one verification at the stored hash's cost (plus one hash when the cost
+changes and the password is rehashed).
+
+Usage:
+    python scripts/benchmark_bcrypt.py
+    python scripts/benchmark_bcrypt.py --min-rounds 8 --max-rounds 14 --seconds 2
+"""
+import argparse
+import time
+
+import bcrypt
+
+PASSWORD = b"BenchmarkPassword123"
+
+
+def hashes_per_second(rounds: int, seconds: float) -> float:
+    salt = bcrypt.gensalt(rounds=rounds)
+    count = 0
+    started = time.perf_counter()
+    # At least two hashes, then until the time budget is spent
+    while count < 2 or time.perf_counter() - started < seconds:
+        bcrypt.hashpw(PASSWORD, salt)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def benchmark(min_rounds: int, max_rounds: int, seconds: float) -> None:
+    print(f"{'rounds':>6}  {'hashes/s/core':>13}  {'ms/hash':>8}")
+    for rounds in range(min_rounds, max_rounds + 1):
+        rate = hashes_per_second(rounds, seconds)
+        print(f"{rounds:>6}  {rate:>13.1f}  {1000 / rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt cost factors")
+    parser.add_argument("--min-rounds", type=int, default=10, help="Lowest cost (default: 10)")
+    parser.add_argument("--max-rounds", type=int, default=14, help="Highest cost (default: 14)")
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=1.0,
+        help="Minimum time spent on each cost (default: 1)",
+    )
+    args = parser.parse_args()
+    benchmark(args.min_rounds, args.max_rounds, args.seconds)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare the two ways of answering a vocabulary list request:
+
+- model: return PaginatedResponse[VocabularyItemResponse] built from
+  response dicts; FastAPI validates it against the response_model again
+  and encodes it with the stdlib json encoder
+- orjson: items encoded straight to JSON with orjson and sent as a
+  PrebuiltJSONResponse (the database path, no catalog)
+- orjson cached: catalog entries encoded once per catalog snapshot (the
+  catalog path)
+
+Each variant is a route on the same in-process FastAPI app serving a page
+of synthetic catalog entries, called through TestClient, so the figures
+include routing and HTTP handling but no database work.
+
+Usage:
+    python scripts/benchmark_list_serialization.py
+    python scripts/benchmark_list_serialization.py --items 100 -n 500
+"""
+import argparse
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.schemas.common import PaginatedResponse  # noqa: E402
+from app.schemas.vocabulary import VocabularyItemResponse  # noqa: E402
+from app.services.vocabulary_catalog import (CatalogEntry,  # noqa: E402
+                                             VocabularyCatalog)
+from app.utils.json_response import (PrebuiltJSONResponse,  # noqa: E402
+                                     dumps, paginated_json)
+
+
+def make_catalog(size: int) -> VocabularyCatalog:
+    created = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    return VocabularyCatalog(
+        CatalogEntry(
+            id=uuid.uuid4(),
+            word=f"word{i:05d}",
+            meaning="a word used to measure response serialisation",
+            synonyms=("term", "expression", "vocable"),
+            antonyms=("silence",),
+            example_sentences=(
+                f"The word{i:05d} appears in this sentence.",
+                "A second example keeps the payload realistic.",
+            ),
+            levels=(1 + i % 4,),
+            quiz_sentences=(),
+            created_at=created,
+            updated_at=created + timedelta(days=i % 30),
+        )
+        for i in range(size)
+    )
+
+
+def make_app(catalog: VocabularyCatalog) -> FastAPI:
+    app = FastAPI()
+    entries = list(catalog.entries)
+    page = dict(total=len(entries), skip=0, limit=len(entries), next_cursor=None)
+
+    @app.get("/model", response_model=PaginatedResponse[VocabularyItemResponse])
+    def model():
+        return PaginatedResponse(
+            items=[entry.to_response() for entry in entries], **page
+        )
+
+    @app.get("/orjson", response_model=PaginatedResponse[VocabularyItemResponse])
+    def prebuilt():
+        items = [dumps(entry.to_response()) for entry in entries]
+        return PrebuiltJSONResponse(paginated_json(items, **page))
+
+    @app.get("/orjson-cached", response_model=PaginatedResponse[VocabularyItemResponse])
+    def prebuilt_cached():
+        items = [catalog.response_json(entry) for entry in entries]
+        return PrebuiltJSONResponse(paginated_json(items, **page))
+
+    return app
+
+
+def benchmark(items: int, number: int) -> None:
+    client = TestClient(make_app(make_catalog(items)))
+    bodies = {path: client.get(path).content for path in ("/model", "/orjson", "/orjson-cached")}
+    assert len(set(bodies.values())) == 1, "variants returned different bodies"
+
+    print(f"{items} items per page, {len(bodies['/model']) / 1024:.0f} KiB body")
+    timings = {}
+    for path in bodies:
+        seconds = min(timeit.repeat(lambda: client.get(path), number=number, repeat=3))
+        timings[path] = seconds / number * 1000
+        print(f"{path.lstrip('/'):>14}: {timings[path]:7.3f} ms/request")
+
+    for path in ("/orjson", "/orjson-cached"):
+        print(f"{path.lstrip('/'):>14}: {timings['/model'] / timings[path]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialisation")
+    parser.add_argument("--items", type=int, default=500, help="Items per page (default: 500)")
+    parser.add_argument("-n", "--number", type=int, default=200, help="Requests per run (default: 200)")
+    args = parser.parse_args()
+    benchmark(args.items, args.number)
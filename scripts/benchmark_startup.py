@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Report app startup time: importing app.main, running the lifespan startup
+(schema check, cache warm-up) and answering the first request.
+
+Each run starts a fresh interpreter, so module imports are not cached between
+runs. Uses the configured DATABASE_URL and SCHEMA_STARTUP_MODE; pass --mode to
+compare modes.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 10 --mode skip
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs in the child interpreter; prints one JSON line of timings in ms
+CHILD = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/health").raise_for_status()
+    answered = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": (ready - imported) * 1000,
+    "first_request_ms": (answered - ready) * 1000,
+    "time_to_first_response_ms": (answered - started) * 1000,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Startup failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(runs: int, mode: str = None) -> None:
+    env = dict(os.environ)
+    if mode:
+        env["SCHEMA_STARTUP_MODE"] = mode
+    samples = [run_once(env) for _ in range(runs)]
+    print(f"{'phase':<26}  {'median ms':>9}  {'min ms':>8}")
+    for phase in samples[0]:
+        values = [sample[phase] for sample in samples]
+        print(f"{phase:<26}  {statistics.median(values):>9.1f}  {min(values):>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark app startup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to time (default: 5)")
+    parser.add_argument(
+        "--mode",
+        choices=["verify", "create", "skip"],
+        help="SCHEMA_STARTUP_MODE for the runs (default: from the environment)",
+    )
+    args = parser.parse_args()
+    benchmark(args.runs, args.mode)
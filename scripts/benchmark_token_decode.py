@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare decode_token with and without the verified-token cache.
+
+Decodes the same access token repeatedly, as an authenticated client does
+for the lifetime of its token.
+
+Usage:
+    python scripts/benchmark_token_decode.py
+    python scripts/benchmark_token_decode.py -n 50000
+"""
+import argparse
+import sys
+import timeit
+import uuid
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.security import create_access_token, decode_token  # noqa: E402
+from app.core.token_cache import verified_token_cache  # noqa: E402
+
+
+def uncached_decode(token: str):
+    verified_token_cache.clear()
+    return decode_token(token)
+
+
+def benchmark(number: int) -> None:
+    token = create_access_token({"sub": str(uuid.uuid4())})
+
+    timings = {}
+    for name, func in [("uncached", uncached_decode), ("cached", decode_token)]:
+        decode_token(token)
+        seconds = min(timeit.repeat(lambda: func(token), number=number, repeat=3))
+        timings[name] = seconds / number * 1e6
+        print(f"{name:>9}: {timings[name]:8.2f} us/decode")
+
+    print(f"  speedup: {timings['uncached'] / timings['cached']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JWT decoding")
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=10000,
+        help="Decodes per timing run",
+    )
+    args = parser.parse_args()
+    benchmark(args.number)
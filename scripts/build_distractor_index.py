@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Build the similar-word index used for "easy"/"hard" quiz distractors.
+
+The index file is rebuilt incrementally: words whose spelling, synonyms and
+antonyms are unchanged since the previous build keep their neighbour lists
+and are only compared against the changed words.
+
+Usage:
+    python scripts/build_distractor_index.py              # incremental
+    python scripts/build_distractor_index.py --full       # recompute all
+    python scripts/build_distractor_index.py --output data/distractor_index.bin -k 16
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.repositories.vocabulary_repository import VocabularyRepository  # noqa: E402
+from app.utils.distractor_index import (DEFAULT_NEIGHBOURS,  # noqa: E402
+                                        DistractorIndex, WordFeatures,
+                                        build_neighbours, write)
+
+
+def build_index(output: str, k: int, full: bool = False) -> None:
+    db = SessionLocal()
+    try:
+        items = VocabularyRepository(db).get_all_ordered()
+        features = [WordFeatures.from_item(item) for item in items]
+    finally:
+        db.close()
+
+    previous = None
+    if not full and Path(output).exists():
+        try:
+            previous = DistractorIndex.load(output)
+        except ValueError as e:
+            print(f"Ignoring previous index: {e}")
+
+    started = time.perf_counter()
+    neighbours, recomputed = build_neighbours(features, previous, k=k)
+    elapsed = time.perf_counter() - started
+    if previous is not None:
+        previous.close()
+
+    write(output, features, neighbours, k=k)
+    print(
+        f"Wrote {output}: {len(features)} words, k={k}, "
+        f"{recomputed} rows recomputed in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the distractor index")
+    parser.add_argument(
+        "--output",
+        default=settings.DISTRACTOR_INDEX_PATH,
+        help="Index file path (default: DISTRACTOR_INDEX_PATH)",
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=DEFAULT_NEIGHBOURS,
+        help="Neighbours stored per word",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the previous index and recompute every word",
+    )
+    args = parser.parse_args()
+    build_index(args.output, args.k, full=args.full)
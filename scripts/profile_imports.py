@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Summarise `python -X importtime` for the app, grouped by app.* module.
+
+Every module's own import time is charged to the nearest app.* module that
+imported it, so third-party packages show up under the app module that pulls
+them in first (e.g. python-jose under app.core.security). Modules imported
+outside any app module (interpreter startup, site) are listed as
+"(outside app)".
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --module app.api.v1.auth --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+OUTSIDE = "(outside app)"
+
+
+def importtime(module: str) -> List[Tuple[int, int, str]]:
+    """(depth, self microseconds, module) per import, in importtime order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, int(self_us), name.strip()))
+    return rows
+
+
+def group_by_app_module(rows: List[Tuple[int, int, str]]) -> Dict[str, List[int]]:
+    """app module -> [own microseconds, microseconds including what it pulled in]."""
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    # importtime lists children before their parent; walking backwards
+    # visits each parent first, so a stack by depth gives the ancestors
+    stack: List[str] = []
+    for depth, self_us, name in reversed(rows):
+        del stack[depth:]
+        stack.append(name)
+        owner = next(
+            (m for m in reversed(stack) if m == "app" or m.startswith("app.")), OUTSIDE
+        )
+        if owner == name:
+            totals[owner][0] += self_us
+        totals[owner][1] += self_us
+    return totals
+
+
+def report(module: str, top: int) -> None:
+    rows = importtime(module)
+    totals = group_by_app_module(rows)
+    total_us = sum(self_us for _, self_us, _ in rows)
+
+    print(f"{'module':<45}  {'own ms':>7}  {'with deps ms':>12}")
+    ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (own_us, with_deps_us) in ranked[:top]:
+        print(f"{name:<45}  {own_us / 1000:>7.1f}  {with_deps_us / 1000:>12.1f}")
+    print(f"{'total (' + str(len(rows)) + ' modules)':<45}  {'':>7}  {total_us / 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile import time by app module")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=25, help="Rows to show (default: 25)")
+    args = parser.parse_args()
+    report(args.module, args.top)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Rebuild the user_level_stats counters from user_progress.
+
+The counters behind GET /progress are maintained on every progress write.
+Run this once to backfill them for existing databases, or at any time to
+correct drift (e.g. after editing user_progress by hand).
+
+Usage:
+    python scripts/rebuild_level_stats.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.database import SessionLocal  # noqa: E402
+from app.models.progress import UserLevelStats  # noqa: E402
+from app.repositories.user_level_stats_repository import (  # noqa: E402
+    UserLevelStatsRepository,
+)
+
+
+def rebuild_level_stats() -> None:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        UserLevelStatsRepository(db).rebuild()
+        db.commit()
+        rows = db.query(UserLevelStats).count()
+        elapsed = time.perf_counter() - started
+        print(f"Rebuilt {rows} user_level_stats rows in {elapsed:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_level_stats()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Create or rebuild the full-text search index for vocabulary search.
+
+New databases get the index automatically when the vocabulary_items table is
+created. Run this once against databases created before search indexing was
+added, or to rebuild the SQLite FTS5 table from scratch.
+
+- PostgreSQL: enables pg_trgm and creates the tsvector and trigram GIN indexes
+- SQLite: (re)creates the vocabulary_items_fts FTS5 table, its sync triggers,
+  and backfills it from vocabulary_items
+
+Usage:
+    python scripts/setup_search_index.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.database import engine  # noqa: E402
+from app.repositories.vocabulary_search import setup_search_index  # noqa: E402
+
+
+if __name__ == "__main__":
+    print(f"Setting up search index ({engine.dialect.name})...")
+    setup_search_index(engine)
+    print("Search index ready.")
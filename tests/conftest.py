@@ -1,10 +1,22 @@
+import os
+import time
+
+# Minimum bcrypt cost keeps password hashing out of test run time
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Tests build their own tables; the app's startup check would otherwise
+# require a migrated DATABASE_URL
+os.environ.setdefault("SCHEMA_STARTUP_MODE", "create")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
+from app.database import Base, ThreadpoolSession, get_async_db, get_db
 from app.main import app, limiter
 from app.api.v1.auth import limiter as auth_limiter
+from app.core.token_cache import verified_token_cache
+from app.core.user_cache import user_auth_cache
+from app.services.vocabulary_catalog import vocabulary_catalog
 import uuid
 
 # Test database (SQLite in memory)
@@ -16,6 +28,63 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class RedisStandIn:
+    """In-process stand-in for the subset of the Redis client the app uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, name):
+        entry = self.data.get(name)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.data[name]
+            return None
+        return entry
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx and self._live(name) is not None:
+            return None
+        self.data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def get(self, name):
+        entry = self._live(name)
+        return entry[0] if entry else None
+
+    def exists(self, *names):
+        return sum(1 for name in names if self._live(name) is not None)
+
+    def incrby(self, name, amount):
+        entry = self._live(name)
+        value, expires_at = entry if entry else (0, None)
+        self.data[name] = (int(value) + amount, expires_at)
+        return int(value) + amount
+
+    def pttl(self, name):
+        entry = self._live(name)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - time.time()) * 1000)
+
+    def expire(self, name, seconds):
+        entry = self._live(name)
+        if entry is not None:
+            self.data[name] = (entry[0], time.time() + seconds)
+
+    def scan_iter(self, match="*"):
+        prefix = match.rstrip("*")
+        return [name for name in list(self.data) if name.startswith(prefix)]
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def ping(self):
+        return True
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database for each test."""
@@ -43,15 +112,25 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        yield ThreadpoolSession(db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Disable rate limiting for tests
     limiter.enabled = False
     auth_limiter.enabled = False
     
     with TestClient(app) as test_client:
+        # The catalog is warmed from the app database on startup; force a
+        # rebuild from the per-test database on first read
+        vocabulary_catalog.clear()
         yield test_client
     
+    user_auth_cache.clear()
+    verified_token_cache.clear()
+    
     # Re-enable rate limiting after tests
     limiter.enabled = True
     auth_limiter.enabled = True
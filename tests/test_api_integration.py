@@ -143,3 +143,192 @@ class TestProgressAPI:
         assert progress_response.status_code == status.HTTP_201_CREATED
         progress_data = progress_response.json()
         assert progress_data["is_mastered"] is True
+
+    def test_progress_batch(self, client, db_session, test_user_data, test_admin_user, test_vocabulary_data):
+        """Test applying offline progress events in one batch request."""
+        import uuid
+
+        from app.models.progress import UserProgress
+
+        admin_headers = self._get_admin_auth_headers(client, test_admin_user)
+        vocab_ids = [
+            client.post(
+                "/api/v1/vocabulary",
+                json=dict(test_vocabulary_data, word=word),
+                headers=admin_headers
+            ).json()["id"]
+            for word in ["amble", "brisk"]
+        ]
+        user_headers = self._get_auth_headers(client, test_user_data)
+        unknown_id = str(uuid.uuid4())
+
+        def event(kind, vocab_id, minute):
+            return {
+                "type": kind,
+                "vocabulary_item_id": vocab_id,
+                "year": "year3",
+                "occurred_at": f"2024-05-01T10:{minute:02d}:00+01:00",
+            }
+
+        events = [
+            event("practice", vocab_ids[0], 1),
+            event("mastered", vocab_ids[0], 3),
+            event("practice", vocab_ids[0], 2),
+            event("practice", vocab_ids[1], 4),
+            event("practice", unknown_id, 5),
+        ]
+        response = client.post(
+            "/api/v1/progress/batch",
+            json={"events": events},
+            headers=user_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "applied_events": 4,
+            "updated_words": 2,
+            "unknown_vocabulary_item_ids": [unknown_id],
+        }
+
+        # A second sync adds to the existing rows
+        response = client.post(
+            "/api/v1/progress/batch",
+            json={"events": [event("practice", vocab_ids[0], 9)]},
+            headers=user_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        db_session.expire_all()
+        rows = {
+            str(p.vocabulary_item_id): p for p in db_session.query(UserProgress).all()
+        }
+        first = rows[vocab_ids[0]]
+        assert first.times_practiced == 3
+        assert first.is_mastered is True
+        assert first.mastered_at.isoformat() == "2024-05-01T09:03:00"
+        assert first.last_practiced_at.isoformat() == "2024-05-01T09:09:00"
+        assert rows[vocab_ids[1]].is_mastered is False
+
+        mastered = client.get(
+            "/api/v1/progress/mastered",
+            params={"year": "year3"},
+            headers=user_headers
+        )
+        assert mastered.json()["mastered_word_ids"] == [vocab_ids[0]]
+
+    def test_repeated_progress_counts_once(self, client, db_session, test_user_data, test_admin_user, test_vocabulary_data):
+        """Test the same mastery or first practice applied twice moves the counters once."""
+        from app.models.progress import UserLevelStats
+
+        admin_headers = self._get_admin_auth_headers(client, test_admin_user)
+        vocab_ids = [
+            client.post(
+                "/api/v1/vocabulary",
+                json=dict(test_vocabulary_data, word=word, levels=[1]),
+                headers=admin_headers
+            ).json()["id"]
+            for word in ["amble", "brisk"]
+        ]
+        user_headers = self._get_auth_headers(client, test_user_data)
+
+        def counters():
+            db_session.expire_all()
+            stats = db_session.query(UserLevelStats).one()
+            return stats.mastered_words, stats.practiced_words
+
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/progress/mastered",
+                json={"vocabulary_item_id": vocab_ids[0], "year": "year3"},
+                headers=user_headers
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            assert response.json()["is_mastered"] is True
+        assert counters() == (1, 0)
+
+        for _ in range(2):
+            client.post(
+                "/api/v1/progress/practice",
+                json={"vocabulary_item_id": vocab_ids[0], "year": "year3", "correct": True},
+                headers=user_headers
+            )
+        assert counters() == (1, 1)
+
+        # A replayed offline batch counts its words once too
+        batch = {
+            "events": [
+                {
+                    "type": kind,
+                    "vocabulary_item_id": vocab_id,
+                    "year": "year3",
+                    "occurred_at": "2024-05-01T10:00:00Z",
+                }
+                for kind in ["mastered", "practice"]
+                for vocab_id in vocab_ids
+            ]
+        }
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/progress/batch", json=batch, headers=user_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+        assert counters() == (2, 2)
+
+    def test_progress_summary_by_level(self, client, db_session, test_user_data, test_admin_user, test_vocabulary_data):
+        """Test level counters follow progress writes and match a rebuild."""
+        from app.models.progress import UserLevelStats
+        from app.repositories.user_level_stats_repository import UserLevelStatsRepository
+
+        admin_headers = self._get_admin_auth_headers(client, test_admin_user)
+        vocab_ids = [
+            client.post(
+                "/api/v1/vocabulary",
+                json=dict(test_vocabulary_data, word=word, levels=levels),
+                headers=admin_headers
+            ).json()["id"]
+            for word, levels in [("amble", [1]), ("brisk", [1, 2]), ("cosy", [2])]
+        ]
+        user_headers = self._get_auth_headers(client, test_user_data)
+
+        for vocab_id in vocab_ids[:2]:
+            client.post(
+                "/api/v1/progress/mastered",
+                json={"vocabulary_item_id": vocab_id, "year": "year3"},
+                headers=user_headers
+            )
+        client.delete(
+            f"/api/v1/progress/mastered/{vocab_ids[0]}",
+            params={"year": "year3"},
+            headers=user_headers
+        )
+        client.post(
+            "/api/v1/progress/practice",
+            json={"vocabulary_item_id": vocab_ids[2], "year": "year4", "correct": True},
+            headers=user_headers
+        )
+
+        response = client.get("/api/v1/progress", headers=user_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        levels = {s["level"]: s for s in data["level_progress"]}
+        assert (levels[1]["total_words"], levels[1]["mastered_words"]) == (2, 1)
+        assert (levels[2]["total_words"], levels[2]["mastered_words"]) == (2, 1)
+        assert levels[2]["practiced_words"] == 1
+        assert [y["year"] for y in data["year_progress"]] == ["year3", "year4"]
+        assert data["overall_progress"]["mastered_words"] == 2
+
+        response = client.get(
+            "/api/v1/progress", params={"year": "year4"}, headers=user_headers
+        )
+        assert [s["level"] for s in response.json()["level_progress"]] == [2]
+
+        def counters():
+            db_session.expire_all()
+            return sorted(
+                (s.level, s.mastered_words, s.practiced_words)
+                for s in db_session.query(UserLevelStats).all()
+            )
+
+        maintained = counters()
+        UserLevelStatsRepository(db_session).rebuild()
+        db_session.commit()
+        assert counters() == maintained
@@ -1,3 +1,6 @@
+import time
+import uuid
+
 import pytest
 from fastapi import status
 
@@ -49,3 +52,331 @@ def test_login_invalid_credentials(client, test_user_data):
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+
+
+def _login_headers(client, test_user_data):
+    response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_authenticated_user_is_cached(client, test_user_data):
+    """Repeat requests authenticate without loading the user row."""
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    headers = _login_headers(client, test_user_data)
+    assert client.get("/api/v1/progress", headers=headers).status_code == 200
+
+    user_queries = []
+
+    def count_user_queries(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_user_queries)
+    try:
+        response = client.get("/api/v1/progress", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_user_queries)
+    assert response.status_code == 200
+    assert user_queries == []
+
+
+def test_logout_all_invalidates_cached_user(client, test_user_data):
+    """Revoked tokens are rejected even though the user was cached."""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    headers = _login_headers(client, test_user_data)
+    assert client.get("/api/v1/progress", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout-all", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/v1/progress", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # A token issued after the revocation is accepted
+    client.post("/api/v1/auth/register", json=test_user_data)
+    headers = _login_headers(client, test_user_data)
+    assert client.get("/api/v1/progress", headers=headers).status_code == 200
+
+
+def test_deactivation_invalidates_cached_user(
+    client, db_session, test_user_data, test_admin_user
+):
+    """Users deactivated by an admin are rejected on their next request."""
+    from app.repositories.user_repository import UserRepository
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    headers = _login_headers(client, test_user_data)
+    response = client.get("/api/v1/progress", headers=headers)
+    assert response.status_code == 200
+
+    user = UserRepository(db_session).get_by_username(test_user_data["username"])
+    path = f"/api/v1/auth/users/{user.id}/active"
+
+    # Only admins may change it
+    response = client.put(path, json={"is_active": False}, headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    admin_headers = _login_headers(client, test_admin_user)
+    response = client.put(path, json={"is_active": False}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+    response = client.get("/api/v1/progress", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.put(path, json={"is_active": True}, headers=admin_headers)
+    assert response.json()["is_active"] is True
+    assert client.get("/api/v1/progress", headers=headers).status_code == 200
+
+    response = client.put(
+        f"/api/v1/auth/users/{uuid.uuid4()}/active",
+        json={"is_active": False},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_verified_token_cache():
+    """Repeat decodes are served from the cache until blacklist or expiry."""
+    from datetime import timedelta
+
+    from app.core.security import (blacklist_token, create_access_token,
+                                   decode_token)
+    from app.core.token_cache import verified_token_cache
+
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    payload = decode_token(token)
+    assert verified_token_cache.get(token) == payload
+
+    # Callers get copies; mutating one does not affect the cache
+    decode_token(token)["sub"] = "changed"
+    assert decode_token(token) == payload
+
+    blacklist_token(token)
+    assert decode_token(token) is None
+
+    # Entries are dropped at the token's exp
+    verified_token_cache.put("expired-token", {"sub": "x", "exp": time.time() - 1})
+    assert verified_token_cache.get("expired-token") is None
+
+    expired = create_access_token(
+        {"sub": str(uuid.uuid4())}, expires_delta=timedelta(seconds=-10)
+    )
+    assert decode_token(expired) is None
+    assert verified_token_cache.get(expired) is None
+
+
+def test_password_pool_backpressure():
+    """Work beyond workers + queue size is rejected instead of queued."""
+    import asyncio
+    import threading
+
+    from app.core.exceptions import ServiceUnavailableError
+    from app.core.password_pool import PasswordHashPool
+
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "done"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableError):
+            await pool.run(lambda: None)
+        stats = pool.stats()
+        assert (stats["in_progress"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+
+        release.set()
+        assert await queued == "done"
+        await running
+        assert pool.stats()["completed"] == 2
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_login_returns_503_when_password_pool_is_full(client, test_user_data, monkeypatch):
+    """Saturated bcrypt pool turns logins away with 503 and Retry-After."""
+    from app.core.password_pool import password_hash_pool
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    monkeypatch.setattr(password_hash_pool, "workers", 0)
+    monkeypatch.setattr(password_hash_pool, "max_queue", 0)
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "Retry-After" in response.headers
+
+
+def test_login_rehashes_password_when_cost_changes(client, db_session, test_user_data, monkeypatch):
+    """A successful login upgrades the stored hash to BCRYPT_ROUNDS."""
+    from app.core.config import settings
+    from app.repositories.user_repository import UserRepository
+    from app.schemas.user import UserLogin
+    from app.services.auth_service import AuthService
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    user_repo = UserRepository(db_session)
+    user = user_repo.get_by_username(test_user_data["username"])
+    assert user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+    headers = _login_headers(client, test_user_data)
+    db_session.refresh(user)
+    assert user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    # Tokens issued before the rehash stay valid
+    assert client.get("/api/v1/progress", headers=headers).status_code == 200
+
+    # Sync service path, downgrading the cost
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS - 1)
+    credentials = UserLogin(
+        username=test_user_data["username"], password=test_user_data["password"]
+    )
+    AuthService(db_session).login(credentials)
+    db_session.refresh(user)
+    assert user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+
+def test_token_blacklist_sweeps_expired_jtis():
+    """Entries are keyed by jti and dropped in expiry order."""
+    from app.core.security import (blacklist_token, create_access_token,
+                                   decode_token)
+    from app.core.token_blacklist import TokenBlacklist, token_blacklist
+
+    blacklist = TokenBlacklist()
+    now = time.time()
+    blacklist.add("expired", now - 1)
+    blacklist.add("live", now + 60)
+    blacklist.add("extended", now - 5)
+    blacklist.add("extended", now + 120)
+
+    assert blacklist.cleanup_expired() == 1
+    assert not blacklist.is_blacklisted("expired")
+    assert blacklist.is_blacklisted("live")
+    assert blacklist.is_blacklisted("extended")
+    stats = blacklist.stats()
+    assert (stats["size"], stats["added"], stats["expired"]) == (2, 4, 1)
+
+    blacklist.start_sweeper(0.01)
+    try:
+        blacklist.add("soon", time.time() + 0.05)
+        deadline = time.time() + 2
+        while blacklist.is_blacklisted("soon") and time.time() < deadline:
+            time.sleep(0.01)
+        assert not blacklist.is_blacklisted("soon")
+    finally:
+        blacklist.stop_sweeper()
+
+    # The global blacklist stores the token's jti, not the token itself
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    blacklist_token(token)
+    assert token_blacklist.is_blacklisted(decode_token(token, check_blacklist=False)["jti"])
+    assert not token_blacklist.is_blacklisted(token)
+
+
+def test_shared_revocation_stores(db_session):
+    """SQL and Redis stores share revocations; expired ones are dropped."""
+    from app.core.token_blacklist import RedisRevocationStore, SqlRevocationStore
+    from tests.conftest import RedisStandIn, TestingSessionLocal
+
+    redis = RedisStandIn()
+    stores = [SqlRevocationStore(TestingSessionLocal), RedisRevocationStore(redis)]
+    for store in stores:
+        now = time.time()
+        store.add("live", now + 60)
+        store.add("live", now + 60)
+        store.add("expired", now - 1)
+        assert store.is_blacklisted("live")
+        assert not store.is_blacklisted("unknown")
+
+        store.cleanup_expired()
+        assert not store.is_blacklisted("expired")
+
+        store.clear()
+        assert not store.is_blacklisted("live")
+    assert redis.data == {}
+
+
+def test_cached_revocation_store_reads_through():
+    """Workers see each other's revocations once the local entry expires."""
+    from app.core.token_blacklist import CachedRevocationStore, TokenBlacklist
+
+    shared = TokenBlacklist()
+    worker_a = CachedRevocationStore(shared, ttl_seconds=0.05)
+    worker_b = CachedRevocationStore(shared, ttl_seconds=0.05)
+
+    assert not worker_b.is_blacklisted("jti-1")
+    worker_a.add("jti-1", time.time() + 60)
+    assert worker_a.is_blacklisted("jti-1")
+    assert worker_a.stats()["local_misses"] == 0
+
+    # Worker B answers from its cache until the TTL runs out
+    assert not worker_b.is_blacklisted("jti-1")
+    assert worker_b.stats()["local_hits"] == 1
+    time.sleep(0.06)
+    assert worker_b.is_blacklisted("jti-1")
+
+
+def test_async_requests_check_shared_revocations_off_the_event_loop(client, test_user_data, monkeypatch):
+    """Test that async routes query a shared revocation store from the threadpool."""
+    import asyncio
+
+    from app.core import security
+    from app.core.token_blacklist import (CachedRevocationStore,
+                                          RevocationStore, TokenBlacklist)
+
+    with pytest.raises(TypeError):
+        RevocationStore()
+
+    class RecordingStore(TokenBlacklist):
+        """Shared store stand-in recording whether lookups block the loop."""
+
+        def __init__(self):
+            super().__init__()
+            self.on_event_loop = []
+
+        def is_blacklisted(self, jti):
+            try:
+                asyncio.get_running_loop()
+                self.on_event_loop.append(True)
+            except RuntimeError:
+                self.on_event_loop.append(False)
+            return super().is_blacklisted(jti)
+
+        async def is_blacklisted_async(self, jti):
+            return await RevocationStore.is_blacklisted_async(self, jti)
+
+    shared = RecordingStore()
+    monkeypatch.setattr(security, "token_blacklist", CachedRevocationStore(shared, ttl_seconds=0))
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": test_user_data["username"], "password": test_user_data["password"]},
+    ).json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+
+    assert client.get("/api/v1/progress", headers=headers).status_code == status.HTTP_200_OK
+    assert shared.on_event_loop == [False]
+
+    client.post("/api/v1/auth/logout", headers=headers)
+    assert client.get("/api/v1/progress", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,323 @@
+import pytest
+from fastapi import status
+
+
+def _login(client, username, password):
+    response = client.post(
+        "/api/v1/auth/login", json={"username": username, "password": password}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def mastered_words(client, test_admin_user, test_user_data, test_vocabulary_data):
+    """Create five level 1 words and mark them all mastered for the test user."""
+    admin_headers = _login(
+        client, test_admin_user["username"], test_admin_user["password"]
+    )
+    client.post("/api/v1/auth/register", json=test_user_data)
+    user_headers = _login(
+        client, test_user_data["username"], test_user_data["password"]
+    )
+
+    words = {}
+    for i, word in enumerate(["amble", "brisk", "cosy", "dwell", "eager"]):
+        item = dict(test_vocabulary_data, word=word, meaning=f"meaning {i}")
+        created = client.post("/api/v1/vocabulary", json=item, headers=admin_headers)
+        words[word] = created.json()
+        client.post(
+            "/api/v1/progress/mastered",
+            json={"vocabulary_item_id": created.json()["id"], "year": "year3"},
+            headers=user_headers,
+        )
+    return words, user_headers
+
+
+def test_generate_quiz_from_mastered_words(client, mastered_words):
+    """Test that a quiz only asks about mastered words with 4 distinct options."""
+    words, headers = mastered_words
+    meanings = {item["word"]: item["meaning"] for item in words.values()}
+
+    response = client.post(
+        "/api/v1/quiz/generate",
+        json={"year": "year3", "question_count": 3},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_questions"] == 3
+
+    prompts = [q["prompt"] for q in data["questions"]]
+    assert len(set(prompts)) == 3
+    for question in data["questions"]:
+        assert len(set(question["options"])) == 4
+        assert set(question["options"]) <= set(meanings.values())
+        correct = question["options"][question["correct_index"]]
+        assert correct == meanings[question["prompt"]]
+
+
+def test_distractor_sampler_never_returns_correct_answer():
+    """Test that sampled distractors are distinct and exclude the answer."""
+    from app.utils.quiz_generator import DistractorSampler
+
+    sampler = DistractorSampler(["a", "b", "c", "d", "b"])
+    assert len(sampler) == 4
+    for correct in ["a", "b", "d", "z"]:
+        for _ in range(20):
+            picks = sampler.sample(correct, 3)
+            assert len(picks) == 3
+            assert len(set(picks)) == 3
+            assert correct not in picks
+
+    assert sorted(DistractorSampler(["a", "b"]).sample("a", 3)) == ["b"]
+
+
+def test_generate_sentences_for_level(client, mastered_words):
+    """Test sentence questions use other words of the level as options."""
+    words, headers = mastered_words
+
+    response = client.post(
+        "/api/v1/sentences/generate",
+        json={"year": "year3", "question_count": 4},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_questions"] == 4
+    for question in data["questions"]:
+        assert question["correct_word"] in question["options"]
+        assert len(set(question["options"])) == 4
+        assert set(question["options"]) <= set(words)
+
+
+def test_submit_quiz_grades_stored_answers(client, mastered_words):
+    """Test that a submitted quiz is graded once against its stored answer key."""
+    _, headers = mastered_words
+    quiz = client.post(
+        "/api/v1/quiz/generate",
+        json={"year": "year3", "question_count": 3},
+        headers=headers,
+    ).json()
+    first, second, _ = quiz["questions"]
+    answers = [
+        {"question_id": first["id"], "selected_index": first["correct_index"]},
+        {
+            "question_id": second["id"],
+            "selected_index": (second["correct_index"] + 1) % 4,
+        },
+    ]
+
+    response = client.post(
+        "/api/v1/quiz/submit",
+        json={"quiz_id": quiz["quiz_id"], "answers": answers},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_questions"] == 3
+    assert data["correct_answers"] == 1
+    assert data["incorrect_answers"] == 2
+    assert [r["correct"] for r in data["results"]] == [True, False]
+
+    # A quiz can only be graded once
+    response = client.post(
+        "/api/v1/quiz/submit",
+        json={"quiz_id": quiz["quiz_id"], "answers": answers},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_submit_quiz_after_word_deleted(client, db_session, mastered_words, test_admin_user):
+    """Test that a quiz on a since-deleted word is graded without recording it."""
+    import uuid
+
+    from app.models.progress import UserProgress
+
+    words, headers = mastered_words
+    quiz = client.post(
+        "/api/v1/quiz/generate",
+        json={"year": "year3", "question_count": 5},
+        headers=headers,
+    ).json()
+    admin_headers = _login(
+        client, test_admin_user["username"], test_admin_user["password"]
+    )
+    deleted_id = words["amble"]["id"]
+    response = client.delete(f"/api/v1/vocabulary/{deleted_id}", headers=admin_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    answers = [
+        {"question_id": q["id"], "selected_index": q["correct_index"]}
+        for q in quiz["questions"]
+    ]
+    response = client.post(
+        "/api/v1/quiz/submit",
+        json={"quiz_id": quiz["quiz_id"], "answers": answers},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["correct_answers"] == 5
+
+    db_session.expire_all()
+    practiced = {
+        p.vocabulary_item_id
+        for p in db_session.query(UserProgress).filter(UserProgress.times_practiced > 0)
+    }
+    assert len(practiced) == 4
+    assert uuid.UUID(deleted_id) not in practiced
+
+
+def test_memory_store_claim_released_after_failed_grading():
+    """Test that a claimed session is submittable again unless grading committed."""
+    import uuid
+
+    from app.services.quiz_session_store import (InMemoryQuizSessionStore,
+                                                 QuizSessionRecord)
+
+    store = InMemoryQuizSessionStore()
+    user_id = uuid.uuid4()
+    record = QuizSessionRecord(id=uuid.uuid4(), user_id=user_id, kind="quiz", year="year3")
+    store.save(None, record)
+
+    assert store.claim(None, record.id, user_id) is record
+    assert store.claim(None, record.id, user_id) is None
+    store.release(None, record, graded=False)
+    assert store.claim(None, record.id, user_id) is record
+    store.release(None, record, graded=True)
+    assert store.claim(None, record.id, user_id) is None
+
+
+def test_submit_sentences_with_database_store(client, mastered_words, monkeypatch):
+    """Test sentence grading through the quiz_sessions table backend."""
+    from app.services import quiz_service
+    from app.services.quiz_session_store import DatabaseQuizSessionStore
+
+    monkeypatch.setattr(
+        quiz_service, "quiz_session_store", DatabaseQuizSessionStore()
+    )
+    _, headers = mastered_words
+    session = client.post(
+        "/api/v1/sentences/generate",
+        json={"year": "year3", "question_count": 2},
+        headers=headers,
+    ).json()
+    answers = [
+        {"question_id": q["id"], "selected_word": q["correct_word"].upper()}
+        for q in session["questions"]
+    ]
+
+    response = client.post(
+        "/api/v1/sentences/submit",
+        json={"session_id": session["session_id"], "answers": answers},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["correct_answers"] == 2
+    assert data["score_percentage"] == 100.0
+
+    response = client.post(
+        "/api/v1/sentences/submit",
+        json={"session_id": session["session_id"], "answers": answers},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_distractor_index_incremental_build_matches_full(tmp_path):
+    """Test that an incremental rebuild gives the same neighbours as a full one."""
+    import uuid
+    from types import SimpleNamespace
+
+    from app.utils.distractor_index import (DistractorIndex, WordFeatures,
+                                            build_neighbours, write)
+
+    def item(word, synonyms=()):
+        return SimpleNamespace(
+            id=uuid.uuid4(), word=word, synonyms=list(synonyms), antonyms=[]
+        )
+
+    items = [
+        item("happy", ["glad"]), item("happily"), item("glad", ["happy"]),
+        item("sad"), item("said"), item("sand"), item("brave"), item("grave"),
+    ]
+    features = [WordFeatures.from_item(i) for i in items]
+    neighbours, recomputed = build_neighbours(features, k=3)
+    assert recomputed == len(items)
+    assert neighbours[items[3].id][0] in {items[4].id, items[5].id}
+
+    path = str(tmp_path / "index.bin")
+    write(path, features, neighbours, k=3)
+    index = DistractorIndex.load(path)
+    assert index.neighbours(items[0].id) == neighbours[items[0].id]
+
+    # Change one word and add another; most rows keep their neighbours
+    items[6] = SimpleNamespace(**dict(vars(items[6]), word="bravely"))
+    items.append(item("gladly"))
+    features = [WordFeatures.from_item(i) for i in items]
+    incremental, recomputed = build_neighbours(features, previous=index, k=3)
+    full, _ = build_neighbours(features, k=3)
+    assert incremental == full
+    assert recomputed < len(items)
+    index.close()
+
+
+def test_distractor_index_reloaded_after_rebuild(tmp_path, monkeypatch):
+    """Test that a rebuilt index file is picked up without a restart."""
+    import uuid
+    from datetime import datetime
+
+    from app.core.config import settings
+    from app.services.vocabulary_catalog import CatalogEntry, VocabularyCatalog
+    from app.utils.distractor_index import (WordFeatures, build_neighbours,
+                                            get_distractor_index, write)
+
+    path = str(tmp_path / "index.bin")
+    monkeypatch.setattr(settings, "DISTRACTOR_INDEX_PATH", path)
+    entries = [
+        CatalogEntry(
+            id=uuid.uuid4(), word=word, meaning=f"{word} meaning", synonyms=(),
+            antonyms=(), example_sentences=(), levels=(1,), quiz_sentences=(),
+            created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+        )
+        for word in ["sad", "said", "sand", "brave", "grave"]
+    ]
+    catalog = VocabularyCatalog(entries)
+    assert get_distractor_index(path) is None
+    random_sampler = catalog.distractor_sampler(difficulty="hard")
+
+    def build(k):
+        features = [WordFeatures.from_item(entry) for entry in entries]
+        write(path, features, build_neighbours(features, k=k)[0], k=k)
+
+    build(2)
+    first = get_distractor_index(path)
+    assert first.k == 2
+    assert get_distractor_index(path) is first
+    sampler = catalog.distractor_sampler(difficulty="hard")
+    assert sampler is not random_sampler
+    assert catalog.distractor_sampler(difficulty="hard") is sampler
+
+    build(3)
+    second = get_distractor_index(path)
+    assert second is not first and second.k == 3
+    assert len(first.neighbours(entries[0].id)) == 2  # old mapping still usable
+    assert catalog.distractor_sampler(difficulty="hard") is not sampler
+
+
+def test_neighbour_sampler_difficulty():
+    """Test hard distractors come from neighbours and easy ones avoid them."""
+    from app.utils.quiz_generator import NeighbourDistractorSampler
+
+    values = ["sad", "said", "sand", "brave", "grave", "glad", "happy", "calm"]
+    neighbours = {"sad": ["said", "sand", "glad"]}
+
+    hard = NeighbourDistractorSampler(values, neighbours, difficulty="hard")
+    assert sorted(hard.sample("sad", 3)) == ["glad", "said", "sand"]
+
+    easy = NeighbourDistractorSampler(values, neighbours, difficulty="easy")
+    for _ in range(20):
+        picks = easy.sample("sad", 3)
+        assert len(set(picks)) == 3
+        assert not set(picks) & {"sad", "said", "sand", "glad"}
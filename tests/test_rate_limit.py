@@ -0,0 +1,102 @@
+import asyncio
+
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.api.v1.auth import limiter as auth_limiter
+from app.core.rate_limit import (PrefetchingStorage, RedisRateLimitCounters,
+                                 SqlRateLimitCounters)
+from tests.conftest import RedisStandIn, TestingSessionLocal
+
+
+class CountingCounters(RedisRateLimitCounters):
+    """Counts reservations, and those made on an event loop thread."""
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.calls = 0
+        self.on_event_loop = 0
+
+    def incr(self, key, expiry, amount):
+        self.calls += 1
+        try:
+            asyncio.get_running_loop()
+            self.on_event_loop += 1
+        except RuntimeError:
+            pass
+        return super().incr(key, expiry, amount)
+
+
+def _admitted(limiters, item, hits):
+    """Send hits round-robin through the limiters; count the admitted ones."""
+    return sum(
+        limiters[i % len(limiters)].hit(item, "127.0.0.1") for i in range(hits)
+    )
+
+
+def test_prefetching_storage_keeps_limits_global(db_session):
+    """Several workers together admit at most the limit, mostly locally."""
+    item = parse("200/minute")
+    for counters in [SqlRateLimitCounters(TestingSessionLocal), RedisRateLimitCounters(RedisStandIn())]:
+        # One worker admits exactly the limit
+        storage = PrefetchingStorage(counters=counters, prefetch=10)
+        assert _admitted([FixedWindowRateLimiter(storage)], item, 250) == 200
+        assert storage.reservations < 60
+        assert counters.get(item.key_for("127.0.0.1")) <= 201
+
+        counters.reset()
+
+        # Four workers never admit more than the limit together
+        storages = [PrefetchingStorage(counters=counters, prefetch=10) for _ in range(4)]
+        limiters = [FixedWindowRateLimiter(storage) for storage in storages]
+        admitted = _admitted(limiters, item, 400)
+        assert 150 <= admitted <= 200
+        assert sum(storage.local_hits for storage in storages) > 200
+        counters.reset()
+
+
+def test_small_limits_are_prefetched(db_session):
+    """Low limits such as login's 5/minute still reserve several hits at a time."""
+    counters = CountingCounters(RedisStandIn())
+    storage = PrefetchingStorage(counters=counters, prefetch=10)
+    assert _admitted([FixedWindowRateLimiter(storage)], parse("5/minute"), 8) == 5
+    assert counters.calls == 2
+
+    # Several workers never admit more than the limit together
+    counters.reset()
+    storages = [PrefetchingStorage(counters=counters, prefetch=10) for _ in range(3)]
+    limiters = [FixedWindowRateLimiter(storage) for storage in storages]
+    assert 3 <= _admitted(limiters, parse("5/minute"), 15) <= 5
+
+
+def test_login_limit_reserves_off_the_event_loop(client, monkeypatch):
+    """The login limit is checked in the threadpool, not on the event loop."""
+    counters = CountingCounters(RedisStandIn())
+    storage = PrefetchingStorage(counters=counters, prefetch=10)
+    monkeypatch.setattr(auth_limiter, "_storage", storage)
+    monkeypatch.setattr(auth_limiter, "_limiter", FixedWindowRateLimiter(storage))
+    monkeypatch.setattr(auth_limiter, "enabled", True)
+
+    credentials = {"username": "nobody", "password": "Wrong1234"}
+    statuses = [
+        client.post("/api/v1/auth/login", json=credentials).status_code
+        for _ in range(6)
+    ]
+    assert statuses == [401] * 5 + [429]
+    assert counters.calls == 2
+    assert counters.on_event_loop == 0
+
+
+def test_limiter_uses_prefetching_storage():
+    """slowapi builds the storage from the prefetch:// scheme."""
+    counters = RedisRateLimitCounters(RedisStandIn())
+    limiter = Limiter(
+        key_func=get_remote_address,
+        storage_uri="prefetch://",
+        storage_options={"counters": counters, "prefetch": 5},
+    )
+    assert isinstance(limiter._storage, PrefetchingStorage)
+    assert limiter._storage.counters is counters
+    assert limiter._storage.check()
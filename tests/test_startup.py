@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous for slow CI machines; `python scripts/profile_imports.py` shows
+# where the time goes when this fails
+IMPORT_BUDGET_MS = float(os.environ.get("APP_IMPORT_BUDGET_MS", 2000))
+
+# Only needed by CLI tools, optional backends or on first use
+LAZY_MODULES = (
+    "alembic",
+    "aiosqlite",
+    "asyncpg",
+    "redis",
+    "sqlalchemy.ext.asyncio",
+    "app.utils.ai_content_service",
+    "app.utils.ai_generation_helper",
+    "app.utils.vocab_content_generator",
+)
+
+IMPORT_APP = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({{
+    "import_ms": (time.perf_counter() - started) * 1000,
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _import_app() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_APP],
+        cwd=ROOT,
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_is_lazy_and_within_budget():
+    """Test that importing app.main in a fresh interpreter stays lean and fast."""
+    timings = []
+    for _ in range(3):
+        result = _import_app()
+        assert result["loaded"] == []
+        timings.append(result["import_ms"])
+        if result["import_ms"] <= IMPORT_BUDGET_MS:
+            break
+    assert min(timings) <= IMPORT_BUDGET_MS, timings
+
+
+def test_ai_content_service_created_on_first_use():
+    """Test that the AI content service global is created lazily and shared."""
+    from app.utils import ai_content_service as module
+
+    module.get_ai_content_service.cache_clear()
+    assert module.get_ai_content_service.cache_info().currsize == 0
+    assert module.ai_content_service is module.get_ai_content_service()
+    assert module.get_ai_content_service.cache_info().currsize == 1
@@ -1,5 +1,12 @@
+import json
+
 import pytest
 from fastapi import status
+from sqlalchemy import text
+
+from app.schemas.common import PaginatedResponse
+from app.schemas.vocabulary import VocabularyItemResponse
+from app.services.level_snapshot import choose_encoding
 
 
 def test_get_vocabulary_requires_auth(client):
@@ -61,3 +68,338 @@ def test_create_and_get_vocabulary(client, test_admin_user, test_vocabulary_data
     assert len(data["items"]) > 0
     assert data["total"] > 0
 
+
+
+def test_list_vocabulary_includes_levels(client, test_admin_user, test_vocabulary_data):
+    """Test that list responses carry level numbers for every item on the page."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    words = {"alpha": [1], "bravo": [2, 3], "charlie": [4]}
+    for word, levels in words.items():
+        item = dict(test_vocabulary_data, word=word, levels=levels)
+        response = client.post("/api/v1/vocabulary", json=item, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["levels"] == levels
+
+    response = client.get("/api/v1/vocabulary", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    levels_by_word = {item["word"]: item["levels"] for item in response.json()["items"]}
+    assert levels_by_word == words
+
+
+def test_list_vocabulary_cursor_pagination(client, test_admin_user, test_vocabulary_data):
+    """Test walking the vocabulary list with next_cursor instead of offsets."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    words = ["delta", "alpha", "echo", "charlie", "bravo"]
+    for word in words:
+        item = dict(test_vocabulary_data, word=word)
+        client.post("/api/v1/vocabulary", json=item, headers=headers)
+
+    seen = []
+    params = {"limit": 2, "include_total": False}
+    while True:
+        response = client.get("/api/v1/vocabulary", params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(item["word"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert seen == sorted(words)
+
+    response = client.get(
+        "/api/v1/vocabulary", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_list_vocabulary_body_matches_response_model(client, test_admin_user, test_vocabulary_data):
+    """Test that the prebuilt list JSON is byte-identical to the response model's."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = client.post(
+        "/api/v1/vocabulary",
+        json=dict(test_vocabulary_data, word="naïve", synonyms=["ingénu"]),
+        headers=headers,
+    ).json()
+
+    for path in ("/api/v1/vocabulary", "/api/v1/flashcards?level=1"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        model = PaginatedResponse[VocabularyItemResponse](
+            items=[created], total=1, skip=0, limit=response.json()["limit"]
+        )
+        # What FastAPI's JSONResponse would have sent for the model
+        expected = json.dumps(
+            model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+        )
+        assert response.content == expected.encode("utf-8")
+
+
+def test_flashcards_reject_out_of_range_paging(client, db_session, test_admin_user, test_vocabulary_data):
+    """Test that flashcard paging parameters are bounded like the vocabulary list."""
+    from app.services.vocabulary_service import VocabularyService
+
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/v1/vocabulary", json=test_vocabulary_data, headers=headers)
+
+    for params in (
+        {"limit": 0},
+        {"limit": -1},
+        {"limit": -3},
+        {"limit": 501},
+        {"skip": -1},
+        {"cursor": "x" * 513},
+    ):
+        response = client.get(
+            "/api/v1/flashcards", params=dict(params, level=1), headers=headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, params
+
+    response = client.get(
+        "/api/v1/flashcards", params={"level": 1, "limit": 1}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == 1
+
+    # An empty page has no next cursor rather than failing on items[-1]
+    items, _, next_cursor = VocabularyService(db_session).get_page_json(level=1, limit=0)
+    assert (items, next_cursor) == ([], None)
+
+
+def test_level_snapshot_etag_and_compression(client, test_admin_user, test_vocabulary_data):
+    """Test the compressed level snapshot, 304 on a current ETag and regeneration on writes."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for word, levels in {"alpha": [1], "bravo": [1, 2], "charlie": [2]}.items():
+        item = dict(test_vocabulary_data, word=word, levels=levels)
+        client.post("/api/v1/vocabulary", json=item, headers=headers)
+
+    url = "/api/v1/vocabulary/levels/1/snapshot"
+    response = client.get(url, headers=dict(headers, **{"Accept-Encoding": "gzip"}))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    data = response.json()
+    assert [item["word"] for item in data["items"]] == ["alpha", "bravo"]
+    assert (data["level"], data["total"]) == (1, 2)
+    etag = response.headers["etag"]
+    assert etag == f'"{data["version"]}-gzip"'
+
+    # Any representation's ETag of the current content answers 304
+    for accept in ("gzip", "identity"):
+        response = client.get(
+            url,
+            headers=dict(headers, **{"Accept-Encoding": accept, "If-None-Match": etag}),
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    response = client.get(url, headers=dict(headers, **{"Accept-Encoding": "identity"}))
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == f'"{data["version"]}"'
+
+    item = dict(test_vocabulary_data, word="delta", levels=[1])
+    client.post("/api/v1/vocabulary", json=item, headers=headers)
+    response = client.get(url, headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 3
+    assert response.headers["etag"] != etag
+
+    response = client.get("/api/v1/vocabulary/levels/5/snapshot", headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    assert choose_encoding(None) == "identity"
+    assert choose_encoding("deflate") == "identity"
+    assert choose_encoding("gzip;q=0.5, identity;q=0") == "gzip"
+
+
+def test_search_ranks_exact_then_prefix_then_meaning(db_session):
+    """Test that the search backend orders results by relevance."""
+    from app.repositories.vocabulary_repository import VocabularyRepository
+    from app.repositories.vocabulary_search import (SQLiteFTSSearchBackend,
+                                                    get_search_backend)
+
+    repo = VocabularyRepository(db_session)
+    assert isinstance(get_search_backend(db_session.get_bind()), SQLiteFTSSearchBackend)
+
+    repo.create_with_levels("brightly", "in a shining way", level_ids=[])
+    repo.create_with_levels("glow", "to give out bright light", level_ids=[])
+    repo.create_with_levels("bright", "giving out light", level_ids=[])
+    repo.create_with_levels("dim", "not bright", level_ids=[], antonyms=["brilliant"])
+    repo.create_with_levels("shiny", "reflecting light", level_ids=[], synonyms=["brilliant"])
+
+    words = [item.word for item in repo.search("bright")]
+    assert words[:2] == ["bright", "brightly"]
+    assert set(words[2:]) == {"dim", "glow"}
+
+    assert [item.word for item in repo.search("brill")] == ["dim", "shiny"]
+
+    items, total = repo.get_all_with_filters(search="Bright")
+    assert total == 4
+    assert items[0].word == "bright"
+
+
+def test_search_matches_the_same_items_with_and_without_catalog(db_session):
+    """Test that FTS search and the catalog's search agree on word-prefix matching."""
+    from app.repositories.vocabulary_repository import VocabularyRepository
+    from app.services.vocabulary_catalog import VocabularyCatalog
+
+    repo = VocabularyRepository(db_session)
+    repo.create_with_levels("example", "a thing typical of its kind", level_ids=[])
+    repo.create_with_levels("sample", "a small part of something", level_ids=[])
+    repo.create_with_levels("amble", "to walk slowly", level_ids=[], synonyms=["stroll"])
+    item = repo.create_with_levels("stride", "to walk with long steps", level_ids=[])
+    # FTS rows are keyed by item id and follow updates and deletes
+    item.meaning = "a long step"
+    repo.update(item)
+    repo.delete(repo.get_by_word("sample"))
+    fts_ids = db_session.execute(text("SELECT id FROM vocabulary_items_fts")).scalars()
+    assert sorted(fts_ids) == sorted(str(i.id) for i in repo.get_all())
+
+    catalog = VocabularyCatalog.load(db_session)
+    expected = {
+        "ample": [],
+        "exam": ["example"],
+        "Walk": ["amble"],
+        "long st": ["stride"],
+        "str": ["stride", "amble"],
+        "sample": [],
+        "'": [],
+    }
+    for term, words in expected.items():
+        assert [item.word for item in repo.search(term)] == words, term
+        found = [catalog.entries[pos].word for pos in catalog.search(term)]
+        assert found == words, term
+
+
+def test_suggest_vocabulary_by_prefix(client, test_admin_user, test_vocabulary_data):
+    """Test autocomplete suggestions with and without a level filter."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    words = {"Brave": [1], "bravery": [2], "brilliant": [2], "calm": [1]}
+    for word, levels in words.items():
+        item = dict(test_vocabulary_data, word=word, levels=levels)
+        client.post("/api/v1/vocabulary", json=item, headers=headers)
+
+    response = client.get(
+        "/api/v1/vocabulary/suggest", params={"prefix": "bra"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    suggestions = response.json()["suggestions"]
+    assert [s["word"] for s in suggestions] == ["Brave", "bravery"]
+
+    response = client.get(
+        "/api/v1/vocabulary/suggest",
+        params={"prefix": "BR", "level": 2, "limit": 1},
+        headers=headers,
+    )
+    assert [s["word"] for s in response.json()["suggestions"]] == ["bravery"]
+
+
+def test_async_session_request_path(client, test_admin_user, test_user_data, test_vocabulary_data):
+    """Test vocabulary and progress routes on a real AsyncSession (aiosqlite)."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.database import get_async_db, to_async_url
+    from app.main import app
+    from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+    assert to_async_url(SQLALCHEMY_DATABASE_URL) == "sqlite+aiosqlite:///./test.db"
+    assert (
+        to_async_url("postgresql+psycopg2://u:p@db/vocab")
+        == "postgresql+asyncpg://u:p@db/vocab"
+    )
+
+    async_engine = create_async_engine(
+        to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool
+    )
+    AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    def login(username, password):
+        response = client.post(
+            "/api/v1/auth/login", json={"username": username, "password": password}
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    admin_headers = login(test_admin_user["username"], test_admin_user["password"])
+    created = client.post(
+        "/api/v1/vocabulary", json=test_vocabulary_data, headers=admin_headers
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.json()["levels"] == [1]
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    user_headers = login(test_user_data["username"], test_user_data["password"])
+    mastered = client.post(
+        "/api/v1/progress/mastered",
+        json={"vocabulary_item_id": created.json()["id"], "year": "year3"},
+        headers=user_headers,
+    )
+    assert mastered.status_code == status.HTTP_201_CREATED
+
+    listing = client.get("/api/v1/flashcards", params={"level": 1}, headers=user_headers)
+    assert [item["word"] for item in listing.json()["items"]] == ["example"]
+
+    progress = client.get("/api/v1/progress", headers=user_headers).json()
+    assert progress["overall_progress"]["mastered_words"] == 1
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.models.vocabulary import VocabularyItem
+from app.services.vocabulary_catalog import (CatalogEntry, VocabularyCatalog,
+                                             VocabularyCatalogCache,
+                                             vocabulary_catalog)
+from app.services.vocabulary_service import VocabularyService
+
+
+def _entry(word, levels, meaning="a meaning"):
+    now = datetime(2024, 1, 1)
+    return CatalogEntry(
+        id=uuid.uuid4(),
+        word=word,
+        meaning=meaning,
+        synonyms=(),
+        antonyms=(),
+        example_sentences=(),
+        levels=tuple(levels),
+        quiz_sentences=(),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_catalog_page_filters_and_keyset():
+    """Test level filtering, search and keyset paging on the in-memory catalog."""
+    catalog = VocabularyCatalog(
+        [
+            _entry("delta", [2]),
+            _entry("alpha", [1, 2]),
+            _entry("charlie", [2], meaning="a brave person"),
+            _entry("bravo", [1]),
+        ]
+    )
+
+    entries, total = catalog.page(level=2)
+    assert [e.word for e in entries] == ["alpha", "charlie", "delta"]
+    assert total == 3
+
+    entries, total = catalog.page(level=2, limit=1, after=("alpha", entries[0].id))
+    assert [e.word for e in entries] == ["charlie"]
+
+    entries, total = catalog.page(search="BRAV")
+    assert [e.word for e in entries] == ["bravo", "charlie"]
+    assert catalog.get(entries[0].id) is entries[0]
+
+
+def test_catalog_reloads_after_another_worker_writes(db_session):
+    """A write invalidated by one worker is seen by every worker's catalog."""
+    worker_a = VocabularyCatalogCache(refresh_seconds=0)
+    worker_b = VocabularyCatalogCache(refresh_seconds=0)
+    assert len(worker_a.get(db_session)) == 0
+
+    db_session.add(VocabularyItem(word="zephyr", meaning="a light wind"))
+    db_session.commit()
+    assert len(worker_a.get(db_session)) == 0
+
+    worker_b.invalidate(db_session)
+    assert [e.word for e in worker_a.get(db_session).entries] == ["zephyr"]
+    assert worker_b.get(db_session).version == worker_a.get(db_session).version
+
+
+def test_cursors_page_the_same_rows_from_catalog_and_database(db_session, monkeypatch):
+    """Keyset order agrees between the catalog and SQL, so cursors can mix paths."""
+    words = ["zoo", "Zebra", "apple", "Apple", "\u00e9clair", "eagle", "Eagle", "apple pie"]
+    for word in words:
+        db_session.add(VocabularyItem(word=word, meaning="a meaning"))
+    db_session.commit()
+    catalog = VocabularyCatalog.load(db_session)
+
+    seen, cursor, use_catalog = [], None, True
+    while True:
+        monkeypatch.setattr(settings, "CATALOG_CACHE_ENABLED", use_catalog)
+        items, _, cursor = VocabularyService(db_session, catalog).get_page(
+            limit=3, cursor=cursor
+        )
+        seen.extend(item["word"] for item in items)
+        if cursor is None:
+            break
+        use_catalog = not use_catalog
+
+    assert seen == sorted(words)
+
+
+def test_catalog_rebuilt_after_admin_update(client, test_admin_user, test_vocabulary_data):
+    """Test that admin writes invalidate the cached catalog."""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = client.post(
+        "/api/v1/vocabulary", json=test_vocabulary_data, headers=headers
+    ).json()
+    response = client.get(f"/api/v1/vocabulary/{created['id']}", headers=headers)
+    assert response.json()["meaning"] == test_vocabulary_data["meaning"]
+
+    client.put(
+        f"/api/v1/vocabulary/{created['id']}",
+        json={"meaning": "an updated meaning", "levels": [3]},
+        headers=headers,
+    )
+    response = client.get(f"/api/v1/vocabulary/{created['id']}", headers=headers)
+    assert response.json()["meaning"] == "an updated meaning"
+    assert response.json()["levels"] == [3]
+
+    client.delete(f"/api/v1/vocabulary/{created['id']}", headers=headers)
+    response = client.get(f"/api/v1/vocabulary/{created['id']}", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_concurrent_async_rebuild_does_not_block_event_loop(
+    client, test_admin_user, test_vocabulary_data, monkeypatch
+):
+    """Test concurrent requests on AsyncSession rebuilding an invalidated catalog."""
+    pytest.importorskip("aiosqlite")
+    import httpx
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.database import get_async_db, to_async_url
+    from app.main import app
+    from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+    monkeypatch.setattr(settings, "CATALOG_CACHE_ENABLED", True)
+    login_response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "username": test_admin_user["username"],
+            "password": test_admin_user["password"]
+        }
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    client.post("/api/v1/vocabulary", json=test_vocabulary_data, headers=headers)
+
+    async_engine = create_async_engine(
+        to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool
+    )
+    AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    vocabulary_catalog.clear()
+
+    async def fetch_concurrently():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(
+                *(
+                    ac.get(path, headers=headers)
+                    for path in ["/api/v1/vocabulary"] * 3 + ["/api/v1/progress"] * 2
+                )
+            )
+
+    # A deadlocked event loop never returns, so run it where the test can time out
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.extend(asyncio.run(fetch_concurrently())), daemon=True
+    )
+    worker.start()
+    worker.join(timeout=15)
+    assert not worker.is_alive(), "concurrent catalog rebuild deadlocked the event loop"
+    assert [r.status_code for r in results] == [status.HTTP_200_OK] * 5
+    assert results[0].json()["items"][0]["word"] == test_vocabulary_data["word"]